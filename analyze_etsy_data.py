@@ -1,48 +1,149 @@
+import argparse
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from collections import Counter
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.category_report import compute_category_report
+from src.clustering import cluster_counts
+from src.data_loader import LoadStats, nonzero_counts
+from src.features import load_features
+from src.report_builder import ReportBuilder, artifact_key, partition_digests, render_page, write_plotly_bundle
+from src.sketches import load_or_build_sketch
+from src.visualization import scalable_scatter, visualization_settings
+
 # Set style for better looking plots
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
+# Columns whose content the report pages depend on, hashed per category
+DIGEST_COLUMNS = ['seed', 'suggestion', 'competition_level', 'relative_opportunity']
+
+def category_page_filename(category):
+    """File name for a category page"""
+    return f"category_analysis_{category.lower().replace(' ', '_').replace('/', '_')}.html"
+
+def build_category_figure(category, data):
+    """Build one category page from CategoryReport.page_data (runs in render workers)"""
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(
+            f'{category} - Competition Distribution',
+            f'{category} - Top Related Terms',
+            f'{category} - Suggestion Length',
+            f'{category} - Opportunity Score Distribution'
+        ),
+        specs=[[{"type": "domain"}, {"type": "xy"}],
+               [{"type": "xy"}, {"type": "xy"}]]
+    )
+    
+    # Competition distribution
+    labels, values = data['competition']
+    fig.add_trace(go.Pie(labels=labels, values=values), row=1, col=1)
+    
+    # Top related terms
+    terms, counts = data['terms']
+    fig.add_trace(go.Bar(x=terms, y=counts), row=1, col=2)
+    
+    # Suggestion length (pre-binned)
+    centers, counts = data['length']
+    fig.add_trace(go.Bar(x=centers, y=counts), row=2, col=1)
+    
+    # Opportunity scores (precomputed quartiles)
+    low, q1, median, q3, high = data['quantiles']
+    fig.add_trace(
+        go.Box(name=category, lowerfence=[low], q1=[q1], median=[median], q3=[q3], upperfence=[high]),
+        row=2, col=2
+    )
+    
+    fig.update_layout(title_text=f"{category} Analysis")
+    return fig
+
 class EtsyDataAnalyzer:
-    def __init__(self, csv_file='etsy_market_research.csv'):
+    def __init__(self, csv_file='etsy_market_research.csv', chunked=False, output_dir='.', use_cache=True):
         self.csv_file = csv_file
-        self.df = None
+        self.chunked = chunked
+        self.output_dir = output_dir
+        self.use_cache = use_cache
+        self.df = pd.DataFrame()
+        self.sketch = None
+        self._category_report = None
+        self._digests = None
         self.load_data()
     
     def load_data(self):
         """Load and clean the data"""
         try:
-            self.df = pd.read_csv(self.csv_file)
-            print(f"✅ Loaded {len(self.df)} data points from {self.csv_file}")
-            
-            # Clean up the data
-            self.df = self.df.dropna(subset=['suggestion'])
-            self.df['suggestion_length'] = self.df['suggestion'].str.len()
+            if self.chunked:
+                # Sketches only: bounded memory and no rows kept, so charts are skipped
+                self.sketch, current = load_or_build_sketch(self.csv_file)
+                if current:
+                    print(f"⚡ Read the saved sketch of {self.sketch.rows} data points in {self.csv_file}")
+                else:
+                    print(f"✅ Sketched {self.sketch.rows} data points from {self.csv_file}")
+                return
             
-            # Create opportunity score based on competition level
-            competition_scores = {'Low': 3, 'Moderate': 2, 'High': 1}
-            self.df['competition_score'] = self.df['competition_level'].map(competition_scores)
+            self.df, meta = load_features(self.csv_file, use_cache=self.use_cache)
+            if meta['cache_hit']:
+                print(f"⚡ Loaded {len(self.df)} data points from the feature cache in {meta['seconds']:.2f}s")
+            else:
+                print(f"✅ Loaded {len(self.df)} data points from {self.csv_file}")
+                print(LoadStats(meta['rows'], meta['raw_bytes'], meta['typed_bytes']).describe())
             
         except Exception as e:
             print(f"❌ Error loading data: {e}")
             self.df = pd.DataFrame()
     
-    def create_summary_dashboard(self):
+    def publish(self, fig, filename, title, builder=None, section="Overview", key=None):
+        """Queue a figure on a shared report builder, or write it now"""
+        if builder is not None:
+            builder.add(filename, title, fig, section=section, key=key)
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        write_plotly_bundle(self.output_dir)
+        render_page(os.path.join(self.output_dir, filename), fig)
+    
+    def partition_digests(self):
+        """Content digest of each category's rows, computed once"""
+        if self._digests is None:
+            self._digests = partition_digests(self.df, 'category', DIGEST_COLUMNS)
+        return self._digests
+    
+    def data_key(self, *parts):
+        """Build key for a page that depends on every row"""
+        digests = sorted((str(category), digest) for category, digest in self.partition_digests().items())
+        return artifact_key(*parts, digests)
+    
+    def reuse(self, filename, title, builder, key, section="Overview"):
+        """List an up-to-date page on the builder instead of rebuilding it"""
+        if builder is None or not builder.is_current(filename, key):
+            return False
+        builder.keep(filename, title, key, section=section)
+        print(f"⏭️  Up to date: {filename}")
+        return True
+    
+    def category_report(self):
+        """Per-category statistics, computed once from the current frame"""
+        if self._category_report is None:
+            self._category_report = compute_category_report(self.df)
+        return self._category_report
+    
+    def create_summary_dashboard(self, builder=None):
         """Create a comprehensive summary dashboard"""
         if self.df.empty:
             print("❌ No data to analyze")
             return
         
+        key = self.data_key("dashboard")
+        if self.reuse("etsy_market_dashboard.html", "Market Dashboard", builder, key):
+            return
+        
         # Create figure with subplots
         fig = make_subplots(
             rows=3, cols=2,
@@ -73,9 +174,10 @@ class EtsyDataAnalyzer:
             row=1, col=2
         )
         
-        # 3. Suggestion Length Distribution (Histogram)
+        # 3. Suggestion Length Distribution (Histogram, pre-binned so page size is independent of rows)
+        length_counts = self.df['suggestion_length'].value_counts().sort_index()
         fig.add_trace(
-            go.Histogram(x=self.df['suggestion_length'], name="Length"),
+            go.Bar(x=length_counts.index, y=length_counts.values, name="Length"),
             row=2, col=1
         )
         
@@ -87,13 +189,14 @@ class EtsyDataAnalyzer:
         )
         
         # 5. Competition vs Category (Scatter)
-        category_competition = self.df.groupby('category')['competition_score'].mean().reset_index()
+        report = self.category_report()
+        category_competition = report.means['competition_score']
         fig.add_trace(
             go.Scatter(
-                x=category_competition['category'], 
-                y=category_competition['competition_score'],
+                x=category_competition.index, 
+                y=category_competition.values,
                 mode='markers+text',
-                text=category_competition['category'],
+                text=category_competition.index,
                 textposition="top center",
                 name="Category Performance"
             ),
@@ -101,12 +204,11 @@ class EtsyDataAnalyzer:
         )
         
         # 6. Category Performance Table
-        category_summary = self.df.groupby('category').agg({
-            'competition_level': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'Unknown',
-            'suggestion': 'count',
-            'competition_score': 'mean'
-        }).round(2)
-        category_summary.columns = ['Most Common Competition', 'Data Points', 'Avg Competition Score']
+        category_summary = pd.DataFrame({
+            'Most Common Competition': report.most_common_competition(),
+            'Data Points': report.counts,
+            'Avg Competition Score': category_competition.round(2)
+        })
         category_summary = category_summary.sort_values('Avg Competition Score', ascending=False)
         
         fig.add_trace(
@@ -130,94 +232,73 @@ class EtsyDataAnalyzer:
         )
         
         # Save the dashboard
-        fig.write_html("etsy_market_dashboard.html")
+        self.publish(fig, "etsy_market_dashboard.html", "Market Dashboard", builder, key=key)
         print("✅ Created interactive dashboard: etsy_market_dashboard.html")
         
         return fig
     
-    def create_opportunity_analysis(self):
+    def create_opportunity_analysis(self, builder=None):
         """Create detailed opportunity analysis"""
         if self.df.empty:
             return
         
-        # Calculate opportunity metrics
-        self.df['opportunity_score'] = (
-            self.df['competition_score'] * 
-            (self.df['suggestion_length'] / self.df['suggestion_length'].max())
-        )
+        # Opportunity metric from the shared feature pipeline
+        self.df['opportunity_score'] = self.df['relative_opportunity']
+        
+        # Scores changed, so per-category statistics are recomputed on next use
+        self._category_report = None
+        
+        settings = visualization_settings()
+        key = self.data_key("opportunity", settings)
+        if self.reuse("opportunity_analysis.html", "Opportunity Analysis", builder, key):
+            return
         
         # Find top opportunities
         top_opportunities = self.df.nlargest(20, 'opportunity_score')
         
-        # Create opportunity chart
-        fig = px.scatter(
+        # Create opportunity chart (density + sampled WebGL points for large frames)
+        fig = scalable_scatter(
             self.df,
             x='competition_score',
             y='suggestion_length',
             color='category',
             size='opportunity_score',
             hover_data=['seed', 'suggestion'],
-            title="Market Opportunity Analysis"
+            title="Market Opportunity Analysis",
+            settings=settings
         )
         
-        fig.write_html("opportunity_analysis.html")
+        self.publish(fig, "opportunity_analysis.html", "Opportunity Analysis", builder, key=key)
         print("✅ Created opportunity analysis: opportunity_analysis.html")
         
         return fig
     
-    def create_category_insights(self):
+    def create_category_insights(self, builder=None):
         """Create detailed insights for each category"""
         if self.df.empty:
             return
         
-        categories = self.df['category'].unique()
+        report = self.category_report()
+        digests = self.partition_digests()
+        pages = builder or ReportBuilder(self.output_dir)
         
-        for category in categories:
-            cat_data = self.df[self.df['category'] == category]
-            
-            if len(cat_data) < 3:  # Skip categories with too little data
+        for category in report.categories:
+            if report.counts[category] < 3:  # Skip categories with too little data
                 continue
             
-            # Create subplot for this category
-            fig = make_subplots(
-                rows=2, cols=2,
-                subplot_titles=(
-                    f'{category} - Competition Distribution',
-                    f'{category} - Top Related Terms',
-                    f'{category} - Suggestion Length',
-                    f'{category} - Opportunity Score Distribution'
-                )
-            )
-            
-            # Competition distribution
-            comp_counts = cat_data['competition_level'].value_counts()
-            fig.add_trace(
-                go.Pie(labels=comp_counts.index, values=comp_counts.values),
-                row=1, col=1
-            )
-            
-            # Top related terms
-            top_terms = cat_data['suggestion'].value_counts().head(10)
-            fig.add_trace(
-                go.Bar(x=top_terms.index, y=top_terms.values),
-                row=1, col=2
-            )
-            
-            # Suggestion length
-            fig.add_trace(
-                go.Histogram(x=cat_data['suggestion_length']),
-                row=2, col=1
-            )
-            
-            # Opportunity scores
-            fig.add_trace(
-                go.Box(y=cat_data['opportunity_score']),
-                row=2, col=2
-            )
+            # Length bins are shared by all categories, so they are part of every page's key
+            filename = category_page_filename(category)
+            key = artifact_key("category", digests.get(category), report.length_edges.tolist())
+            if pages.is_current(filename, key):
+                pages.keep(filename, f"{category} Analysis", key, section="Categories")
+                continue
             
-            fig.update_layout(title_text=f"{category} Analysis")
-            fig.write_html(f"category_analysis_{category.lower().replace(' ', '_')}.html")
+            # Figures are built and written in render workers from plain per-category data
+            pages.add_task(filename, f"{category} Analysis", build_category_figure,
+                           category, report.page_data(category), section="Categories", key=key)
         
+        if builder is None:
+            pages.build(index=False)
         print("✅ Created category-specific analysis files")
     
     def generate_recommendations(self):
@@ -231,11 +312,10 @@ class EtsyDataAnalyzer:
         
         # Top opportunities by category
         print("\n📊 TOP OPPORTUNITIES BY CATEGORY:")
-        category_opportunities = self.df.groupby('category').agg({
-            'opportunity_score': 'mean',
-            'competition_score': 'mean',
-            'suggestion': 'count'
-        }).sort_values('opportunity_score', ascending=False)
+        report = self.category_report()
+        category_opportunities = report.means.assign(suggestion=report.counts).sort_values(
+            'opportunity_score', ascending=False, kind='stable'
+        )
         
         for idx, (category, data) in enumerate(category_opportunities.head(5).iterrows(), 1):
             print(f"{idx}. {category}")
@@ -260,40 +340,77 @@ class EtsyDataAnalyzer:
         for term, count in top_terms.items():
             print(f"• {term} ({count} mentions)")
         
+        # Near-duplicate suggestions counted together
+        print("\n🧩 TOP SUGGESTION CLUSTERS:")
+        for _, cluster in cluster_counts(self.df, top=10).iterrows():
+            print(f"• {cluster['label']} ({cluster['rows']} mentions across {cluster['variants']} variants)")
+        
         # Category recommendations
         print("\n📈 CATEGORY RECOMMENDATIONS:")
         for category in category_opportunities.head(3).index:
-            cat_data = self.df[self.df['category'] == category]
-            avg_comp = cat_data['competition_score'].mean()
+            avg_comp = category_opportunities.loc[category, 'competition_score']
             print(f"• {category}: {'Low' if avg_comp > 2.5 else 'Moderate' if avg_comp > 1.5 else 'High'} competition")
     
     def create_quick_summary(self):
         """Create a quick summary report"""
-        if self.df.empty:
+        # Counts come from the sketch in chunked mode and straight from the loaded rows otherwise
+        if self.sketch is not None:
+            rows, categories, competition = self.sketch.rows, self.sketch.categories, self.sketch.competition
+        elif not self.df.empty:
+            rows = len(self.df)
+            categories = Counter(nonzero_counts(self.df['category']))
+            competition = Counter(nonzero_counts(self.df['competition_level']))
+        else:
+            return
+        if not rows:
             return
         
         print("\n" + "="*60)
         print("📋 QUICK SUMMARY")
         print("="*60)
-        print(f"Total data points: {len(self.df)}")
-        print(f"Unique search terms: {self.df['seed'].nunique()}")
-        print(f"Unique suggestions: {self.df['suggestion'].nunique()}")
-        print(f"Categories analyzed: {self.df['category'].nunique()}")
+        print(f"Total data points: {rows}")
+        if self.sketch is not None:
+            # HyperLogLog estimates, within two standard errors 95% of the time
+            margin = 2 * self.sketch.error_bounds()['unique_counts']
+            print(f"Unique search terms: ~{self.sketch.unique_seeds()} (±{margin:.1%})")
+            print(f"Unique suggestions: ~{self.sketch.unique_suggestions()} (±{margin:.1%})")
+        else:
+            print(f"Unique search terms: {self.df['seed'].nunique()}")
+            print(f"Unique suggestions: {self.df['suggestion'].nunique()}")
+        print(f"Categories analyzed: {len(categories)}")
         
         print(f"\nCompetition breakdown:")
-        comp_breakdown = self.df['competition_level'].value_counts()
-        for level, count in comp_breakdown.items():
-            percentage = (count / len(self.df)) * 100
+        for level, count in competition.most_common():
+            percentage = (count / rows) * 100
             print(f"  {level}: {count} ({percentage:.1f}%)")
         
         print(f"\nTop 5 categories by data points:")
-        top_cats = self.df['category'].value_counts().head(5)
-        for cat, count in top_cats.items():
+        for cat, count in categories.most_common(5):
             print(f"  {cat}: {count}")
+        
+        if self.sketch is not None:
+            print("\nTop 10 related terms (Count-Min estimates, never under the true count):")
+            for term, count in self.sketch.top_terms(10):
+                print(f"  {term}: ~{count}")
 
 def main():
     """Main analysis function"""
-    analyzer = EtsyDataAnalyzer()
+    parser = argparse.ArgumentParser(description="Analyze Etsy market research results")
+    parser.add_argument("csv_file", nargs="?", default="etsy_market_research.csv", help="Results CSV")
+    parser.add_argument("--chunked", action="store_true",
+                        help="Approximate summary from the results sketch, in bounded memory without loading rows")
+    parser.add_argument("--output-dir", default=".", help="Directory for HTML reports")
+    parser.add_argument("--workers", type=int, help="Report render processes (default: reports.workers in config)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write the derived-feature cache")
+    parser.add_argument("--force", action="store_true", help="Rebuild every report page even if it is up to date")
+    args = parser.parse_args()
+    
+    analyzer = EtsyDataAnalyzer(args.csv_file, chunked=args.chunked, output_dir=args.output_dir,
+                                use_cache=not args.no_cache)
+    
+    if args.chunked:
+        analyzer.create_quick_summary()
+        return
     
     if analyzer.df.empty:
         print("❌ No data found. Please run the Etsy scraper first.")
@@ -301,9 +418,14 @@ def main():
     
     # Create all visualizations
     print("\n📊 Creating visualizations...")
-    analyzer.create_summary_dashboard()
-    analyzer.create_opportunity_analysis()
-    analyzer.create_category_insights()
+    builder = ReportBuilder(args.output_dir, workers=args.workers, force=args.force)
+    analyzer.create_summary_dashboard(builder)
+    analyzer.create_opportunity_analysis(builder)
+    analyzer.create_category_insights(builder)
+    stats = builder.build()
+    print(f"✅ Rebuilt {stats['rebuilt']} of {stats['pages']} pages ({stats['skipped']} up to date) "
+          f"with {stats['workers']} workers in {stats['seconds']:.1f}s "
+          f"({stats['bytes'] / 1e6:.1f} MB) → {os.path.join(args.output_dir, 'index.html')}")
     
     # Generate insights
     analyzer.create_quick_summary()
@@ -312,4 +434,4 @@ def main():
     print("\n✅ Analysis complete! Check the generated HTML files for interactive visualizations.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,6 @@
+"""
+Entry point for `python -m benchmarks`
+"""
+from .suite import main
+
+main()
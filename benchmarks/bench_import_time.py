@@ -0,0 +1,82 @@
+"""
+Benchmark startup cost of the scraper CLI and the analyzers
+
+Each target is imported in a fresh interpreter with `-X importtime`, and the
+slowest modules (by cumulative import time) are reported.
+
+Usage:
+    python -m benchmarks.bench_import_time --repeat 5 --top 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (module whose imports are broken down, code to run)
+TARGETS = {
+    'etsy_autocomplete': ('etsy_autocomplete', "import etsy_autocomplete"),
+    'etsy_autocomplete --help': ('etsy_autocomplete', "import sys, etsy_autocomplete; "
+                                 "sys.argv = ['etsy_autocomplete.py', '--help']; etsy_autocomplete.main()"),
+    'analyze_etsy_data': ('analyze_etsy_data', "import analyze_etsy_data"),
+    'extract_and_visualize': ('extract_and_visualize', "import extract_and_visualize"),
+}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def run_target(code, workdir):
+    """Run one target in a fresh interpreter; returns (wall seconds, importtime stderr)"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=workdir, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - start, result.stderr
+
+
+def direct_imports(stderr, module):
+    """Return (module total, [(name, cumulative microseconds)]) for the imports made directly by `module`"""
+    # importtime lists children before their parent, two spaces deeper per level
+    children = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth, name, cumulative = len(match.group(3)), match.group(4), int(match.group(2))
+        if depth == 3:
+            children.append((name, cumulative))
+        elif depth == 1:
+            if name == module:
+                return cumulative, children
+            children = []
+    return 0, []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreter runs per target")
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports to list per target")
+    parser.add_argument("--target", action="append", choices=sorted(TARGETS), help="Limit to these targets")
+    args = parser.parse_args()
+
+    # Targets run in a scratch directory so logs and reports they write stay out of the repo
+    with tempfile.TemporaryDirectory() as workdir:
+        baseline_wall, _ = run_target("pass", workdir)
+        print(f"📊 Startup cost (median of {args.repeat} runs, interpreter baseline {baseline_wall * 1000:.0f} ms)")
+        for name in args.target or list(TARGETS):
+            module, code = TARGETS[name]
+            runs = [run_target(code, workdir) for _ in range(args.repeat)]
+            wall = statistics.median(seconds for seconds, _ in runs)
+            total, children = direct_imports(runs[-1][1], module)
+            print(f"\n   {name:28s} {wall * 1000:8.0f} ms wall, {total / 1000:8.1f} ms importing {module}")
+            for child, micros in sorted(children, key=lambda item: item[1], reverse=True)[:args.top]:
+                print(f"      {child:40s} {micros / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark the compiled keyword engine against per-keyword substring scans
+
+Usage:
+    python -m benchmarks.bench_keyword_engine --size 100000
+"""
+import argparse
+import random
+import time
+
+from src.keyword_engine import (
+    CATEGORY_KEYWORDS, DEFAULT_CATEGORY, DEMAND_KEYWORDS, HIGH_COMPETITION_KEYWORDS,
+    LOW_COMPETITION_KEYWORDS, NEGATIVE_FACTORS, POSITIVE_FACTORS, KeywordEngine
+)
+
+FILLER_WORDS = ['wall', 'prints', 'for', 'kids', 'room', 'watercolor', 'minimal', 'set', 'of', '3',
+                'large', 'canvas', 'framed', 'digital', 'download', 'modern', 'rustic', 'boho']
+
+
+def legacy_classify(term):
+    """Category, competition and seed score the way the original functions computed them"""
+    term_lower = term.lower()
+
+    category = DEFAULT_CATEGORY
+    for name, keywords in CATEGORY_KEYWORDS:
+        if any(word in term_lower for word in keywords):
+            category = name
+            break
+
+    high_count = sum(1 for keyword in HIGH_COMPETITION_KEYWORDS if keyword in term_lower)
+    low_count = sum(1 for keyword in LOW_COMPETITION_KEYWORDS if keyword in term_lower)
+    demand_count = sum(1 for keyword in DEMAND_KEYWORDS if keyword in term_lower)
+
+    score = 0
+    for factor, points in POSITIVE_FACTORS.items():
+        if factor in term_lower:
+            score += points
+    for factor, points in NEGATIVE_FACTORS.items():
+        if factor in term_lower:
+            score += points
+
+    return category, (high_count, low_count, demand_count), score
+
+
+def synthesize_terms(size, seed=42):
+    """Generate search-like terms mixing keywords and filler words"""
+    rng = random.Random(seed)
+    vocabulary = sorted({keyword for _, keywords in CATEGORY_KEYWORDS for keyword in keywords}
+                        | set(POSITIVE_FACTORS) | set(NEGATIVE_FACTORS))
+    return [
+        ' '.join(rng.sample(vocabulary, rng.randint(1, 2)) + rng.sample(FILLER_WORDS, rng.randint(1, 3)))
+        for _ in range(size)
+    ]
+
+
+def best_of(func, repeat):
+    """Return the best wall time of `repeat` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword engine benchmark")
+    parser.add_argument("--size", type=int, default=100000, help="Number of terms to classify")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args()
+
+    terms = synthesize_terms(args.size)
+    engine = KeywordEngine()
+
+    timings = {
+        'per-keyword scans': best_of(lambda: [legacy_classify(term) for term in terms], args.repeat),
+        'KeywordEngine.classify': best_of(lambda: [engine.classify(term) for term in terms], args.repeat),
+        'KeywordEngine.classify_many': best_of(lambda: engine.classify_many(terms), args.repeat),
+    }
+
+    print(f"📊 Classified {len(terms)} terms (category + competition + score)")
+    baseline = timings['per-keyword scans']
+    for name, seconds in timings.items():
+        print(f"   {name:28s} {seconds * 1000:9.1f} ms  {len(terms) / seconds:12,.0f} terms/s  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark the queued logging backend against the original log_message()
+
+The original opened the log file, appended one line and printed it on every
+call. The queued backend only enqueues on the calling thread.
+
+Usage:
+    python -m benchmarks.bench_logging --messages 20000
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from src.logging_config import configure_logging, get_logger, shutdown_logging
+
+
+def legacy_log_message(message, log_file, level="INFO"):
+    """log_message() as the scraper originally implemented it"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log_entry = f"[{timestamp}] {level}: {message}"
+    print(log_entry)
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(log_entry + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging backend benchmark")
+    parser.add_argument("--messages", type=int, default=20000, help="Messages to log")
+    args = parser.parse_args()
+    messages = [f"Processing {i}: vintage map prints → 12 suggestions (Score: 4.5)" for i in range(args.messages)]
+
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            legacy_file = os.path.join(workdir, "legacy_log.txt")
+            start = time.perf_counter()
+            for message in messages:
+                legacy_log_message(message, legacy_file)
+            legacy = time.perf_counter() - start
+
+            configure_logging(os.path.join(workdir, "queued_log.txt"))
+            logger = get_logger()
+            start = time.perf_counter()
+            for message in messages:
+                logger.info(message)
+            queued = time.perf_counter() - start
+            shutdown_logging()
+            drained = time.perf_counter() - start
+
+    print(f"📊 Logged {args.messages} messages")
+    print(f"   {'open/append/print per call':28s} {legacy * 1e6 / args.messages:8.1f} µs/msg on caller")
+    print(f"   {'queued backend':28s} {queued * 1e6 / args.messages:8.1f} µs/msg on caller "
+          f"({legacy / queued:.1f}x), {drained:.2f}s until fully written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark the suggestion filter against the original list-based scrape loop
+
+Usage:
+    python -m benchmarks.bench_suggestion_filter --size 200000
+    python -m benchmarks.bench_suggestion_filter --corpus etsy_market_research.csv --page-size 0
+"""
+import argparse
+import csv
+import random
+import time
+from pathlib import Path
+
+from src.suggestion_filter import SKIP_TERMS, SuggestionFilter
+
+DEFAULT_CORPORA = ['cleaned_etsy_data.csv', 'etsy_market_research.csv']
+
+# Facet junk as it shows up in saved scrape output
+JUNK_SAMPLES = [
+    "Item formatAllPhysical itemsDigital downloads",
+    "ColorGreenBlueYellowWhiteBrownShow more",
+    "ColorBlackBrownGreenGoldBeigeShow more",
+    "SubjectFlowersPlants & treesLandscape & sceneryAbstract & geometricAnimalShow more",
+    "FramingUnframedFramed",
+    "Applied filters\nVintage",
+    "Home", "Sign in", "All Filters", "Free shipping", "Sort by: Relevance",
+]
+
+
+def legacy_filter(texts):
+    """The filter loop scrape_seed() used before the compiled engine"""
+    suggestions = []
+    for text in texts:
+        if text and text not in suggestions and len(text) > 3 and len(text) < 100:
+            text_lower = text.lower()
+            if not any(skip in text_lower for skip in SKIP_TERMS):
+                suggestions.append(text)
+    return suggestions
+
+
+def load_corpus(paths):
+    """Load suggestion text from CSV files with a `suggestion` column or plain text files"""
+    texts = []
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix == '.csv':
+                texts.extend(row['suggestion'] for row in csv.DictReader(f) if row.get('suggestion'))
+            else:
+                texts.extend(line.strip() for line in f if line.strip())
+    return texts + JUNK_SAMPLES
+
+
+def synthesize(corpus, size, seed=42):
+    """Expand a corpus to `size` texts with case, spacing and suffix variants"""
+    rng = random.Random(seed)
+    variants = [str.lower, str.title, lambda t: t, lambda t: f" {t}  "]
+    texts = []
+    for i in range(size):
+        text = rng.choice(variants)(rng.choice(corpus))
+        if rng.random() < 0.5:
+            text = f"{text} {i % 5000}"
+        texts.append(text)
+    return texts
+
+
+def time_it(func, pages, repeat):
+    """Return the best wall time of `repeat` runs and the number of rows kept"""
+    best = float('inf')
+    kept = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kept = sum(len(func(page)) for page in pages)
+        best = min(best, time.perf_counter() - start)
+    return best, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggestion filter benchmark")
+    parser.add_argument("--corpus", nargs="*", default=DEFAULT_CORPORA, help="Saved suggestion corpora")
+    parser.add_argument("--size", type=int, default=100000, help="Number of texts to filter")
+    parser.add_argument("--page-size", type=int, default=90,
+                        help="Texts per search page (0 = filter the whole corpus at once)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args()
+
+    texts = synthesize(load_corpus(args.corpus), args.size)
+    page_size = args.page_size or len(texts)
+    pages = [texts[i:i + page_size] for i in range(0, len(texts), page_size)]
+
+    legacy_time, legacy_kept = time_it(legacy_filter, pages, args.repeat)
+    engine_time, engine_kept = time_it(lambda page: SuggestionFilter().filter(page), pages, args.repeat)
+
+    print(f"📊 {len(texts)} texts in {len(pages)} page(s) of up to {page_size}")
+    print(f"   legacy list filter: {legacy_time * 1000:9.1f} ms, kept {legacy_kept}")
+    print(f"   SuggestionFilter:   {engine_time * 1000:9.1f} ms, kept {engine_kept}")
+    print(f"   speedup: {legacy_time / engine_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Synthetic results generator for benchmarks
+
+Writes CSVs with the scraper's output schema: repeated scrapes (runs) of a
+pool of seeds, 3-15 suggestion rows per seed scrape, with categories,
+competition labels and recommendations drawn from the real tables.
+Generation is vectorized and chunked, so 10M-row files take seconds to
+minutes and little memory.
+
+Usage:
+    python -m benchmarks.datagen --rows 1M -o /tmp/results_1M.csv
+"""
+import argparse
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.keyword_engine import CATEGORY_KEYWORDS, DEFAULT_CATEGORY, NEGATIVE_FACTORS, POSITIVE_FACTORS
+from src.scoring import AVOID, GOOD, GOOD_GROWING, HIGH, HIGH_GROWING, MODERATE, PERFECT
+
+HEADER = [
+    "timestamp_utc", "seed", "suggestion", "competition_level", "opportunity_score",
+    "trend_score", "trend_direction", "listing_count", "avg_price", "price_range",
+    "category", "recommendation"
+]
+COMPETITION_LEVELS = ["High Competition - Avoid", "Low Competition - Good Opportunity", "Moderate Competition - Consider"]
+FILLER_WORDS = ['wall', 'prints', 'for', 'kids', 'room', 'watercolor', 'minimal', 'set', 'of', '3',
+                'large', 'canvas', 'framed', 'digital', 'download', 'modern', 'rustic', 'boho']
+CHUNK_ROWS = 500_000
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data')
+
+
+def parse_count(text: str) -> int:
+    """Parse counts such as "10k", "1M" or "2500" """
+    text = str(text).strip().lower()
+    factor = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def format_count(rows: int) -> str:
+    """Short label for a row count, e.g. 10k or 1M"""
+    if rows >= 1_000_000 and rows % 1_000_000 == 0:
+        return f"{rows // 1_000_000}M"
+    if rows >= 1_000 and rows % 1_000 == 0:
+        return f"{rows // 1_000}k"
+    return str(rows)
+
+
+def build_vocabulary(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Search-like phrases mixing table keywords and filler words"""
+    keywords = sorted({keyword for _, keywords in CATEGORY_KEYWORDS for keyword in keywords}
+                      | set(POSITIVE_FACTORS) | set(NEGATIVE_FACTORS))
+    first = rng.choice(keywords, size)
+    second = rng.choice(FILLER_WORDS, size)
+    third = rng.choice(FILLER_WORDS + [''] * len(FILLER_WORDS), size)
+    phrases = pd.Series(first) + ' ' + pd.Series(second) + ' ' + pd.Series(third)
+    return phrases.str.strip().to_numpy(dtype=object)
+
+
+def generate_results(path: str, rows: int, seed: int = 42, seed_pool: Optional[int] = None,
+                     chunk_rows: int = CHUNK_ROWS) -> str:
+    """Write `rows` synthetic result rows to `path` and return the path"""
+    rng = np.random.default_rng(seed)
+    seed_pool = seed_pool or max(50, min(200_000, rows // 40))
+    seeds = build_vocabulary(rng, seed_pool) + np.char.add(' #', np.arange(seed_pool).astype(str)).astype(object)
+    suggestions = build_vocabulary(rng, max(1_000, min(500_000, rows // 5)))
+    categories = np.array([name for name, _ in CATEGORY_KEYWORDS] + [DEFAULT_CATEGORY], dtype=object)
+
+    # Per-seed attributes stay fixed across runs, like real re-scrapes of the same seed
+    seed_category = rng.integers(0, len(categories), seed_pool)
+    seed_competition = rng.integers(0, len(COMPETITION_LEVELS), seed_pool)
+    seed_listings = rng.lognormal(8, 2, seed_pool).astype(np.int64)
+    seed_price = np.round(rng.lognormal(3, 0.6, seed_pool), 2)
+
+    written = 0
+    scrape = 0
+    start = pd.Timestamp('2025-01-01T00:00:00')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(','.join(HEADER) + '\n')
+        while written < rows:
+            count = min(chunk_rows, rows - written)
+            # Split the chunk into seed scrapes of 3-15 suggestion rows
+            sizes = rng.integers(3, 16, count // 3 + 1)
+            sizes = sizes[:np.searchsorted(np.cumsum(sizes), count) + 1]
+            sizes[-1] -= sizes.sum() - count
+            sizes = sizes[sizes > 0]
+            scrape_ids = np.arange(scrape, scrape + len(sizes))
+            scrape += len(sizes)
+
+            seed_index = rng.integers(0, seed_pool, len(sizes))
+            score = np.round(rng.normal(2.0, 3.0, len(sizes)), 2)
+            trend = np.round(rng.normal(0, 15, len(sizes)), 2)
+            low = np.round(seed_price[seed_index] * rng.uniform(0.3, 0.9, len(sizes)), 2)
+            high = np.round(seed_price[seed_index] * rng.uniform(1.1, 3.0, len(sizes)), 2)
+            timestamps = (start + pd.to_timedelta(scrape_ids * 7, unit='s')).strftime('%Y-%m-%dT%H:%M:%S')
+
+            direction = np.select([trend > 5, trend < -5], ['growing', 'declining'], 'stable').astype(object)
+            growing = direction == 'growing'
+            low_competition = seed_competition[seed_index] == 1
+            recommendation = np.select(
+                [(score >= 5) & growing & low_competition, (score >= 5) & growing, score >= 5,
+                 (score >= 2) & growing, score >= 2, score >= 0],
+                [PERFECT, HIGH_GROWING, HIGH, GOOD_GROWING, GOOD, MODERATE], AVOID
+            ).astype(object)
+
+            per_row = np.repeat(np.arange(len(sizes)), sizes)
+            frame = pd.DataFrame({
+                'timestamp_utc': np.asarray(timestamps, dtype=object)[per_row],
+                'seed': seeds[seed_index][per_row],
+                'suggestion': suggestions[rng.integers(0, len(suggestions), count)],
+                'competition_level': np.array(COMPETITION_LEVELS, dtype=object)[seed_competition[seed_index]][per_row],
+                'opportunity_score': score[per_row],
+                'trend_score': trend[per_row],
+                'trend_direction': direction[per_row],
+                'listing_count': seed_listings[seed_index][per_row],
+                'avg_price': seed_price[seed_index][per_row],
+                'price_range': pd.Series(low).map('${:.2f}'.format).str.cat(
+                    pd.Series(high).map('${:.2f}'.format), sep='-').to_numpy(dtype=object)[per_row],
+                'category': categories[seed_category[seed_index]][per_row],
+                'recommendation': recommendation[per_row],
+            })
+            frame.to_csv(f, header=False, index=False)
+            written += count
+    return path
+
+
+def cached_results(rows: int, seed: int = 42, data_dir: str = DATA_DIR) -> str:
+    """Path to a generated file of `rows` rows, generating it on first use"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"results_{format_count(rows)}_seed{seed}.csv")
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        generate_results(tmp_path, rows, seed)
+        os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic scraper results")
+    parser.add_argument("--rows", default="100k", help="Row count, e.g. 10k, 1M, 10M")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("-o", "--output", help="Output CSV (default: cached under benchmarks/.data)")
+    args = parser.parse_args()
+
+    rows = parse_count(args.rows)
+    path = generate_results(args.output, rows, args.seed) if args.output else cached_results(rows, args.seed)
+    print(f"✅ Wrote {rows:,} rows to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
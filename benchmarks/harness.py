@@ -0,0 +1,62 @@
+"""
+Timing and memory measurement for benchmark cases
+
+Each case is timed over several repeats after a warmup call, with garbage
+collection disabled during timing; the median is the headline number and
+the spread is reported so noisy results are visible. Peak memory is taken
+from a separate tracemalloc run, because tracing slows the code it watches.
+"""
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+
+def time_call(func: Callable[[], Any]) -> float:
+    """Wall time of one call with the garbage collector paused"""
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated by Python during one call"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, warmup: int = 1, memory: bool = True,
+            min_time: float = 0.0) -> Dict[str, float]:
+    """Median/min/max/stdev seconds and peak memory for a zero-argument callable
+
+    With `min_time`, repeats continue (up to 10x `repeat`) until that much
+    total time has been measured, which steadies very fast cases.
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    while len(timings) < repeat or (sum(timings) < min_time and len(timings) < repeat * 10):
+        timings.append(time_call(func))
+    result = {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'runs': len(timings),
+    }
+    if memory:
+        result['peak_bytes'] = peak_memory(func)
+    return result
@@ -0,0 +1,283 @@
+"""
+Benchmark suite with stored baselines and a regression check
+
+Cases run against synthetic output-schema CSVs (see benchmarks/datagen.py)
+at one or more sizes. Results are compared with benchmarks/baselines.json;
+a case regresses when its best (minimum) time or peak memory exceeds the
+baseline by more than the threshold. The minimum is compared rather than
+the median because it is the least disturbed by other load on the machine.
+
+Usage:
+    python -m benchmarks run --sizes 10k,100k -o results.json
+    python -m benchmarks compare results.json --threshold 0.25
+    python -m benchmarks check --sizes 10k          # run + compare, exit 1 on regression
+    python -m benchmarks baseline --sizes 10k       # record new baselines
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .datagen import cached_results, format_count, parse_count
+from .harness import measure
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_SIZES = "10k"
+DEFAULT_THRESHOLD = 0.25
+# Fast cases repeat until this many seconds were timed, so their medians are stable enough to gate on
+MIN_TIME = 1.0
+
+
+def load_column_lists(csv_path: str) -> Dict[str, Any]:
+    """Seeds, suggestions and per-scrape groups (seed, suggestions, market data, trends) from a results file"""
+    import pandas as pd
+    from src.records import MarketData
+    from src.scoring import parse_price_ranges
+
+    frame = pd.read_csv(csv_path, usecols=['timestamp_utc', 'seed', 'suggestion', 'trend_score', 'trend_direction',
+                                           'listing_count', 'price_range'], keep_default_na=False)
+    frame['min_price'], frame['max_price'] = parse_price_ranges(frame['price_range'])
+    groups = []
+    for (_, seed), group in frame.groupby(['timestamp_utc', 'seed'], sort=False):
+        first = group.iloc[0]
+        market = MarketData(int(first['listing_count']), (first['min_price'], first['max_price']))
+        trends = {'trend_score': float(first['trend_score']), 'trend_direction': first['trend_direction']}
+        groups.append((seed, list(group['suggestion']), market, trends))
+    return {
+        'seeds': frame['seed'].tolist(),
+        'suggestions': frame['suggestion'].tolist(),
+        'groups': groups,
+    }
+
+
+def case_categorize_term(csv_path: str) -> Callable[[], Any]:
+    from etsy_autocomplete import categorize_term
+    terms = load_column_lists(csv_path)['suggestions']
+    return lambda: [categorize_term(term) for term in terms]
+
+
+def case_analyze_competition_level(csv_path: str) -> Callable[[], Any]:
+    from etsy_autocomplete import analyze_competition_level
+    seeds = load_column_lists(csv_path)['seeds']
+    return lambda: [analyze_competition_level(seed) for seed in seeds]
+
+
+def case_score_seed(csv_path: str) -> Callable[[], Any]:
+    """What the scraper does per seed: one keyword scan, then the weighted opportunity score"""
+    from src.keyword_engine import get_keyword_engine
+    from src.scoring import get_scoring_weights, score_seed
+    engine = get_keyword_engine()
+    weights = get_scoring_weights()
+    groups = load_column_lists(csv_path)['groups']
+
+    def run():
+        return [score_seed(engine.classify(seed, suggestions).keyword_score, market, trends, weights)
+                for seed, suggestions, market, trends in groups]
+    return run
+
+
+def case_filter_suggestions(csv_path: str) -> Callable[[], Any]:
+    from src.suggestion_filter import SuggestionFilter
+    texts = load_column_lists(csv_path)['suggestions']
+    return lambda: SuggestionFilter().filter(texts)
+
+
+def case_generate_opportunity_summary(csv_path: str) -> Callable[[], Any]:
+    from etsy_autocomplete import generate_opportunity_summary
+    return lambda: generate_opportunity_summary(csv_path)
+
+
+def case_score_frame(csv_path: str) -> Callable[[], Any]:
+    import pandas as pd
+    from src.scoring import score_frame
+    frame = pd.read_csv(csv_path)
+    return lambda: score_frame(frame)
+
+
+def case_analyzer_load_data(csv_path: str) -> Callable[[], Any]:
+    """Cold load: parse the CSV and derive every feature, bypassing the feature cache"""
+    from analyze_etsy_data import EtsyDataAnalyzer
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return EtsyDataAnalyzer(csv_path, use_cache=False)
+    return run
+
+
+def case_analyzer_load_data_cached(csv_path: str) -> Callable[[], Any]:
+    """Warm load: the feature cache (filled by the warmup call) hits"""
+    from analyze_etsy_data import EtsyDataAnalyzer
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return EtsyDataAnalyzer(csv_path)
+    return run
+
+
+def case_category_report(csv_path: str) -> Callable[[], Any]:
+    from src.category_report import compute_category_report
+    from src.data_loader import load_results
+    frame, _ = load_results(csv_path)
+    return lambda: compute_category_report(frame)
+
+
+# name -> setup(csv_path) returning the callable to time
+CASES: Dict[str, Callable[[str], Callable[[], Any]]] = {
+    'categorize_term': case_categorize_term,
+    'analyze_competition_level': case_analyze_competition_level,
+    'score_seed': case_score_seed,
+    'filter_suggestions': case_filter_suggestions,
+    'generate_opportunity_summary': case_generate_opportunity_summary,
+    'score_frame': case_score_frame,
+    'analyzer_load_data': case_analyzer_load_data,
+    'analyzer_load_data_cached': case_analyzer_load_data_cached,
+    'category_report': case_category_report,
+}
+
+
+def result_key(case: str, rows: int) -> str:
+    return f"{case}@{format_count(rows)}"
+
+
+def run_suite(sizes: Sequence[int], cases: Sequence[str], repeat: int = 5,
+              memory: bool = True, report: Callable[[str], None] = print) -> Dict[str, Any]:
+    """Run the selected cases at each size and return a results document"""
+    from src.logging_config import configure_logging, shutdown_logging
+
+    results: Dict[str, Dict[str, float]] = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Functions under test write reports and logs to the working directory
+        os.chdir(workdir)
+        configure_logging(os.path.join(workdir, 'bench_log.txt'), console=False)
+        try:
+            for rows in sizes:
+                csv_path = cached_results(rows)
+                for case in cases:
+                    func = CASES[case](csv_path)
+                    stats = measure(func, repeat=repeat, memory=memory, min_time=MIN_TIME)
+                    stats['rows'] = rows
+                    results[result_key(case, rows)] = stats
+                    report(format_result(result_key(case, rows), stats))
+        finally:
+            shutdown_logging()
+            os.chdir(cwd)
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def format_result(key: str, stats: Dict[str, float]) -> str:
+    """One result line: median, spread, throughput and peak memory"""
+    spread = f"±{stats['stdev'] / stats['median']:.0%}" if stats['median'] else ""
+    memory = f"{stats['peak_bytes'] / 1e6:9.1f} MB" if 'peak_bytes' in stats else ""
+    return (f"   {key:40s} {stats['median'] * 1000:10.1f} ms {spread:>5s}  "
+            f"{stats['rows'] / stats['median']:12,.0f} rows/s  {memory}")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            report: Callable[[str], None] = print) -> List[str]:
+    """Compare results with a baseline; returns the keys that regressed"""
+    regressions = []
+    for key, stats in results['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if base is None:
+            report(f"   {key:40s} (no baseline)")
+            continue
+        time_ratio = stats['min'] / base['min'] if base['min'] else 1.0
+        memory_ratio = (stats['peak_bytes'] / base['peak_bytes']
+                        if stats.get('peak_bytes') and base.get('peak_bytes') else 1.0)
+        regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        if regressed:
+            regressions.append(key)
+        status = "❌ REGRESSION" if regressed else ("🚀 faster" if time_ratio < 1 - threshold else "✅")
+        report(f"   {key:40s} time {time_ratio:6.2f}x  memory {memory_ratio:6.2f}x  {status}")
+    return regressions
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path: str, document: Dict[str, Any]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(command):
+        command.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated row counts, e.g. 10k,1M,10M")
+        command.add_argument("--cases", help=f"Comma-separated cases (default: all of {', '.join(CASES)})")
+        command.add_argument("--repeat", type=int, default=5, help="Timed repeats per case")
+        command.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and print/save results")
+    add_run_options(run_parser)
+    run_parser.add_argument("-o", "--output", help="Write results JSON here")
+
+    compare_parser = commands.add_parser("compare", help="Compare a results file with the baselines")
+    compare_parser.add_argument("results", help="Results JSON from `run -o`")
+
+    check_parser = commands.add_parser("check", help="Run and compare; exit 1 on regression")
+    add_run_options(check_parser)
+
+    baseline_parser = commands.add_parser("baseline", help="Run and store results as the new baselines")
+    add_run_options(baseline_parser)
+
+    for command in (compare_parser, check_parser, baseline_parser):
+        command.add_argument("--baseline", default=BASELINE_FILE, help="Baselines JSON")
+    for command in (compare_parser, check_parser):
+        command.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                             help="Allowed slowdown/memory growth before failing (0.25 = 25%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        regressions = compare(load_json(args.results), load_json(args.baseline), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    sizes = [parse_count(size) for size in args.sizes.split(',')]
+    cases = args.cases.split(',') if args.cases else list(CASES)
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    print(f"📊 Running {len(cases)} cases at {', '.join(format_count(size) for size in sizes)} rows")
+    results = run_suite(sizes, cases, args.repeat, memory=not args.no_memory)
+
+    if args.command == "run":
+        if args.output:
+            save_json(args.output, results)
+            print(f"✅ Results saved to {args.output}")
+    elif args.command == "baseline":
+        baseline = load_json(args.baseline) if os.path.exists(args.baseline) else {'results': {}}
+        baseline['meta'] = results['meta']
+        baseline['results'].update(results['results'])
+        save_json(args.baseline, baseline)
+        print(f"✅ Baselines updated in {args.baseline}")
+    elif args.command == "check":
+        print(f"\n🔍 Comparing with {args.baseline} (threshold {args.threshold:.0%})")
+        regressions = compare(results, load_json(args.baseline), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ No regressions")
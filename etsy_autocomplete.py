@@ -1,34 +1,27 @@
-from playwright.sync_api import sync_playwright
 import csv, time, json, random, argparse
+import io
+import contextlib
+import functools
 from datetime import datetime, timedelta
+import importlib.util
 import os
 from pathlib import Path
-import requests
-import urllib.parse
 import re
-from bs4 import BeautifulSoup
-import pandas as pd
-import numpy as np
-
-# Try to import optional dependencies
-try:
-    from pytrends.request import TrendReq
-    PYTRENDS_AVAILABLE = True
-except ImportError:
-    PYTRENDS_AVAILABLE = False
-    print("⚠️ pytrends not available. Install with: pip install pytrends")
 
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
-    print("⚠️ selenium not available. Install with: pip install selenium webdriver-manager")
+from src.change_detection import FingerprintStore, fingerprint_payload, fingerprint_path_for
+from src.keyword_engine import get_keyword_engine
+from src.logging_config import configure_logging, get_logger
+from src.metrics import metrics
+from src.opportunity_summary import summarize_csv
+from src.records import RESULT_FIELDS, MarketData, ResultRow
+from src.tracing import tracer
+from src.seed_sources import ProcessedSeedLog, SeedProgress, open_seed_source, parse_shard, seed_key, seed_stream
+from src.suggestion_filter import SuggestionFilter
+
+# Optional dependencies are only located here; they are imported on first use
+PYTRENDS_AVAILABLE = importlib.util.find_spec("pytrends") is not None
+if not PYTRENDS_AVAILABLE:
+    print("⚠️ pytrends not available. Install with: pip install pytrends")
 
 # Strategic search terms for high-demand, moderate-competition opportunities
 SEEDS = [
@@ -104,7 +97,17 @@ SEEDS = [
 
 OUTPUT_CSV = "etsy_market_research.csv"
 CHECKPOINT_FILE = "scraping_checkpoint.json"
+PROCESSED_SEEDS_FILE = str(Path(CHECKPOINT_FILE).with_suffix(".seeds"))
 LOG_FILE = "scraping_log.txt"
+FINGERPRINT_FILE = fingerprint_path_for(OUTPUT_CSV)
+METRICS_PROM_FILE = str(Path(OUTPUT_CSV).with_suffix(".metrics.prom"))
+METRICS_SUMMARY_FILE = str(Path(OUTPUT_CSV).with_suffix(".metrics.json"))
+SKETCH_FILE = str(Path(OUTPUT_CSV).with_suffix(".sketch.json"))
+TRACE_FILE = str(Path(OUTPUT_CSV).with_suffix(".trace.json"))
+TRENDS_DIR = str(Path(OUTPUT_CSV).with_suffix(".trends"))
+
+# Price text like "$15.99" or "15.99"
+PRICE_PATTERN = re.compile(r'[\$£€]?(\d+\.?\d*)')
 
 # Configuration
 CONFIG = {
@@ -116,6 +119,7 @@ CONFIG = {
     "enable_etsy_analysis": True,  # Enable Etsy search result analysis
     "enable_amazon_analysis": False,  # Enable Amazon analysis (requires API)
     "enable_social_analysis": False,  # Enable social media analysis
+    "enable_change_detection": True,  # Reuse previous rows when a search page is unchanged
     "user_agents": [
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -123,26 +127,73 @@ CONFIG = {
     ]
 }
 
-# Initialize Google Trends (will be done after log_message function is defined)
+# Google Trends client, created on first use by get_trends_client()
 pytrends = None
+# Full interest series of every Trends fetch, opened on first use by get_trends_store()
+trends_store = None
+
+# Records are queued here and written to LOG_FILE and the console by a background thread
+logger = get_logger()
 
 def log_message(message, level="INFO"):
     """Log message to file and console"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] {level}: {message}"
-    print(log_entry)
-    
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_entry + "\n")
+    logger.log(level, message)
 
-# Initialize Google Trends after log_message is defined
-if PYTRENDS_AVAILABLE and CONFIG["enable_google_trends"]:
-    try:
-        pytrends = TrendReq(hl='en-US', tz=360, timeout=(10,25), retries=2, backoff_factor=0.1)
-        log_message("✅ Google Trends API initialized")
-    except Exception as e:
-        log_message(f"❌ Failed to initialize Google Trends: {e}", "ERROR")
-        CONFIG["enable_google_trends"] = False
+# Pipeline metrics, exported to METRICS_PROM_FILE during the run and METRICS_SUMMARY_FILE at the end
+STAGE_SECONDS = metrics.histogram("etsy_scrape_stage_seconds", "Time spent in each stage of the scrape pipeline")
+SEEDS_TOTAL = metrics.counter("etsy_scrape_seeds_total", "Seeds processed, by outcome")
+RETRIES_TOTAL = metrics.counter("etsy_scrape_retries_total", "Failed page fetches that were retried")
+ROWS_TOTAL = metrics.counter("etsy_scrape_rows_written_total", "Result rows written to the output CSV")
+SUGGESTIONS_TOTAL = metrics.counter("etsy_scrape_suggestions_total", "Suggestions kept after filtering")
+LAST_SEED_TIME = metrics.gauge("etsy_scrape_last_seed_timestamp_seconds", "Unix time the last seed finished")
+
+@contextlib.contextmanager
+def _stage(name, **span_args):
+    """Time a pipeline stage into the latency histogram and, with --trace, a trace span"""
+    with tracer.span(name, **span_args) as span, STAGE_SECONDS.time(stage=name):
+        yield span
+
+def timed_stage(name):
+    """Decorator that times a whole function as one pipeline stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def log_stage_summary():
+    """Log per-stage latency percentiles, slowest total first"""
+    stages = STAGE_SECONDS.summary()
+    # Stages nest (fetch contains homepage ... extract_market), so shares are of total seed time, not additive
+    seed_total = stages.get('stage=seed', {}).get('total') or 1
+    log_message("⏱️ Stage latency (p50 / p95 / p99, share of seed time):")
+    for name, stats in sorted(stages.items(), key=lambda item: item[1]['total'], reverse=True):
+        stage = name.split('=', 1)[-1]
+        log_message(f"   {stage:20s} {stats['p50']:7.3f}s / {stats['p95']:7.3f}s / {stats['p99']:7.3f}s "
+                    f"({stats['count']} calls, {stats['total'] / seed_total:.0%})")
+
+def get_trends_client():
+    """Return the Google Trends client, creating it on first use"""
+    global pytrends
+    if pytrends is None and PYTRENDS_AVAILABLE and CONFIG["enable_google_trends"]:
+        try:
+            from pytrends.request import TrendReq
+            pytrends = TrendReq(hl='en-US', tz=360, timeout=(10,25), retries=2, backoff_factor=0.1)
+            log_message("✅ Google Trends API initialized")
+        except Exception as e:
+            log_message(f"❌ Failed to initialize Google Trends: {e}", "ERROR")
+            CONFIG["enable_google_trends"] = False
+    return pytrends
+
+def get_trends_store():
+    """Return the store of fetched interest series, opening it on first use"""
+    global trends_store
+    if trends_store is None:
+        from src.trends_store import TrendsStore
+        trends_store = TrendsStore(TRENDS_DIR)
+    return trends_store
 
 def load_checkpoint():
     """Load progress from checkpoint file"""
@@ -150,17 +201,22 @@ def load_checkpoint():
         try:
             with open(CHECKPOINT_FILE, "r") as f:
                 checkpoint = json.load(f)
-            log_message(f"Resuming from checkpoint: {checkpoint['processed_count']}/{len(SEEDS)} seeds completed")
+            log_message(f"Resuming from checkpoint: {checkpoint['processed_count']} seeds completed")
             return checkpoint
         except Exception as e:
             log_message(f"Error loading checkpoint: {e}", "ERROR")
-    return {"processed_seeds": [], "processed_count": 0, "total_rows": 0}
+    return {"processed_count": 0, "total_rows": 0}
 
-def save_checkpoint(processed_seeds, total_rows):
-    """Save progress to checkpoint file"""
+def load_processed_keys(checkpoint):
+    """Keys of processed seeds from the append-only log (and the seed list of older checkpoints)"""
+    keys = ProcessedSeedLog(PROCESSED_SEEDS_FILE).keys()
+    keys.update(seed_key(seed) for seed in checkpoint.get("processed_seeds", []))
+    return keys
+
+def save_checkpoint(processed_count, total_rows):
+    """Save progress counters to the checkpoint file (processed seeds go to the seed log)"""
     checkpoint = {
-        "processed_seeds": processed_seeds,
-        "processed_count": len(processed_seeds),
+        "processed_count": processed_count,
         "total_rows": total_rows,
         "timestamp": datetime.now().isoformat()
     }
@@ -170,50 +226,70 @@ def save_checkpoint(processed_seeds, total_rows):
     except Exception as e:
         log_message(f"Error saving checkpoint: {e}", "ERROR")
 
-def get_remaining_seeds(processed_seeds):
-    """Get list of seeds that haven't been processed yet"""
-    return [seed for seed in SEEDS if seed not in processed_seeds]
+def get_remaining_seeds(processed_keys):
+    """Get list of builtin seeds whose keys haven't been processed yet"""
+    return [seed for seed in SEEDS if seed_key(seed) not in processed_keys]
 
 def random_delay():
     """Add random delay to appear more human-like"""
     delay = random.uniform(CONFIG["min_delay"], CONFIG["max_delay"])
     time.sleep(delay)
 
-def scrape_seed_with_retry(page, seed, max_retries=3):
-    """Scrape a seed term with retry logic"""
+def empty_market_data():
+    """Market data used when nothing could be extracted for a seed"""
+    return MarketData()
+
+def fetch_seed_payload_with_retry(page, seed, max_retries=3):
+    """Fetch the raw page payload for a seed with retry logic"""
     for attempt in range(max_retries):
         try:
-            return scrape_seed(page, seed)
+            return fetch_seed_payload(page, seed)
         except Exception as e:
             log_message(f"Attempt {attempt + 1} failed for '{seed}': {e}", "WARNING")
+            tracer.instant("fetch_failed", seed=seed, attempt=attempt + 1, error=str(e))
             if attempt < max_retries - 1:
+                RETRIES_TOTAL.inc()
                 delay = (attempt + 1) * 5  # Exponential backoff
                 log_message(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
+                with _stage("retry_backoff"):
+                    time.sleep(delay)
             else:
                 log_message(f"All retries failed for '{seed}'", "ERROR")
-                return [], {'listing_count': 0, 'price_range': {'min': 0, 'max': 0, 'avg': 0}, 'competition_level': 'unknown'}
-    return [], {'listing_count': 0, 'price_range': {'min': 0, 'max': 0, 'avg': 0}, 'competition_level': 'unknown'}
+    return None
+
+def scrape_seed_with_retry(page, seed, max_retries=3):
+    """Scrape a seed term with retry logic"""
+    payload = fetch_seed_payload_with_retry(page, seed, max_retries)
+    return process_seed_payload(seed, payload)
 
 def scrape_seed(page, seed):
     """Scrape Etsy search results and extract suggestions and market data"""
+    return process_seed_payload(seed, fetch_seed_payload(page, seed))
+
+def fetch_seed_payload(page, seed):
+    """Search Etsy for a seed and collect the raw page text the extractors work on
+
+    Returns None if the search could not be submitted.
+    """
     # Go to homepage to ensure clean state each time (resets suggestions)
-    page.goto("https://www.etsy.com/", wait_until="domcontentloaded", timeout=CONFIG["timeout"])
+    with _stage("homepage"):
+        page.goto("https://www.etsy.com/", wait_until="domcontentloaded", timeout=CONFIG["timeout"])
     
     # Accept cookies/consent banners if present (selectors can vary by region)
-    try:
-        # Common consent button patterns; ignore if not present
-        for sel in [
-            'button:has-text("Accept")',
-            'button:has-text("Accept all")',
-            'button[aria-label="Accept"]',
-            '[data-testid="gdpr-banner-accept"]'
-        ]:
-            if page.locator(sel).first.is_visible():
-                page.locator(sel).first.click()
-                break
-    except:
-        pass
+    with _stage("consent"):
+        try:
+            # Common consent button patterns; ignore if not present
+            for sel in [
+                'button:has-text("Accept")',
+                'button:has-text("Accept all")',
+                'button[aria-label="Accept"]',
+                '[data-testid="gdpr-banner-accept"]'
+            ]:
+                if page.locator(sel).first.is_visible():
+                    page.locator(sel).first.click()
+                    break
+        except:
+            pass
 
     # Try multiple search input selectors - Etsy's selectors change frequently
     search_selectors = [
@@ -227,62 +303,67 @@ def scrape_seed(page, seed):
     ]
     
     search_input = None
-    for selector in search_selectors:
-        try:
-            if page.locator(selector).is_visible(timeout=3000):
-                search_input = page.locator(selector)
-                log_message(f"Found search input with selector: {selector}")
-                break
-        except:
-            continue
+    with _stage("search_input") as span:
+        for probes, selector in enumerate(search_selectors, 1):
+            try:
+                if page.locator(selector).is_visible(timeout=3000):
+                    search_input = page.locator(selector)
+                    log_message(f"Found search input with selector: {selector}")
+                    span.set(selector=selector)
+                    break
+            except:
+                continue
+        span.set(probes=probes)
     
     if not search_input:
         log_message("Could not find search input - taking screenshot for debugging", "ERROR")
         page.screenshot(path=f"etsy_debug_{seed.replace(' ', '_')}.png")
-        return []
+        return None
 
     # Fill in the search term and submit
-    search_input.click()
-    search_input.fill(seed)
-    
-    # Try to find and click the search button
-    search_button_selectors = [
-        'button[type="submit"]',
-        'button[aria-label*="search"]',
-        'button:has-text("Search")',
-        'input[type="submit"]',
-        '[data-testid="search-button"]'
-    ]
-    
-    search_submitted = False
-    for button_sel in search_button_selectors:
-        try:
-            if page.locator(button_sel).is_visible():
-                page.locator(button_sel).click()
-                search_submitted = True
-                log_message(f"Clicked search button with selector: {button_sel}")
-                break
-        except:
-            continue
-    
-    # If no button found, try pressing Enter
-    if not search_submitted:
-        search_input.press("Enter")
-        log_message("Pressed Enter to submit search")
+    with _stage("submit"):
+        search_input.click()
+        search_input.fill(seed)
+        
+        # Try to find and click the search button
+        search_button_selectors = [
+            'button[type="submit"]',
+            'button[aria-label*="search"]',
+            'button:has-text("Search")',
+            'input[type="submit"]',
+            '[data-testid="search-button"]'
+        ]
+        
+        search_submitted = False
+        for button_sel in search_button_selectors:
+            try:
+                if page.locator(button_sel).is_visible():
+                    page.locator(button_sel).click()
+                    search_submitted = True
+                    log_message(f"Clicked search button with selector: {button_sel}")
+                    break
+            except:
+                continue
+        
+        # If no button found, try pressing Enter
+        if not search_submitted:
+            search_input.press("Enter")
+            log_message("Pressed Enter to submit search")
     
     # Wait for search results page to load
-    page.wait_for_load_state("networkidle", timeout=CONFIG["timeout"])
-    time.sleep(3)
-    
-    # Extract suggestions and market data
-    suggestions = []
-    market_data = {
-        'listing_count': 0,
-        'price_range': {'min': 0, 'max': 0, 'avg': 0},
-        'competition_level': 'unknown'
-    }
+    with _stage("networkidle"):
+        page.wait_for_load_state("networkidle", timeout=CONFIG["timeout"])
+    with _stage("settle"):
+        time.sleep(3)
     
-    # Extract related terms from search results page
+    payload = {'related_texts': collect_related_texts(page)}
+    if CONFIG["enable_etsy_analysis"]:
+        payload.update(collect_market_texts(page))
+    return payload
+
+@timed_stage("extract_suggestions")
+def collect_related_texts(page):
+    """Collect raw text of related-term candidates from a search results page"""
     related_selectors = [
         'a[href*="search"]',  # Search links
         '[class*="related"]',  # Related terms
@@ -292,14 +373,7 @@ def scrape_seed(page, seed):
         'a[class*="category"]'  # Category links
     ]
     
-    # Filter out common navigation and non-relevant terms
-    skip_terms = [
-        'home', 'shop', 'cart', 'account', 'help', 'sign', 'login', 'register',
-        'more like this', 'all filters', 'special offers', 'free shipping', 'on sale',
-        'personalizable', 'price', 'enter minimum', 'enter maximum', 'apply',
-        'sort by', 'relevance', 'newest', 'price low', 'price high'
-    ]
-    
+    texts = []
     for sel in related_selectors:
         try:
             elements = page.locator(sel)
@@ -307,116 +381,130 @@ def scrape_seed(page, seed):
             if count > 0:
                 log_message(f"Found {count} elements with selector: {sel}")
                 for i in range(min(count, 15)):  # Increased limit
-                    text = elements.nth(i).inner_text().strip()
-                    if text and text not in suggestions and len(text) > 3 and len(text) < 100:
-                        # Filter out common navigation text and irrelevant terms
-                        text_lower = text.lower()
-                        if not any(skip in text_lower for skip in skip_terms):
-                            # Prioritize terms that look like product categories or search terms
-                            if any(keyword in text_lower for keyword in ['print', 'poster', 'art', 'gift', 'personalized', 'custom', 'vintage', 'wall', 'decor']):
-                                suggestions.append(text)
-                            else:
-                                suggestions.append(text)
+                    texts.append(elements.nth(i).inner_text().strip())
         except Exception as e:
             continue
+    return texts
+
+@timed_stage("extract_market")
+def collect_market_texts(page):
+    """Collect raw listing-count and price text from a search results page"""
+    market_texts = {'listing_count_text': None, 'price_texts': []}
+    
+    # Try to get total listing count
+    count_selectors = [
+        '[data-testid="search-results-count"]',
+        '[class*="results-count"]',
+        '[class*="search-results"]',
+        'span:has-text("results")',
+        'span:has-text("items")'
+    ]
     
-    # Extract market data if enabled
-    if CONFIG["enable_etsy_analysis"]:
-        market_data = extract_etsy_market_data(page, seed)
+    for selector in count_selectors:
+        try:
+            element = page.locator(selector).first
+            if element.is_visible():
+                text = element.inner_text()
+                if re.search(r'\d', text):
+                    market_texts['listing_count_text'] = text
+                    break
+        except:
+            continue
     
-    # If no suggestions found, take a screenshot for debugging
-    if not suggestions:
-        log_message("No related terms found - taking screenshot for debugging", "WARNING")
-        page.screenshot(path=f"etsy_search_results_{seed.replace(' ', '_')}.png")
-        
-        # Get page title and URL for debugging
-        title = page.title()
-        url = page.url()
-        log_message(f"Search results page: {title}")
-        log_message(f"URL: {url}")
+    # Extract price text from first few listings
+    price_selectors = [
+        '[data-testid="price"]',
+        '[class*="price"]',
+        'span[class*="currency"]',
+        '[data-ui="price"]'
+    ]
+    
+    for selector in price_selectors:
+        try:
+            elements = page.locator(selector)
+            count = min(elements.count(), 20)  # Check first 20 listings
+            
+            price_texts = []
+            for i in range(count):
+                try:
+                    price_texts.append(elements.nth(i).inner_text().strip())
+                except:
+                    continue
+            
+            if any(PRICE_PATTERN.search(text) for text in price_texts):
+                market_texts['price_texts'] = price_texts
+                break
+        except:
+            continue
+    
+    return market_texts
+
+@timed_stage("process")
+def process_seed_payload(seed, payload):
+    """Turn a raw page payload into filtered suggestions and market data"""
+    if payload is None:
+        return [], empty_market_data()
+    
+    suggestions = filter_suggestions(payload['related_texts'])
+    
+    market_data = empty_market_data()
+    if CONFIG["enable_etsy_analysis"]:
+        market_data = parse_market_texts(
+            seed, payload.get('listing_count_text'), payload.get('price_texts', [])
+        )
     
     return suggestions, market_data
 
+def filter_suggestions(texts):
+    """Filter raw related-term text down to usable suggestions"""
+    return SuggestionFilter().filter(texts)
+
+def log_empty_results(page, seed):
+    """Save a screenshot and page details when a search produced no suggestions"""
+    log_message("No related terms found - taking screenshot for debugging", "WARNING")
+    page.screenshot(path=f"etsy_search_results_{seed.replace(' ', '_')}.png")
+    
+    # Get page title and URL for debugging
+    log_message(f"Search results page: {page.title()}")
+    log_message(f"URL: {page.url}")
+
 def extract_etsy_market_data(page, seed):
     """Extract market data from Etsy search results"""
-    market_data = {
-        'listing_count': 0,
-        'price_range': {'min': 0, 'max': 0, 'avg': 0},
-        'competition_level': 'unknown',
-        'price_data': []
-    }
+    market_texts = collect_market_texts(page)
+    return parse_market_texts(seed, market_texts['listing_count_text'], market_texts['price_texts'])
+
+def parse_market_texts(seed, listing_count_text, price_texts):
+    """Parse listing count and price statistics from raw page text"""
+    market_data = MarketData()
     
     try:
-        # Try to get total listing count
-        count_selectors = [
-            '[data-testid="search-results-count"]',
-            '[class*="results-count"]',
-            '[class*="search-results"]',
-            'span:has-text("results")',
-            'span:has-text("items")'
-        ]
-        
-        for selector in count_selectors:
-            try:
-                element = page.locator(selector).first
-                if element.is_visible():
-                    text = element.inner_text()
-                    # Extract number from text like "1,234 results" or "1,234 items"
-                    numbers = re.findall(r'[\d,]+', text)
-                    if numbers:
-                        count_str = numbers[0].replace(',', '')
-                        market_data['listing_count'] = int(count_str)
-                        log_message(f"Found {market_data['listing_count']} listings for '{seed}'")
-                        break
-            except:
-                continue
-        
-        # Extract price data from first few listings
-        price_selectors = [
-            '[data-testid="price"]',
-            '[class*="price"]',
-            'span[class*="currency"]',
-            '[data-ui="price"]'
-        ]
+        if listing_count_text:
+            # Extract number from text like "1,234 results" or "1,234 items"
+            numbers = re.findall(r'\d[\d,]*', listing_count_text)
+            if numbers:
+                market_data.listing_count = int(numbers[0].replace(',', ''))
+                log_message(f"Found {market_data.listing_count} listings for '{seed}'")
         
         prices = []
-        for selector in price_selectors:
-            try:
-                elements = page.locator(selector)
-                count = min(elements.count(), 20)  # Check first 20 listings
-                
-                for i in range(count):
-                    try:
-                        price_text = elements.nth(i).inner_text().strip()
-                        # Extract price from text like "$15.99" or "15.99"
-                        price_match = re.search(r'[\$£€]?(\d+\.?\d*)', price_text)
-                        if price_match:
-                            price = float(price_match.group(1))
-                            prices.append(price)
-                    except:
-                        continue
-                
-                if prices:
-                    break
-            except:
-                continue
+        for price_text in price_texts:
+            # Extract price from text like "$15.99" or "15.99"
+            price_match = PRICE_PATTERN.search(price_text)
+            if price_match:
+                prices.append(float(price_match.group(1)))
         
         # Calculate price statistics
         if prices:
-            market_data['price_data'] = prices
-            market_data['price_range']['min'] = min(prices)
-            market_data['price_range']['max'] = max(prices)
-            market_data['price_range']['avg'] = sum(prices) / len(prices)
+            market_data.set_prices(prices)
             
             # Determine competition level based on listing count and price range
-            if market_data['listing_count'] < 1000:
-                market_data['competition_level'] = 'low'
-            elif market_data['listing_count'] < 5000:
-                market_data['competition_level'] = 'moderate'
+            if market_data.listing_count < 1000:
+                market_data.competition_level = 'low'
+            elif market_data.listing_count < 5000:
+                market_data.competition_level = 'moderate'
             else:
-                market_data['competition_level'] = 'high'
+                market_data.competition_level = 'high'
             
-            log_message(f"Price range: ${market_data['price_range']['min']:.2f} - ${market_data['price_range']['max']:.2f} (avg: ${market_data['price_range']['avg']:.2f})")
+            log_message(f"Price range: ${market_data.min_price:.2f} - ${market_data.max_price:.2f} (avg: ${market_data.avg_price:.2f})")
         
     except Exception as e:
         log_message(f"Error extracting market data: {e}", "WARNING")
@@ -425,49 +513,18 @@ def extract_etsy_market_data(page, seed):
 
 def analyze_competition_level(seed):
     """Analyze competition level and opportunity potential"""
-    seed_lower = seed.lower()
-    
-    # High competition indicators (avoid these)
-    high_comp_keywords = [
-        'gift', 'personalized', 'custom', 'print', 'poster', 'wall art', 'decor',
-        'christmas', 'birthday', 'anniversary', 'wedding', 'baby', 'kids',
-        'popular', 'trending', 'viral', 'best seller', 'top rated'
-    ]
-    
-    # Low competition opportunities (target these)
-    low_comp_keywords = [
-        'niche', 'specific', 'unique', 'rare', 'vintage', 'antique', 'historical',
-        'obscure', 'specialized', 'professional', 'technical', 'academic',
-        'regional', 'local', 'cultural', 'heritage', 'traditional'
-    ]
-    
-    # High demand indicators (good for sales)
-    demand_keywords = [
-        'wall art', 'decor', 'home', 'office', 'gift', 'personalized',
-        'vintage', 'antique', 'unique', 'custom', 'handmade'
-    ]
-    
-    high_count = sum(1 for keyword in high_comp_keywords if keyword in seed_lower)
-    low_count = sum(1 for keyword in low_comp_keywords if keyword in seed_lower)
-    demand_count = sum(1 for keyword in demand_keywords if keyword in seed_lower)
-    
-    # Calculate opportunity score (higher = better opportunity)
-    opportunity_score = demand_count - high_count + (low_count * 2)
-    
-    if high_count > low_count and high_count > 2:
-        return "High Competition - Avoid"
-    elif low_count > high_count and demand_count > 0:
-        return "Low Competition - Good Opportunity"
-    elif opportunity_score > 2:
-        return "Moderate Competition - Consider"
-    else:
-        return "High Competition - Avoid"
+    return get_keyword_engine().competition_level(seed)
 
+@timed_stage("trends")
 def get_google_trends_data(term):
     """Get real Google Trends data for a search term"""
     if not CONFIG["enable_google_trends"] or not PYTRENDS_AVAILABLE:
         return get_simulated_trends_data(term)
     
+    pytrends = get_trends_client()
+    if pytrends is None:
+        return get_simulated_trends_data(term)
+    
     try:
         # Build payload
         pytrends.build_payload([term], cat=0, timeframe='today 12-m', geo='US')
@@ -478,31 +535,28 @@ def get_google_trends_data(term):
         if interest_over_time.empty:
             return get_simulated_trends_data(term)
         
-        # Calculate trend metrics
-        recent_data = interest_over_time[term].tail(30)  # Last 30 days
-        older_data = interest_over_time[term].head(30)   # First 30 days
-        
-        recent_avg = recent_data.mean()
-        older_avg = older_data.mean()
-        
-        # Calculate trend score
-        if older_avg == 0:
-            trend_score = 0
-        else:
-            trend_score = ((recent_avg - older_avg) / older_avg) * 100
+        # Trend score, slope, seasonality and breakout from the batch trend engine (one row here)
+        from src.trend_engine import trend_metrics
+        interest = interest_over_time[term]
         
         # Get related queries
         related_queries = pytrends.related_queries()
-        rising_queries = related_queries[term]['rising'] if related_queries[term]['rising'] is not None else pd.DataFrame()
-        top_queries = related_queries[term]['top'] if related_queries[term]['top'] is not None else pd.DataFrame()
+        rising_queries = related_queries[term]['rising']
+        top_queries = related_queries[term]['top']
+        rising_queries = rising_queries.to_dict('records') if rising_queries is not None and not rising_queries.empty else []
+        top_queries = top_queries.to_dict('records') if top_queries is not None and not top_queries.empty else []
+        
+        # Keep the full series and related queries so metrics can change without refetching
+        try:
+            get_trends_store().append(term, interest, rising=rising_queries, top=top_queries,
+                                      timeframe='today 12-m', geo='US')
+        except OSError as e:
+            log_message(f"Error storing Google Trends series for '{term}': {e}", "WARNING")
         
         return {
-            'trend_score': trend_score,
-            'trend_direction': 'growing' if trend_score > 5 else 'declining' if trend_score < -5 else 'stable',
-            'trend_strength': abs(trend_score),
-            'current_interest': recent_avg,
-            'rising_queries': rising_queries.to_dict('records') if not rising_queries.empty else [],
-            'top_queries': top_queries.to_dict('records') if not top_queries.empty else []
+            **trend_metrics(interest),
+            'rising_queries': rising_queries,
+            'top_queries': top_queries
         }
         
     except Exception as e:
@@ -558,53 +612,37 @@ def get_simulated_trends_data(term):
         'top_queries': []
     }
 
-def calculate_opportunity_score(seed, suggestions, trends_data=None):
-    """Calculate opportunity score based on seed, suggestions, and market trends"""
-    seed_lower = seed.lower()
+def analyze_seed(seed, suggs, market_data, timestamp):
+    """Score a scraped seed and build its output rows"""
+    from src.scoring import get_scoring_weights, score_seed  # numpy is only needed once scraping starts
     
-    # Factors that increase opportunity score
-    positive_factors = {
-        'vintage': 3, 'antique': 3, 'historical': 3, 'niche': 4,
-        'specific': 2, 'unique': 3, 'rare': 4, 'obscure': 4,
-        'regional': 3, 'cultural': 3, 'heritage': 3, 'traditional': 2,
-        'professional': 2, 'technical': 2, 'academic': 2
-    }
+    # Category, competition and keyword score come from one keyword scan
+    category, competition_level, keyword_score = get_keyword_engine().classify(seed, suggs)
     
-    # Factors that decrease opportunity score
-    negative_factors = {
-        'gift': -2, 'personalized': -1, 'custom': -1, 'print': -1,
-        'poster': -1, 'christmas': -3, 'birthday': -2, 'wedding': -2,
-        'popular': -3, 'trending': -3, 'viral': -3, 'best seller': -3
-    }
+    # Get trend data
+    trends_data = get_google_trends_data(seed)
     
-    score = 0
+    # Combine keywords, market data and trends using the weights in config.yaml
+    opportunity_score, recommendation = score_seed(keyword_score, market_data, trends_data)
     
-    # Analyze seed term
-    for factor, points in positive_factors.items():
-        if factor in seed_lower:
-            score += points
+    # Every column but the suggestion is shared by the seed's rows
+    shared = (
+        competition_level, opportunity_score, trends_data['trend_score'], trends_data['trend_direction'],
+        market_data.listing_count, market_data.avg_price, market_data.price_range, category, recommendation
+    )
+    rows_for_seed = [ResultRow(timestamp, seed, s, *shared) for s in suggs]
     
-    for factor, points in negative_factors.items():
-        if factor in seed_lower:
-            score += points
+    log_message(f"✅ {seed} → {len(suggs)} suggestions (Score: {opportunity_score:.1f}, Trend: {trends_data['trend_direction']}, {competition_level})")
+    log_message(f"Market: {market_data.listing_count} listings, Avg: ${market_data.avg_price:.2f}")
+    log_message(f"Recommendation: {recommendation}")
+    if suggs:
+        log_message(f"Sample suggestions: {suggs[:3]}")
     
-    # Analyze suggestions for additional insights
-    if suggestions:
-        suggestion_text = ' '.join(suggestions).lower()
-        for factor, points in positive_factors.items():
-            if factor in suggestion_text:
-                score += points * 0.5  # Suggestions get half weight
-        
-        for factor, points in negative_factors.items():
-            if factor in suggestion_text:
-                score += points * 0.5
-    
-    # Add trend data to score
-    if trends_data:
-        trend_score = trends_data.get('trend_score', 0)
-        score += trend_score * 0.3  # Trends get 30% weight
+    # Highlight high-opportunity seeds
+    if opportunity_score >= get_scoring_weights().thresholds['high']:
+        log_message(f"🎯 HIGH OPPORTUNITY FOUND: {seed} (Score: {opportunity_score:.1f}, Trend: {trends_data['trend_direction']}, Competition: {market_data.competition_level})", "SUCCESS")
     
-    return score
+    return rows_for_seed
 
 def main():
     parser = argparse.ArgumentParser(description="Etsy Market Research Scraper")
@@ -615,8 +653,25 @@ def main():
     parser.add_argument("--no-etsy-analysis", action="store_true", help="Disable Etsy market analysis")
     parser.add_argument("--enable-amazon", action="store_true", help="Enable Amazon analysis (requires setup)")
     parser.add_argument("--enable-social", action="store_true", help="Enable social media analysis")
+    parser.add_argument("--no-change-detection", action="store_true", help="Always re-process pages, even if unchanged")
+    parser.add_argument("--refresh", action="store_true", help="Ignore stored page fingerprints but record new ones")
+    parser.add_argument("--seeds", action="append", metavar="SOURCE",
+                        help="Seed source: text/CSV file, '-' for stdin, sqlite:db[:table[:column]] or 'builtin' (repeatable)")
+    parser.add_argument("--shard", default="1/1", help="Process only shard I of N, e.g. 2/4")
+    parser.add_argument("--trace", nargs="?", const=TRACE_FILE, metavar="PATH",
+                        help=f"Record per-seed trace spans (Chrome trace JSON, default {TRACE_FILE})")
     args = parser.parse_args()
     
+    # Heavy imports are deferred until a run actually starts, so --help and imports stay fast
+    from playwright.sync_api import sync_playwright
+    from src.scoring import get_scoring_weights
+    from src.sketches import ResultsSketch, load_or_build_sketch
+    from src.term_index import update_index
+    
+    configure_logging(LOG_FILE)
+    if args.trace:
+        tracer.enable()
+    
     # Update config based on args
     CONFIG["min_delay"] = args.delay
     CONFIG["max_delay"] = args.delay + 2
@@ -624,32 +679,58 @@ def main():
     CONFIG["enable_etsy_analysis"] = not args.no_etsy_analysis
     CONFIG["enable_amazon_analysis"] = args.enable_amazon
     CONFIG["enable_social_analysis"] = args.enable_social
+    CONFIG["enable_change_detection"] = not args.no_change_detection
     
     timestamp = datetime.utcnow().isoformat()
     
-    # Load checkpoint if resuming
+    # Page fingerprints from previous runs, keyed by seed
+    fingerprints = None
+    if CONFIG["enable_change_detection"]:
+        fingerprints = FingerprintStore(FINGERPRINT_FILE, refresh=args.refresh)
+    run_flags = {
+        "trends": CONFIG["enable_google_trends"],
+        "etsy_analysis": CONFIG["enable_etsy_analysis"],
+        "scoring_weights": vars(get_scoring_weights())
+    }
+    
+    # Load checkpoint if resuming; processed seeds are kept as keys in an append-only log
+    processed_log = ProcessedSeedLog(PROCESSED_SEEDS_FILE)
     if args.resume:
         checkpoint = load_checkpoint()
-        processed_seeds = checkpoint["processed_seeds"]
+        processed_keys = load_processed_keys(checkpoint)
+        processed_count = len(processed_keys)
         total_rows = checkpoint["total_rows"]
-        remaining_seeds = get_remaining_seeds(processed_seeds)
-        log_message(f"Resuming with {len(remaining_seeds)} seeds remaining")
     else:
-        processed_seeds = []
+        processed_log.clear()
+        processed_keys = set()
+        processed_count = 0
         total_rows = 0
-        remaining_seeds = SEEDS
-        log_message(f"Starting fresh with {len(SEEDS)} seeds")
-    
-    # Create CSV file and write header immediately
-    header = [
-        "timestamp_utc", "seed", "suggestion", "competition_level", "opportunity_score", 
-        "trend_score", "trend_direction", "listing_count", "avg_price", "price_range", 
-        "category", "recommendation"
-    ]
+    
+    # Seeds are streamed from their sources; nothing is materialized up front
+    seed_specs = args.seeds or ["builtin"]
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+    remaining_seeds = seed_stream(
+        (open_seed_source(spec, SEEDS) for spec in seed_specs),
+        shard=shard,
+        skip=processed_keys
+    )
+    del processed_keys  # now owned by the stream's dedup set
+    log_message(f"{'Resuming' if args.resume else 'Starting fresh'} with seeds from {', '.join(seed_specs)} (shard {args.shard})")
+    progress = SeedProgress(log_message)
+    
+    # Create CSV file and write header immediately; rows are ResultRow tuples in the same column order
     if not args.resume or not os.path.exists(OUTPUT_CSV):
         with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=header)
-            writer.writeheader()
+            csv.writer(f).writerow(RESULT_FIELDS)
+    
+    # Approximate summary of everything in the results file, kept current as rows are written
+    if args.resume:
+        sketch, _ = load_or_build_sketch(OUTPUT_CSV, SKETCH_FILE)
+    else:
+        sketch = ResultsSketch()
     
     with sync_playwright() as p:
         # Use a more realistic browser setup
@@ -679,211 +760,134 @@ def main():
 
         for i, seed in enumerate(remaining_seeds, 1):
             try:
-                log_message(f"Processing {i}/{len(remaining_seeds)}: {seed}")
-                
-                suggs, market_data = scrape_seed_with_retry(page, seed, CONFIG["max_retries"])
-                competition_level = analyze_competition_level(seed)
-                
-                # Get trend data
-                trends_data = get_google_trends_data(seed)
-                opportunity_score = calculate_opportunity_score(seed, suggs, trends_data)
-                
-                # Adjust opportunity score based on market data
-                if market_data['listing_count'] > 0:
-                    if market_data['listing_count'] < 1000:
-                        opportunity_score += 2  # Low competition bonus
-                    elif market_data['listing_count'] > 10000:
-                        opportunity_score -= 2  # High competition penalty
-                
-                # Determine recommendation based on opportunity score, trends, and market data
-                if opportunity_score >= 5 and trends_data['trend_direction'] == 'growing' and market_data['competition_level'] == 'low':
-                    recommendation = "🔥 PERFECT OPPORTUNITY - Low Competition + Growing Trend"
-                elif opportunity_score >= 5 and trends_data['trend_direction'] == 'growing':
-                    recommendation = "🔥 HIGH OPPORTUNITY - Growing Trend"
-                elif opportunity_score >= 5:
-                    recommendation = "🔥 HIGH OPPORTUNITY - Research Further"
-                elif opportunity_score >= 2 and trends_data['trend_direction'] == 'growing':
-                    recommendation = "✅ GOOD OPPORTUNITY - Growing Trend"
-                elif opportunity_score >= 2:
-                    recommendation = "✅ GOOD OPPORTUNITY - Consider"
-                elif opportunity_score >= 0:
-                    recommendation = "⚠️ MODERATE - Check Competition"
-                else:
-                    recommendation = "❌ HIGH COMPETITION - Avoid"
-                
-                # Write data immediately for this seed
-                rows_for_seed = []
-                for s in suggs:
-                    row = {
-                        "timestamp_utc": timestamp, 
-                        "seed": seed, 
-                        "suggestion": s,
-                        "competition_level": competition_level,
-                        "opportunity_score": opportunity_score,
-                        "trend_score": trends_data['trend_score'],
-                        "trend_direction": trends_data['trend_direction'],
-                        "listing_count": market_data['listing_count'],
-                        "avg_price": market_data['price_range']['avg'],
-                        "price_range": f"${market_data['price_range']['min']:.2f}-${market_data['price_range']['max']:.2f}",
-                        "category": categorize_term(seed),
-                        "recommendation": recommendation
-                    }
-                    rows_for_seed.append(row)
-                
-                # Write to CSV immediately
-                with open(OUTPUT_CSV, "a", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=header)
-                    writer.writerows(rows_for_seed)
-                
-                total_rows += len(rows_for_seed)
-                processed_seeds.append(seed)
-                
-                # Save checkpoint after each successful seed
-                save_checkpoint(processed_seeds, total_rows)
-                
-                log_message(f"✅ {seed} → {len(suggs)} suggestions (Score: {opportunity_score:.1f}, Trend: {trends_data['trend_direction']}, {competition_level}) - Total: {total_rows} rows")
-                log_message(f"Market: {market_data['listing_count']} listings, Avg: ${market_data['price_range']['avg']:.2f}")
-                log_message(f"Recommendation: {recommendation}")
-                if suggs:
-                    log_message(f"Sample suggestions: {suggs[:3]}")
-                
-                # Highlight high-opportunity seeds
-                if opportunity_score >= 5:
-                    log_message(f"🎯 HIGH OPPORTUNITY FOUND: {seed} (Score: {opportunity_score:.1f}, Trend: {trends_data['trend_direction']}, Competition: {market_data['competition_level']})", "SUCCESS")
-                
                 # Add random delay between searches
-                if i < len(remaining_seeds):  # Don't delay after the last one
-                    random_delay()
+                if i > 1:  # Don't delay before the first one
+                    with _stage("delay"):
+                        random_delay()
+                
+                log_message(f"Processing #{i}: {seed}")
+                with _stage("seed", seed=seed, index=i) as seed_span:
+                    with _stage("fetch"):
+                        payload = fetch_seed_payload_with_retry(page, seed, CONFIG["max_retries"])
+                    
+                    # Skip filtering, market parsing, trends and scoring if the page is unchanged
+                    fingerprint = None
+                    cached_rows = None
+                    if fingerprints is not None and payload is not None:
+                        fingerprint = fingerprint_payload(payload, **run_flags)
+                        cached_rows = fingerprints.lookup(seed, fingerprint)
+                    
+                    if cached_rows is not None:
+                        rows_for_seed = [ResultRow._make(row)._replace(timestamp_utc=timestamp) for row in cached_rows]
+                        log_message(f"♻️ {seed} unchanged since last run - reusing {len(rows_for_seed)} rows")
+                        outcome = "unchanged"
+                    else:
+                        suggs, market_data = process_seed_payload(seed, payload)
+                        if payload is not None and not suggs:
+                            log_empty_results(page, seed)
+                        with _stage("analyze"):
+                            rows_for_seed = analyze_seed(seed, suggs, market_data, timestamp)
+                        SUGGESTIONS_TOTAL.inc(len(suggs))
+                        outcome = "failed" if payload is None else "ok" if suggs else "empty"
+                    
+                    # Write to CSV immediately; the fingerprint store keeps a compressed copy of these bytes
+                    with _stage("write"):
+                        buffer = io.StringIO()
+                        csv.writer(buffer).writerows(rows_for_seed)
+                        data = buffer.getvalue().encode("utf-8")
+                        with open(OUTPUT_CSV, "ab") as f:
+                            f.write(data)
+                        if fingerprint is not None:
+                            fingerprints.update(seed, fingerprint, data)
+                        sketch.update_rows(rows_for_seed)
+                        sketch.source_bytes = os.path.getsize(OUTPUT_CSV)
+                    
+                    total_rows += len(rows_for_seed)
+                    processed_count += 1
+                    
+                    # Save checkpoint after each successful seed
+                    with _stage("checkpoint"):
+                        processed_log.append(seed)
+                        save_checkpoint(processed_count, total_rows)
+                        sketch.save(SKETCH_FILE)
+                        if fingerprints is not None:
+                            fingerprints.save()
+                    
+                    seed_span.set(outcome=outcome, rows=len(rows_for_seed))
+                    SEEDS_TOTAL.inc(outcome=outcome)
+                    ROWS_TOTAL.inc(len(rows_for_seed))
+                    LAST_SEED_TIME.set(time.time())
+                    metrics.write_prometheus(METRICS_PROM_FILE)
+                    
+                    log_message(f"Total: {total_rows} rows")
+                    progress.step()
                     
             except Exception as e:
+                SEEDS_TOTAL.inc(outcome="error")
                 log_message(f"❌ Error processing '{seed}': {e}", "ERROR")
                 continue
 
         browser.close()
 
     log_message(f"🎉 Research complete! Total data points saved: {total_rows}")
+    log_message(progress.summary())
     log_message(f"Data saved to: {OUTPUT_CSV}")
+    if fingerprints is not None:
+        stats = fingerprints.stats()
+        log_message(f"♻️ Unchanged pages: {stats['hits']}/{stats['hits'] + stats['misses']} seeds ({stats['hit_rate']:.0%} hit rate)")
+        fingerprints.close()
+    
+    # Where the time went, per stage
+    log_stage_summary()
+    metrics.write_prometheus(METRICS_PROM_FILE)
+    metrics.write_summary(METRICS_SUMMARY_FILE)
+    log_message(f"Metrics saved to: {METRICS_PROM_FILE}, {METRICS_SUMMARY_FILE}")
+    if tracer.enabled:
+        tracer.write(args.trace)
+        log_message(f"🔍 Trace saved to: {args.trace} (open in https://ui.perfetto.dev or speedscope)")
     
     # Generate opportunity summary
     generate_opportunity_summary(OUTPUT_CSV)
     
-    # Clean up checkpoint file on successful completion
+    # Index this run's suggestions for `python -m src.term_index query`
+    try:
+        index_stats = update_index(OUTPUT_CSV)
+        log_message(f"🔎 Indexed {index_stats['rows']} new rows ({index_stats['suggestions']} suggestions searchable)")
+    except Exception as e:
+        log_message(f"Error updating the suggestion index: {e}", "ERROR")
+    
+    # Clean up checkpoint files on successful completion
     if os.path.exists(CHECKPOINT_FILE):
         os.remove(CHECKPOINT_FILE)
         log_message("Checkpoint file cleaned up")
+    processed_log.clear()
 
 def generate_opportunity_summary(csv_file):
     """Generate a summary of the best opportunities found"""
     if not os.path.exists(csv_file):
         return
     
-    opportunities = []
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('opportunity_score'):
-                    try:
-                        score = float(row['opportunity_score'])
-                        opportunities.append({
-                            'seed': row['seed'],
-                            'score': score,
-                            'recommendation': row['recommendation'],
-                            'category': row['category']
-                        })
-                    except ValueError:
-                        continue
+        summary = summarize_csv(csv_file)
     except Exception as e:
         log_message(f"Error reading CSV for summary: {e}", "ERROR")
         return
     
-    if not opportunities:
+    if not summary.latest:
         return
     
-    # Sort by opportunity score (highest first)
-    opportunities.sort(key=lambda x: x['score'], reverse=True)
-    
     # Generate summary report
     summary_file = "opportunity_summary.txt"
     with open(summary_file, 'w', encoding='utf-8') as f:
-        f.write("🎯 ETSY OPPORTUNITY ANALYSIS SUMMARY\n")
-        f.write("=" * 50 + "\n\n")
-        
-        # Top opportunities
-        high_opportunities = [op for op in opportunities if op['score'] >= 5]
-        good_opportunities = [op for op in opportunities if 2 <= op['score'] < 5]
-        
-        f.write(f"🔥 HIGH OPPORTUNITIES (Score ≥ 5): {len(high_opportunities)}\n")
-        f.write("-" * 40 + "\n")
-        for op in high_opportunities[:10]:  # Top 10
-            f.write(f"• {op['seed']} (Score: {op['score']:.1f}, Category: {op['category']})\n")
-        
-        f.write(f"\n✅ GOOD OPPORTUNITIES (Score 2-4): {len(good_opportunities)}\n")
-        f.write("-" * 40 + "\n")
-        for op in good_opportunities[:10]:  # Top 10
-            f.write(f"• {op['seed']} (Score: {op['score']:.1f}, Category: {op['category']})\n")
-        
-        # Category breakdown
-        f.write(f"\n📊 CATEGORY BREAKDOWN\n")
-        f.write("-" * 40 + "\n")
-        categories = {}
-        for op in opportunities:
-            cat = op['category']
-            if cat not in categories:
-                categories[cat] = {'count': 0, 'avg_score': 0, 'total_score': 0}
-            categories[cat]['count'] += 1
-            categories[cat]['total_score'] += op['score']
-        
-        for cat, data in categories.items():
-            data['avg_score'] = data['total_score'] / data['count']
-            f.write(f"• {cat}: {data['count']} opportunities, avg score: {data['avg_score']:.1f}\n")
+        f.write(summary.render())
     
     log_message(f"📊 Opportunity summary saved to: {summary_file}")
-    log_message(f"🔥 Found {len(high_opportunities)} high-opportunity seeds")
-    log_message(f"✅ Found {len(good_opportunities)} good-opportunity seeds")
+    log_message(f"🔥 Found {summary.high_count} high-opportunity seeds")
+    log_message(f"✅ Found {summary.good_count} good-opportunity seeds")
 
 def categorize_term(term):
     """Categorize search terms for better analysis"""
-    term_lower = term.lower()
-    
-    if any(word in term_lower for word in ['japanese', 'ukiyo-e', 'hokusai', 'fuji', 'cherry', 'zen', 'tokyo', 'kyoto']):
-        return "Japanese Art"
-    elif any(word in term_lower for word in ['national park', 'yosemite', 'yellowstone', 'grand canyon', 'park ranger', 'hiking', 'camping']):
-        return "National Parks"
-    elif any(word in term_lower for word in ['vintage travel', 'retro travel', 'airline', 'cruise', 'tourism', 'destination']):
-        return "Vintage Travel"
-    elif any(word in term_lower for word in ['map', 'cartography', 'atlas', 'street map', 'city plan']):
-        return "Maps/Cartography"
-    elif any(word in term_lower for word in ['botanical', 'scientific', 'medical', 'anatomy', 'butterfly', 'bird', 'natural history', 'herbarium']):
-        return "Botanical/Scientific"
-    elif any(word in term_lower for word in ['literature', 'book', 'shakespeare', 'novel', 'library', 'manuscript', 'poetry']):
-        return "Literature/Books"
-    elif any(word in term_lower for word in ['art nouveau', 'art deco', 'deco', 'advertising', 'typography', 'logo', 'brand']):
-        return "Art Nouveau/Deco"
-    elif any(word in term_lower for word in ['photograph', 'photo', 'portrait', 'street photography', 'landscape photo', 'architectural']):
-        return "Vintage Photography"
-    elif any(word in term_lower for word in ['fashion', 'beauty', 'pinup', 'clothing', 'style']):
-        return "Vintage Fashion"
-    elif any(word in term_lower for word in ['car', 'train', 'airplane', 'transportation', 'motorcycle', 'ship', 'vehicle']):
-        return "Vintage Transportation"
-    elif any(word in term_lower for word in ['american', 'western', 'cowboy', 'patriotic', 'baseball']):
-        return "Vintage Americana"
-    elif any(word in term_lower for word in ['european', 'french', 'italian', 'british', 'german', 'paris']):
-        return "Vintage European"
-    elif any(word in term_lower for word in ['vintage', 'antique', 'classic', 'old', 'historical', 'retro']):
-        return "Vintage/Classic"
-    elif any(word in term_lower for word in ['personalized', 'custom', 'name']):
-        return "Personalized"
-    elif any(word in term_lower for word in ['space', 'nasa', 'astronomy', 'galaxy']):
-        return "Space/Science"
-    elif any(word in term_lower for word in ['gift', 'present']):
-        return "Gifts"
-    elif any(word in term_lower for word in ['wall', 'decor', 'art']):
-        return "Wall Art"
-    elif any(word in term_lower for word in ['print', 'poster']):
-        return "Prints/Posters"
-    else:
-        return "Other"
+    return get_keyword_engine().categorize(term)
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,11 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from src.features import add_features
+from src.report_builder import ReportBuilder
+from src.suggestion_filter import is_facet_string
+from src.visualization import scalable_scatter
+
 # Manual data extraction from the successful searches we saw
 data = [
     # Japanese Art
@@ -138,24 +143,44 @@ data = [
     {"seed": "pet portrait custom", "suggestion": "custom dog portrait", "competition_level": "High", "category": "Personalized"},
 ]
 
-# Create DataFrame
-df = pd.DataFrame(data)
-
-# Clean up the data
-df = df[~df['suggestion'].str.contains('Item format|Color|Applied filters|Show more|Framing', na=False)]
-df = df[df['suggestion'].str.len() > 10]  # Remove very short suggestions
+CLEANED_CSV = "cleaned_etsy_data.csv"
+# Own directory, so these pages and their index never replace analyze_etsy_data.py's reports
+REPORTS_DIR = "extracted_reports"
+CLEANED_COLUMNS = ['seed', 'suggestion', 'competition_level', 'category',
+                   'competition_score', 'suggestion_length', 'opportunity_score']
 
-# Add opportunity score
-competition_scores = {'Low': 3, 'Moderate': 2, 'High': 1}
-df['competition_score'] = df['competition_level'].map(competition_scores)
-df['suggestion_length'] = df['suggestion'].str.len()
-df['opportunity_score'] = df['competition_score'] * (df['suggestion_length'] / df['suggestion_length'].max())
+def load_data():
+    """Build the cleaned analysis frame from the extracted data"""
+    df = pd.DataFrame(data)
+    
+    # Clean up the data
+    df = df[~df['suggestion'].fillna('').map(is_facet_string)]
+    df = df[df['suggestion'].str.len() > 10].copy()  # Remove very short suggestions
+    
+    # Add opportunity score (same derivation as analyze_etsy_data.py)
+    add_features(df, dtype='float64')
+    df['opportunity_score'] = df['relative_opportunity']
+    
+    print(f"✅ Loaded {len(df)} data points for analysis")
+    return df
 
-print(f"✅ Loaded {len(df)} data points for analysis")
+def save_cleaned_data(df, path=CLEANED_CSV):
+    """Write the cleaned data, leaving the file untouched when nothing changed"""
+    cleaned = df[CLEANED_COLUMNS].astype({'competition_score': 'int64'}).to_csv(index=False)
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == cleaned:
+                return False
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(cleaned)
+    return True
 
 # Create visualizations
-def create_dashboard():
+def create_dashboard(df):
     """Create comprehensive dashboard"""
+    builder = ReportBuilder(REPORTS_DIR, index_title="Etsy Extracted Search Data")
     
     # 1. Competition Level Distribution
     fig1 = px.pie(
@@ -164,7 +189,7 @@ def create_dashboard():
         title='Competition Level Distribution',
         color_discrete_map={'Low': '#2E8B57', 'Moderate': '#FFD700', 'High': '#DC143C'}
     )
-    fig1.write_html("competition_distribution.html")
+    builder.add("competition_distribution.html", "Competition Level Distribution", fig1)
     
     # 2. Category Analysis
     category_counts = df['category'].value_counts()
@@ -174,10 +199,10 @@ def create_dashboard():
         title='Data Points by Category',
         labels={'x': 'Category', 'y': 'Number of Suggestions'}
     )
-    fig2.write_html("category_analysis.html")
+    builder.add("category_analysis.html", "Data Points by Category", fig2)
     
     # 3. Opportunity Analysis
-    fig3 = px.scatter(
+    fig3 = scalable_scatter(
         df,
         x='competition_score',
         y='suggestion_length',
@@ -189,7 +214,7 @@ def create_dashboard():
                 'suggestion_length': 'Suggestion Length',
                 'opportunity_score': 'Opportunity Score'}
     )
-    fig3.write_html("opportunity_analysis.html")
+    builder.add("opportunity_analysis.html", "Market Opportunity Analysis", fig3)
     
     # 4. Top Suggestions
     top_suggestions = df['suggestion'].value_counts().head(15)
@@ -200,7 +225,7 @@ def create_dashboard():
         labels={'x': 'Search Term', 'y': 'Frequency'}
     )
     fig4.update_xaxes(tickangle=45)
-    fig4.write_html("top_suggestions.html")
+    builder.add("top_suggestions.html", "Most Popular Related Search Terms", fig4)
     
     # 5. Category Performance
     category_performance = df.groupby('category').agg({
@@ -216,16 +241,18 @@ def create_dashboard():
         title='Average Opportunity Score by Category',
         labels={'x': 'Category', 'y': 'Average Opportunity Score'}
     )
-    fig5.write_html("category_performance.html")
+    builder.add("category_performance.html", "Average Opportunity Score by Category", fig5)
+    
+    builder.build()
     
-    print("✅ Created 5 interactive visualizations:")
+    print(f"✅ Created 5 interactive visualizations in {REPORTS_DIR}/ (index.html links them all):")
     print("   - competition_distribution.html")
     print("   - category_analysis.html") 
     print("   - opportunity_analysis.html")
     print("   - top_suggestions.html")
     print("   - category_performance.html")
 
-def generate_insights():
+def generate_insights(df):
     """Generate actionable insights"""
     print("\n" + "="*60)
     print("🎯 MARKET OPPORTUNITY INSIGHTS")
@@ -278,19 +305,22 @@ def generate_insights():
 
 def main():
     """Main analysis function"""
+    df = load_data()
     print(f"📊 Analyzing {len(df)} data points...")
     
     # Create visualizations
-    create_dashboard()
+    create_dashboard(df)
     
     # Generate insights
-    generate_insights()
+    generate_insights(df)
     
     # Save cleaned data
-    df.to_csv("cleaned_etsy_data.csv", index=False)
-    print(f"\n✅ Saved cleaned data to: cleaned_etsy_data.csv")
+    if save_cleaned_data(df):
+        print(f"\n✅ Saved cleaned data to: {CLEANED_CSV}")
+    else:
+        print(f"\n✅ Cleaned data unchanged: {CLEANED_CSV}")
     
-    print(f"\n🎉 Analysis complete! Open the HTML files in your browser for interactive visualizations.")
+    print(f"\n🎉 Analysis complete! Open {REPORTS_DIR}/index.html in your browser for interactive visualizations.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
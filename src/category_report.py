@@ -0,0 +1,131 @@
+"""
+Per-category statistics computed in one partitioned pass
+
+Rows are mapped to integer category codes once and every per-category
+figure the analyzers need (competition mix, top terms, length histogram,
+score quantiles, means) comes out of bincount/groupby aggregations over
+those codes, so report time grows with rows instead of categories x rows.
+"""
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+TOP_TERMS = 10
+LENGTH_BINS = 20
+
+
+class CategoryReport:
+    """Per-category statistics shared by the dashboard, category pages and recommendations"""
+
+    def __init__(self, counts: pd.Series, competition: pd.DataFrame, top_terms: pd.Series,
+                 length_hist: pd.DataFrame, length_edges: np.ndarray, score_quantiles: pd.DataFrame,
+                 means: pd.DataFrame):
+        self.counts = counts
+        self.competition = competition
+        self.top_terms = top_terms
+        self.length_hist = length_hist
+        self.length_edges = length_edges
+        self.score_quantiles = score_quantiles
+        self.means = means
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.counts.index)
+
+    def competition_mix(self, category: str) -> pd.Series:
+        """Competition level -> rows for one category, without empty levels"""
+        mix = self.competition.loc[category]
+        return mix[mix > 0]
+
+    def most_common_competition(self) -> pd.Series:
+        """Most frequent competition level per category"""
+        return self.competition.idxmax(axis=1)
+
+    def terms(self, category: str) -> pd.Series:
+        """Top suggestions for one category, most frequent first"""
+        return self.top_terms.loc[category]
+
+    def length_histogram(self, category: str):
+        """(bin centers, counts) of suggestion lengths for one category"""
+        centers = (self.length_edges[:-1] + self.length_edges[1:]) / 2
+        return centers, self.length_hist.loc[category].to_numpy()
+
+    def page_data(self, category: str) -> Dict[str, Any]:
+        """Plain lists for one category page, cheap to send to a render worker"""
+        mix = self.competition_mix(category)
+        terms = self.terms(category)
+        centers, counts = self.length_histogram(category)
+        return {
+            'competition': (list(map(str, mix.index)), mix.tolist()),
+            'terms': (list(terms.index), terms.tolist()),
+            'length': (centers.tolist(), counts.tolist()),
+            'quantiles': self.score_quantiles.loc[category].tolist(),
+        }
+
+
+def factorize(values: pd.Series):
+    """(codes, labels) for a column, reusing categorical codes when present"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.int64), values.cat.categories
+    return pd.factorize(values)
+
+
+def pair_counts(codes: np.ndarray, values: pd.Series, top: int) -> pd.Series:
+    """Top `top` values per group by count, as a (group code, value) -> count series"""
+    value_codes, labels = pd.factorize(values)
+    valid = value_codes >= 0
+    keys = codes[valid].astype(np.int64) * len(labels) + value_codes[valid]
+    unique_keys, counts = np.unique(keys, return_counts=True)
+    groups, members = np.divmod(unique_keys, len(labels))
+    # Group ascending, count descending; ties keep first-seen order like value_counts
+    order = np.lexsort((-counts, groups))
+    groups, members, counts = groups[order], members[order], counts[order]
+    rank = np.arange(len(groups)) - np.searchsorted(groups, groups, side='left')
+    keep = rank < top
+    index = pd.MultiIndex.from_arrays([groups[keep], np.asarray(labels)[members[keep]]])
+    return pd.Series(counts[keep], index=index)
+
+
+def compute_category_report(df: pd.DataFrame, top_terms: int = TOP_TERMS, length_bins: int = LENGTH_BINS,
+                            quantiles: Sequence[float] = QUANTILES) -> CategoryReport:
+    """Partition the frame by category once and compute every per-category statistic"""
+    df = df[df['category'].notna()]
+    codes, names = factorize(df['category'])
+    n = len(names)
+
+    counts = np.bincount(codes, minlength=n)
+    present = np.flatnonzero(counts)
+    order = present[np.argsort(-counts[present], kind='stable')]
+    labels = pd.Index(np.asarray(names)[order], name='category')
+
+    def per_category(table: np.ndarray, columns) -> pd.DataFrame:
+        return pd.DataFrame(table[order], index=labels, columns=columns)
+
+    level_codes, levels = factorize(df['competition_level'])
+    valid = level_codes >= 0
+    competition = np.bincount(codes[valid] * len(levels) + level_codes[valid],
+                              minlength=n * len(levels)).reshape(n, len(levels))
+
+    lengths = df['suggestion_length'].to_numpy()
+    edges = np.histogram_bin_edges(lengths, bins=length_bins) if len(lengths) else np.arange(length_bins + 1.0)
+    bins = np.clip(np.searchsorted(edges, lengths, side='right') - 1, 0, length_bins - 1)
+    length_hist = np.bincount(codes * length_bins + bins, minlength=n * length_bins).reshape(n, length_bins)
+
+    terms = pair_counts(codes, df['suggestion'], top_terms)
+    terms.index = terms.index.set_levels(np.asarray(names)[terms.index.levels[0]], level=0)
+
+    groups = df.groupby(codes, sort=True)
+    score_quantiles = groups['opportunity_score'].quantile(list(quantiles)).unstack()
+    means = groups[['opportunity_score', 'competition_score']].mean()
+
+    return CategoryReport(
+        counts=pd.Series(counts[order], index=labels),
+        competition=per_category(competition, pd.Index(levels, name='competition_level')),
+        top_terms=terms,
+        length_hist=per_category(length_hist, range(length_bins)),
+        length_edges=edges,
+        score_quantiles=score_quantiles.reindex(order).set_axis(labels),
+        means=means.reindex(order).set_axis(labels),
+    )
@@ -0,0 +1,112 @@
+"""
+Content-hash change detection for scraped search pages
+
+The store is a SQLite file next to the results. Each seed has one row:
+its page fingerprint plus the CSV bytes most recently written for it,
+zlib-compressed. The rows are kept in the store rather than referenced in
+the results file, because a fresh run truncates that file before any page
+is looked up.
+"""
+import csv
+import hashlib
+import io
+import json
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    seed TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    rows BLOB NOT NULL,
+    updated TEXT NOT NULL
+);
+"""
+
+
+def fingerprint_payload(payload: Any, **context: Any) -> str:
+    """Return a stable SHA-256 fingerprint of an extracted page payload
+
+    Extra keyword arguments (e.g. run flags) are folded into the hash so that
+    the same page scraped with different settings does not count as a match.
+    """
+    blob = json.dumps(
+        {'payload': payload, 'context': context},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return 'sha256:' + hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def fingerprint_path_for(results_path: str) -> str:
+    """Return the fingerprint store path that sits next to a results file"""
+    path = Path(results_path)
+    return str(path.with_name(f"{path.stem}.fingerprints.sqlite"))
+
+
+class FingerprintStore:
+    """Per-seed page fingerprints and the rows computed from them"""
+
+    VERSION = 3
+
+    def __init__(self, path: str, refresh: bool = False):
+        self.path = path
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        # Losing the last few entries in a crash only costs a re-scrape, so commits need not wait for fsync
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS pages")
+            self.connection.execute(f"PRAGMA user_version = {self.VERSION}")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def lookup(self, seed: str, fingerprint: str) -> Optional[List[List[str]]]:
+        """Return the previously written rows (CSV field values) for a seed if its page is unchanged"""
+        entry = None
+        if not self.refresh:
+            entry = self.connection.execute(
+                "SELECT rows FROM pages WHERE seed = ? AND fingerprint = ?", (seed, fingerprint)
+            ).fetchone()
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        data = zlib.decompress(entry[0]).decode('utf-8')
+        return list(csv.reader(io.StringIO(data, newline='')))
+
+    def update(self, seed: str, fingerprint: str, data: bytes):
+        """Record the fingerprint of a seed's page and the CSV bytes written for it"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages (seed, fingerprint, rows, updated) VALUES (?, ?, ?, ?)",
+            (seed, fingerprint, zlib.compress(data), datetime.utcnow().isoformat())
+        )
+
+    def save(self):
+        """Commit the entries recorded since the last save"""
+        self.connection.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that matched a stored fingerprint"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lookup statistics for reporting"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'stored_seeds': self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        }
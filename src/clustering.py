@@ -0,0 +1,201 @@
+"""
+Near-duplicate suggestion clustering with MinHash signatures and LSH banding
+
+Suggestions are reduced to sets of normalized words (casefolded, simple
+plurals stripped, synonyms such as custom -> personalized and poster ->
+print mapped together), so "personalized travel poster" and "custom
+travel prints" become the same set. Each set gets a MinHash signature of
+`num_perm` values; signatures are cut into `bands` bands, and two
+suggestions that share a band are linked when their signatures agree on at
+least `threshold` of their values (the estimated Jaccard similarity).
+Clusters are the connected components of those links, found with a
+union-find. Every step is vectorized over the distinct suggestions and
+there are no pairwise comparisons, so time grows near-linearly with the
+number of suggestions. With 16 bands of 4 values, pairs at the default 0.6 Jaccard
+similarity share a band with probability ~89%, pairs at 0.8 with ~100%,
+and pairs at 0.3 with ~12% (and are then rejected by the threshold).
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sketches import hash_values
+from .term_index import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.6
+CHUNK_SUGGESTIONS = 100_000
+SYNONYMS = {
+    'custom': 'personalized', 'customized': 'personalized', 'personalised': 'personalized',
+    'poster': 'print', 'artprint': 'print',
+    'decoration': 'decor',
+    'gifts': 'gift', 'present': 'gift',
+}
+
+
+def clustering_settings(cfg: Any = None) -> Dict[str, Any]:
+    """MinHash/LSH parameters from the `clustering` config section"""
+    if cfg is None:
+        from .config import config as cfg
+    section = cfg.get('clustering', {}) or {}
+    return {
+        'num_perm': int(section.get('num_perm', NUM_PERM)),
+        'bands': int(section.get('bands', BANDS)),
+        'threshold': float(section.get('threshold', THRESHOLD)),
+        'synonyms': {**SYNONYMS, **(section.get('synonyms') or {})},
+    }
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: a fast, well-spread 64-bit hash of 64-bit values"""
+    with np.errstate(over='ignore'):
+        z = values + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _union_find(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Root of each of n nodes after uniting the pairs (a, b); roots are the smallest index of their set
+
+    Vectorized: every round hooks the larger root of each still-separate pair under the smaller one,
+    then compresses paths by pointer jumping until every node points at its root.
+    """
+    parent = np.arange(n)
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        separate = root_a != root_b
+        if not separate.any():
+            return parent
+        np.minimum.at(parent, np.maximum(root_a, root_b)[separate], np.minimum(root_a, root_b)[separate])
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+class SuggestionClusterer:
+    """Groups near-duplicate suggestions; see the module docstring for the similarity model"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, threshold: float = THRESHOLD,
+                 synonyms: Optional[Mapping[str, str]] = None):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.synonyms = dict(SYNONYMS if synonyms is None else synonyms)
+        self._seeds = _mix(np.arange(1, num_perm + 1, dtype=np.uint64))
+
+    def words(self, text: str) -> List[str]:
+        """Normalized word set of a suggestion, sorted"""
+        words = set()
+        for token in tokenize(text):
+            token = self.synonyms.get(token, token)
+            if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+                token = self.synonyms.get(token[:-1], token[:-1])
+            words.add(token)
+        return sorted(words)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), num_perm) uint32 MinHash signatures; texts without words get all-max rows"""
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        vocabulary: Dict[str, int] = {}
+        # One row of permuted hashes per vocabulary word; rows are added only for each chunk's new
+        # words, and the buffer doubles when full so appending stays linear overall
+        permuted = np.empty((0, self.num_perm), dtype=np.uint32)
+        for start in range(0, len(texts), CHUNK_SUGGESTIONS):
+            chunk = texts[start:start + CHUNK_SUGGESTIONS]
+            word_ids: List[int] = []
+            new_words: List[str] = []
+            lengths = np.zeros(len(chunk), dtype=np.int64)
+            for i, text in enumerate(chunk):
+                words = self.words(text)
+                lengths[i] = len(words)
+                for word in words:
+                    word_id = vocabulary.get(word)
+                    if word_id is None:
+                        word_id = vocabulary[word] = len(vocabulary)
+                        new_words.append(word)
+                    word_ids.append(word_id)
+            if new_words:
+                hashed = len(vocabulary) - len(new_words)
+                if len(vocabulary) > len(permuted):
+                    grown = np.empty((max(len(vocabulary), 2 * len(permuted)), self.num_perm), dtype=np.uint32)
+                    grown[:hashed] = permuted[:hashed]
+                    permuted = grown
+                block = _mix(hash_values(new_words)[:, None] ^ self._seeds[None, :]) >> np.uint64(32)
+                permuted[hashed:len(vocabulary)] = block.astype(np.uint32)
+            if not word_ids:
+                continue
+            # A min over each suggestion's word rows
+            rows = np.flatnonzero(lengths)
+            starts = np.concatenate(([0], np.cumsum(lengths[rows])[:-1]))
+            signatures[start + rows] = np.minimum.reduceat(permuted[np.asarray(word_ids)], starts, axis=0)
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray, band: int) -> np.ndarray:
+        key = np.zeros(len(signatures), dtype=np.uint64)
+        for column in range(band * self.rows, (band + 1) * self.rows):
+            key = _mix(key ^ signatures[:, column].astype(np.uint64))
+        return key
+
+    def cluster(self, texts: Sequence[str]) -> np.ndarray:
+        """Cluster label per text: equal labels are near-duplicates, numbered by first appearance"""
+        n = len(texts)
+        if not n:
+            return np.zeros(0, dtype=np.int64)
+        signatures = self.signatures(texts)
+        has_words = signatures[:, 0] != np.iinfo(np.uint32).max
+
+        # Links: each bucket member with the bucket's earliest text, when their signatures agree
+        later, earlier = [], []
+        for band in range(self.bands):
+            keys = self._band_keys(signatures, band)
+            order = np.flatnonzero(has_words)
+            order = order[np.argsort(keys[order], kind='stable')]
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(order) else order
+            counts = np.diff(np.r_[starts, len(order)])
+            first = np.repeat(order[starts], counts)
+            candidate = first != order
+            members, first = order[candidate], first[candidate]
+            similar = (signatures[members] == signatures[first]).mean(axis=1) >= self.threshold
+            later.append(members[similar])
+            earlier.append(first[similar])
+        labels = _union_find(n, np.concatenate(later), np.concatenate(earlier))
+        return pd.factorize(labels)[0]
+
+
+def cluster_suggestions(frame: pd.DataFrame, column: str = 'suggestion',
+                        clusterer: Optional[SuggestionClusterer] = None) -> pd.DataFrame:
+    """Add `cluster_id` and `cluster_label` (the cluster's most frequent suggestion) to every row"""
+    if clusterer is None:
+        clusterer = SuggestionClusterer(**clustering_settings())
+    codes, uniques = pd.factorize(frame[column].astype(str))
+    labels = clusterer.cluster(list(uniques))
+    # Most frequent member of each cluster names it
+    rows_per_text = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.lexsort((-rows_per_text, labels))
+    first = order[np.r_[True, labels[order][1:] != labels[order][:-1]]] if len(order) else order
+    names = np.empty(labels.max() + 1 if len(labels) else 0, dtype=object)
+    names[labels[first]] = np.asarray(uniques, dtype=object)[first]
+
+    cluster_ids = np.where(codes >= 0, labels[codes] if len(labels) else -1, -1)
+    frame['cluster_id'] = cluster_ids.astype(np.int32)
+    frame['cluster_label'] = pd.Categorical.from_codes(cluster_ids, categories=pd.Index(names).astype(str)) \
+        if len(names) else pd.Categorical([None] * len(frame))
+    return frame
+
+
+def cluster_counts(frame: pd.DataFrame, top: Optional[int] = None) -> pd.DataFrame:
+    """Rows and distinct variants per cluster, largest first (needs cluster_suggestions columns)"""
+    clustered = frame[frame['cluster_id'] >= 0]
+    summary = clustered.groupby('cluster_id').agg(
+        label=('cluster_label', 'first'), rows=('suggestion', 'size'), variants=('suggestion', 'nunique')
+    ).sort_values(['rows', 'label'], ascending=[False, True], kind='stable')
+    return summary.head(top) if top else summary
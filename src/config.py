@@ -64,11 +64,13 @@ class Config:
             'checkpoint_filename': os.getenv('OUTPUT_CHECKPOINT_FILENAME', 'scraping_checkpoint.json')
         }
         
-        # Competition thresholds
+        # Competition thresholds (the YAML file's values when the env var is unset)
+        competition = self._config.get('competition') or {}
         env_config['competition'] = {
-            'low_threshold': int(os.getenv('COMPETITION_LOW_THRESHOLD', 1000)),
-            'moderate_threshold': int(os.getenv('COMPETITION_MODERATE_THRESHOLD', 10000)),
-            'high_threshold': int(os.getenv('COMPETITION_HIGH_THRESHOLD', 100000))
+            'low_threshold': int(os.getenv('COMPETITION_LOW_THRESHOLD', competition.get('low_threshold', 1000))),
+            'moderate_threshold': int(os.getenv('COMPETITION_MODERATE_THRESHOLD',
+                                                competition.get('moderate_threshold', 10000))),
+            'high_threshold': int(os.getenv('COMPETITION_HIGH_THRESHOLD', competition.get('high_threshold', 100000)))
         }
         
         # Logging
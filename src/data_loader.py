@@ -0,0 +1,118 @@
+"""
+Typed, memory-efficient loading of results CSVs for the analyzers
+
+Only the analysis columns are read. Low-cardinality text columns are
+parsed straight to categoricals and numerics are downcast, and the file is
+read in chunks so parser buffers stay small. Histories too large to keep
+are summarized by `ResultsSketch` (src/sketches.py) instead.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .features import add_row_features
+
+ANALYSIS_COLUMNS = (
+    'timestamp_utc', 'seed', 'suggestion', 'competition_level', 'opportunity_score', 'trend_score',
+    'trend_direction', 'listing_count', 'avg_price', 'category', 'recommendation'
+)
+CATEGORICAL_COLUMNS = ('seed', 'category', 'competition_level', 'recommendation', 'trend_direction')
+FLOAT_COLUMNS = ('opportunity_score', 'trend_score', 'avg_price')
+INTEGER_COLUMNS = ('listing_count',)
+# The parser builds categoricals and float32 columns directly, which is faster
+# than converting text columns afterwards
+PARSER_DTYPES = {**{column: 'category' for column in CATEGORICAL_COLUMNS},
+                 **{column: 'float32' for column in FLOAT_COLUMNS}}
+CHUNK_ROWS = 250_000
+MEMORY_SAMPLE_ROWS = 1_000
+
+
+class LoadStats:
+    """Row count and memory before/after dtype optimization"""
+
+    def __init__(self, rows: int = 0, raw_bytes: int = 0, typed_bytes: int = 0):
+        self.rows = rows
+        self.raw_bytes = raw_bytes
+        self.typed_bytes = typed_bytes
+
+    def describe(self) -> str:
+        saved = 1 - self.typed_bytes / self.raw_bytes if self.raw_bytes else 0.0
+        return (f"💾 Memory: ~{self.raw_bytes / 1e6:.1f} MB as read → "
+                f"~{self.typed_bytes / 1e6:.1f} MB typed ({saved:.0%} less)")
+
+
+def frame_memory(frame: pd.DataFrame, sample: Optional[int] = MEMORY_SAMPLE_ROWS) -> int:
+    """Deep memory usage of a frame in bytes; text columns are extrapolated
+    from the first `sample` rows because measuring every string is slow"""
+    total = int(frame.index.memory_usage())
+    for column in frame.columns:
+        values = frame[column]
+        text = values.dtype == object or pd.api.types.is_string_dtype(values.dtype)
+        if text and sample and len(values) > sample and not isinstance(values.dtype, pd.CategoricalDtype):
+            total += int(values.iloc[:sample].memory_usage(deep=True, index=False) * len(values) / sample)
+        else:
+            total += int(values.memory_usage(deep=True, index=False))
+    return total
+
+
+def untyped_memory(csv_file: str, columns: Sequence[str], rows: int, sample: int = MEMORY_SAMPLE_ROWS) -> int:
+    """Estimated size of `rows` rows read with pandas' default dtypes, from a sample read"""
+    head = pd.read_csv(csv_file, usecols=list(columns), nrows=sample)
+    return int(frame_memory(head, None) * rows / len(head)) if len(head) else 0
+
+
+def optimize_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Drop rows without a suggestion, set compact dtypes and add derived columns"""
+    frame = frame.dropna(subset=['suggestion'])
+    for column in CATEGORICAL_COLUMNS:
+        if column in frame.columns:
+            frame[column] = frame[column].astype('category')
+    for column in FLOAT_COLUMNS:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce', downcast='float')
+    for column in INTEGER_COLUMNS:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce', downcast='integer')
+    return add_row_features(frame)
+
+
+def available_columns(csv_file: str, wanted: Sequence[str] = ANALYSIS_COLUMNS) -> List[str]:
+    """Wanted columns that the file actually has"""
+    header = pd.read_csv(csv_file, nrows=0).columns
+    return [column for column in wanted if column in header]
+
+
+def read_chunks(csv_file: str, columns: Optional[Sequence[str]] = None,
+                chunksize: int = CHUNK_ROWS) -> Iterable[pd.DataFrame]:
+    """Raw chunks of the analysis columns"""
+    usecols = list(columns) if columns else available_columns(csv_file)
+    return pd.read_csv(csv_file, usecols=usecols, chunksize=chunksize, dtype=PARSER_DTYPES)
+
+
+def concat_typed(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate optimized chunks, unioning categoricals instead of falling back to object"""
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    categorical = [column for column in frames[0].columns
+                   if isinstance(frames[0][column].dtype, pd.CategoricalDtype)]
+    frame = pd.concat([chunk.drop(columns=categorical) for chunk in frames], ignore_index=True)
+    for column in categorical:
+        frame[column] = pd.Categorical(union_categoricals([chunk[column] for chunk in frames]))
+    return frame[list(frames[0].columns)]
+
+
+def load_results(csv_file: str, columns: Optional[Sequence[str]] = None,
+                 chunksize: int = CHUNK_ROWS) -> Tuple[pd.DataFrame, LoadStats]:
+    """Load a results file with compact dtypes; returns the frame and memory stats"""
+    columns = list(columns) if columns else available_columns(csv_file)
+    frames = [optimize_frame(chunk) for chunk in read_chunks(csv_file, columns, chunksize)]
+    if not frames:
+        return pd.DataFrame(), LoadStats()
+    frame = concat_typed(frames)
+    return frame, LoadStats(len(frame), untyped_memory(csv_file, columns, len(frame)), frame_memory(frame))
+
+
+def nonzero_counts(values: pd.Series) -> Dict[str, int]:
+    """Value counts without the zero entries categoricals report for unused categories"""
+    return {value: int(count) for value, count in values.value_counts().items() if count}
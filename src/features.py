@@ -0,0 +1,170 @@
+"""
+Derived analysis features and an on-disk cache for them
+
+`add_features` is the single place the analyzers derive suggestion_length,
+competition_score, relative_opportunity and the near-duplicate
+cluster_id/cluster_label columns (see clustering.py). `load_features` caches the
+typed, feature-complete frame as a pickle keyed by the source file's
+content hash, FEATURE_VERSION and a hash of the configured derivation
+settings (`feature_settings`), so repeated runs over an unchanged file skip
+parsing entirely. Bump FEATURE_VERSION whenever a derivation changes.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+FEATURE_VERSION = 3
+COMPETITION_SCORES = {'Low': 3, 'Moderate': 2, 'High': 1}
+CACHE_DIR_NAME = ".feature_cache"
+HASH_BLOCK = 1 << 20
+
+
+def competition_scores(levels: pd.Series) -> pd.Series:
+    """Low/Moderate/High -> 3/2/1, keyed on the first word so scraper labels
+    such as "Low Competition - Good Opportunity" score too"""
+    def score(level) -> Optional[int]:
+        return COMPETITION_SCORES.get(str(level).split(' ', 1)[0])
+
+    if isinstance(levels.dtype, pd.CategoricalDtype):
+        lookup = {level: score(level) for level in levels.cat.categories}
+    else:
+        lookup = {level: score(level) for level in levels.dropna().unique()}
+    return levels.map(lookup).astype('float32')
+
+
+def add_row_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per-row features that can be computed one chunk at a time"""
+    frame['suggestion_length'] = pd.to_numeric(frame['suggestion'].str.len(), downcast='unsigned')
+    if 'competition_level' in frame.columns:
+        frame['competition_score'] = competition_scores(frame['competition_level'])
+    return frame
+
+
+def add_features(frame: pd.DataFrame, dtype: str = 'float32') -> pd.DataFrame:
+    """All derived columns, including those that need the whole frame"""
+    if 'suggestion_length' not in frame.columns or 'competition_score' not in frame.columns:
+        add_row_features(frame)
+    longest = frame['suggestion_length'].max() if len(frame) else 0
+    frame['relative_opportunity'] = (
+        frame['competition_score'] * (frame['suggestion_length'] / longest) if longest else 0.0
+    ).astype(dtype)
+    from .clustering import cluster_suggestions
+    cluster_suggestions(frame)
+    return frame
+
+
+def feature_settings() -> Dict[str, Any]:
+    """Configured settings that change derived columns (the clustering parameters)"""
+    from .clustering import clustering_settings
+    return {'clustering': clustering_settings()}
+
+
+def settings_digest(settings: Dict[str, Any]) -> str:
+    """Short stable hash of a settings dict"""
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=4).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """blake2b digest of a file's contents"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """Pickled feature frames keyed by source content hash, feature version and settings hash"""
+
+    def __init__(self, cache_dir: Optional[str] = None, version: int = FEATURE_VERSION):
+        self.cache_dir = cache_dir
+        self.version = version
+
+    def directory(self, source: str) -> str:
+        return self.cache_dir or os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIR_NAME)
+
+    def _stat_index_path(self, source: str) -> str:
+        return os.path.join(self.directory(source), "digests.json")
+
+    def digest(self, source: str) -> str:
+        """Content hash of the source, reusing the last one while size and mtime are unchanged"""
+        stat = os.stat(source)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        index_path = self._stat_index_path(source)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        entry = index.get(os.path.abspath(source))
+        if entry and entry['stat'] == signature:
+            return entry['digest']
+
+        digest = file_digest(source)
+        index[os.path.abspath(source)] = {'stat': signature, 'digest': digest}
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        return digest
+
+    def path(self, source: str) -> str:
+        """Cache file for the source's current contents and the current feature settings"""
+        stem = os.path.splitext(os.path.basename(source))[0]
+        settings = settings_digest(feature_settings())
+        return os.path.join(self.directory(source), f"{stem}-{self.digest(source)}-v{self.version}-{settings}.pkl")
+
+    def load(self, source: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Cached (frame, metadata) for the source, or None"""
+        try:
+            with open(self.path(source), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def store(self, source: str, frame: pd.DataFrame, meta: Dict[str, Any]):
+        """Write the cache entry and drop stale entries for the same source"""
+        path = self.path(source)
+        stem = os.path.splitext(os.path.basename(source))[0]
+        stale = re.compile(rf"{re.escape(stem)}-[0-9a-f]{{32}}-v\d+(-[0-9a-f]{{8}})?\.pkl")
+        for name in os.listdir(os.path.dirname(path)):
+            if stale.fullmatch(name) and name != os.path.basename(path):
+                os.remove(os.path.join(os.path.dirname(path), name))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((frame, meta), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+def load_features(csv_file: str, cache: Optional[FeatureCache] = None,
+                  use_cache: bool = True) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Typed frame with all derived features; metadata has the load stats and whether the cache hit"""
+    from .data_loader import load_results
+
+    cache = cache or FeatureCache()
+    started = time.perf_counter()
+    if use_cache:
+        cached = cache.load(csv_file)
+        if cached is not None:
+            frame, meta = cached
+            return frame, {**meta, 'cache_hit': True, 'seconds': time.perf_counter() - started}
+
+    frame, stats = load_results(csv_file)
+    if not frame.empty:
+        add_features(frame)
+    meta = {'rows': stats.rows, 'raw_bytes': stats.raw_bytes, 'typed_bytes': stats.typed_bytes,
+            'feature_version': cache.version}
+    if use_cache and not frame.empty:
+        try:
+            cache.store(csv_file, frame, meta)
+        except OSError:
+            pass  # read-only location: run uncached
+    return frame, {**meta, 'cache_hit': False, 'seconds': time.perf_counter() - started}
@@ -0,0 +1,249 @@
+"""
+Compiled keyword engine for term categorization, competition analysis and scoring
+"""
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+# Category rules, checked in order; the first category with a matching keyword wins
+CATEGORY_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("Japanese Art", ['japanese', 'ukiyo-e', 'hokusai', 'fuji', 'cherry', 'zen', 'tokyo', 'kyoto']),
+    ("National Parks", ['national park', 'yosemite', 'yellowstone', 'grand canyon', 'park ranger', 'hiking', 'camping']),
+    ("Vintage Travel", ['vintage travel', 'retro travel', 'airline', 'cruise', 'tourism', 'destination']),
+    ("Maps/Cartography", ['map', 'cartography', 'atlas', 'street map', 'city plan']),
+    ("Botanical/Scientific", ['botanical', 'scientific', 'medical', 'anatomy', 'butterfly', 'bird', 'natural history', 'herbarium']),
+    ("Literature/Books", ['literature', 'book', 'shakespeare', 'novel', 'library', 'manuscript', 'poetry']),
+    ("Art Nouveau/Deco", ['art nouveau', 'art deco', 'deco', 'advertising', 'typography', 'logo', 'brand']),
+    ("Vintage Photography", ['photograph', 'photo', 'portrait', 'street photography', 'landscape photo', 'architectural']),
+    ("Vintage Fashion", ['fashion', 'beauty', 'pinup', 'clothing', 'style']),
+    ("Vintage Transportation", ['car', 'train', 'airplane', 'transportation', 'motorcycle', 'ship', 'vehicle']),
+    ("Vintage Americana", ['american', 'western', 'cowboy', 'patriotic', 'baseball']),
+    ("Vintage European", ['european', 'french', 'italian', 'british', 'german', 'paris']),
+    ("Vintage/Classic", ['vintage', 'antique', 'classic', 'old', 'historical', 'retro']),
+    ("Personalized", ['personalized', 'custom', 'name']),
+    ("Space/Science", ['space', 'nasa', 'astronomy', 'galaxy']),
+    ("Gifts", ['gift', 'present']),
+    ("Wall Art", ['wall', 'decor', 'art']),
+    ("Prints/Posters", ['print', 'poster']),
+]
+DEFAULT_CATEGORY = "Other"
+
+# High competition indicators (avoid these)
+HIGH_COMPETITION_KEYWORDS = [
+    'gift', 'personalized', 'custom', 'print', 'poster', 'wall art', 'decor',
+    'christmas', 'birthday', 'anniversary', 'wedding', 'baby', 'kids',
+    'popular', 'trending', 'viral', 'best seller', 'top rated'
+]
+
+# Low competition opportunities (target these)
+LOW_COMPETITION_KEYWORDS = [
+    'niche', 'specific', 'unique', 'rare', 'vintage', 'antique', 'historical',
+    'obscure', 'specialized', 'professional', 'technical', 'academic',
+    'regional', 'local', 'cultural', 'heritage', 'traditional'
+]
+
+# High demand indicators (good for sales)
+DEMAND_KEYWORDS = [
+    'wall art', 'decor', 'home', 'office', 'gift', 'personalized',
+    'vintage', 'antique', 'unique', 'custom', 'handmade'
+]
+
+# Factors that increase opportunity score
+POSITIVE_FACTORS = {
+    'vintage': 3, 'antique': 3, 'historical': 3, 'niche': 4,
+    'specific': 2, 'unique': 3, 'rare': 4, 'obscure': 4,
+    'regional': 3, 'cultural': 3, 'heritage': 3, 'traditional': 2,
+    'professional': 2, 'technical': 2, 'academic': 2
+}
+
+# Factors that decrease opportunity score
+NEGATIVE_FACTORS = {
+    'gift': -2, 'personalized': -1, 'custom': -1, 'print': -1,
+    'poster': -1, 'christmas': -3, 'birthday': -2, 'wedding': -2,
+    'popular': -3, 'trending': -3, 'viral': -3, 'best seller': -3
+}
+
+SUGGESTION_WEIGHT = 0.5  # Suggestions count for half as much as the seed itself
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation with shared prefixes factored out
+
+    re tries alternatives one after another at every position, so a
+    prefix-factored pattern does far less work than a flat "a|b|c" list.
+    Optional tails are greedy, so the longest word starting at a position wins.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and '' not in node:
+            return alternatives[0]
+        group = '(?:' + '|'.join(alternatives) + ')'
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Multi-pattern substring matcher that reports every keyword occurring in a text
+
+    Works like an Aho-Corasick automaton driven by the C regex engine: a
+    zero-width lookahead over a prefix-factored alternation yields the longest
+    keyword starting at each position, and a precomputed prefix closure adds
+    the shorter keywords that start at the same place (e.g. "art" inside
+    "art deco"). The result is the same set that `keyword in text` would find
+    for each keyword, from a single scan.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = sorted({keyword for keyword in keywords if keyword})
+        keyword_set = set(self.keywords)
+        self._prefix_closure: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(keyword[:i] for i in range(1, len(keyword) + 1) if keyword[:i] in keyword_set)
+            for keyword in self.keywords
+        }
+        self._pattern = re.compile('(?=(' + trie_pattern(self.keywords) + '))') if self.keywords else None
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring in text"""
+        found: Set[str] = set()
+        if self._pattern is None:
+            return found
+        closure = self._prefix_closure
+        for match in self._pattern.finditer(text):
+            found |= closure[match.group(1)]
+        return found
+
+    def find_many(self, texts: Sequence[str]) -> List[Set[str]]:
+        """Return the keyword sets for many texts using one scan over all of them"""
+        results: List[Set[str]] = [set() for _ in texts]
+        if self._pattern is None or not texts:
+            return results
+        # Keywords never contain newlines, so matches cannot cross text boundaries
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        closure = self._prefix_closure
+        for match in self._pattern.finditer('\n'.join(texts)):
+            results[bisect_right(starts, match.start()) - 1] |= closure[match.group(1)]
+        return results
+
+
+class TermClassification(NamedTuple):
+    """Category, competition label and keyword score for a term"""
+    category: str
+    competition_level: str
+    keyword_score: float
+
+
+class KeywordEngine:
+    """All keyword tables compiled into one matcher
+
+    Produces the same results as the original per-keyword `in` scans in
+    categorize_term(), analyze_competition_level() and the keyword part of the old
+    calculate_opportunity_score().
+    """
+
+    def __init__(self,
+                 category_keywords: Sequence[Tuple[str, Sequence[str]]] = CATEGORY_KEYWORDS,
+                 high_competition: Sequence[str] = HIGH_COMPETITION_KEYWORDS,
+                 low_competition: Sequence[str] = LOW_COMPETITION_KEYWORDS,
+                 demand: Sequence[str] = DEMAND_KEYWORDS,
+                 positive_factors: Optional[Dict[str, float]] = None,
+                 negative_factors: Optional[Dict[str, float]] = None):
+        self.categories = [category for category, _ in category_keywords]
+        self._category_rank: Dict[str, int] = {}
+        for rank, (_, keywords) in enumerate(category_keywords):
+            for keyword in keywords:
+                self._category_rank.setdefault(keyword, rank)
+
+        self._high = frozenset(high_competition)
+        self._low = frozenset(low_competition)
+        self._demand = frozenset(demand)
+
+        self._points: Dict[str, float] = {}
+        for factors in (POSITIVE_FACTORS if positive_factors is None else positive_factors,
+                        NEGATIVE_FACTORS if negative_factors is None else negative_factors):
+            for factor, points in factors.items():
+                self._points[factor] = self._points.get(factor, 0) + points
+
+        self.matcher = KeywordMatcher(
+            list(self._category_rank) + list(self._high) + list(self._low) + list(self._demand) + list(self._points)
+        )
+
+    def categorize_hits(self, hits: Set[str]) -> str:
+        """Return the category for a set of matched keywords"""
+        ranks = [self._category_rank[hit] for hit in hits if hit in self._category_rank]
+        return self.categories[min(ranks)] if ranks else DEFAULT_CATEGORY
+
+    def competition_from_hits(self, hits: Set[str]) -> str:
+        """Return the competition label for a set of matched keywords"""
+        high_count = len(hits & self._high)
+        low_count = len(hits & self._low)
+        demand_count = len(hits & self._demand)
+
+        # Calculate opportunity score (higher = better opportunity)
+        opportunity_score = demand_count - high_count + (low_count * 2)
+
+        if high_count > low_count and high_count > 2:
+            return "High Competition - Avoid"
+        elif low_count > high_count and demand_count > 0:
+            return "Low Competition - Good Opportunity"
+        elif opportunity_score > 2:
+            return "Moderate Competition - Consider"
+        else:
+            return "High Competition - Avoid"
+
+    def score_hits(self, hits: Set[str]) -> float:
+        """Return the summed factor points for a set of matched keywords"""
+        points = self._points
+        return sum(points[hit] for hit in hits if hit in points)
+
+    def categorize(self, term: str) -> str:
+        """Categorize a search term"""
+        return self.categorize_hits(self.matcher.find(term.lower()))
+
+    def competition_level(self, seed: str) -> str:
+        """Analyze competition level of a seed"""
+        return self.competition_from_hits(self.matcher.find(seed.lower()))
+
+    def keyword_score(self, seed: str, suggestions: Optional[Sequence[str]] = None) -> float:
+        """Keyword part of the opportunity score for a seed and its suggestions"""
+        score = self.score_hits(self.matcher.find(seed.lower()))
+        if suggestions:
+            suggestion_text = ' '.join(suggestions).lower()
+            score += self.score_hits(self.matcher.find(suggestion_text)) * SUGGESTION_WEIGHT
+        return score
+
+    def classify(self, term: str, suggestions: Optional[Sequence[str]] = None) -> TermClassification:
+        """Return category, competition label and keyword score from one scan of the term"""
+        hits = self.matcher.find(term.lower())
+        score = self.score_hits(hits)
+        if suggestions:
+            suggestion_text = ' '.join(suggestions).lower()
+            score += self.score_hits(self.matcher.find(suggestion_text)) * SUGGESTION_WEIGHT
+        return TermClassification(self.categorize_hits(hits), self.competition_from_hits(hits), score)
+
+    def classify_many(self, terms: Sequence[str]) -> List[TermClassification]:
+        """Classify many terms (without suggestions) in a single scan"""
+        return [
+            TermClassification(self.categorize_hits(hits), self.competition_from_hits(hits), self.score_hits(hits))
+            for hits in self.matcher.find_many([term.lower() for term in terms])
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_keyword_engine() -> KeywordEngine:
+    """Return the shared engine built from the default keyword tables"""
+    return KeywordEngine()
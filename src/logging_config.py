@@ -1,18 +1,28 @@
 """
 Logging configuration for Etsy Market Research Scraper
+
+All loggers share one backend: callers only put records on an in-memory
+queue, and a background QueueListener formats them, writes JSON lines to a
+rotating file in batches and prints a rate-limited console stream.
 """
+import atexit
 import logging
 import logging.handlers
 import json
+import queue
 import sys
-from pathlib import Path
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, List, Optional, Union
 from datetime import datetime
-import structlog
-from rich.logging import RichHandler
-from rich.console import Console
 
-from .config import config
+ROOT_LOGGER_NAME = "etsy_scraper"
+CONSOLE_FORMAT = "[%(asctime)s] %(levelname)s: %(message)s"
+CONSOLE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# The scraper logs standout results at "SUCCESS", between INFO and WARNING
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
 
 
 class JSONFormatter(logging.Formatter):
@@ -20,7 +30,8 @@ class JSONFormatter(logging.Formatter):
     
     def format(self, record):
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            # Records are formatted on the listener thread, so use the time they were created
+            'timestamp': datetime.utcfromtimestamp(record.created).isoformat() + 'Z',
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -40,61 +51,252 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_entry)
 
 
-class StructuredLogger:
-    """Structured logger with JSON and rich console output"""
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that writes formatted records in batches
     
-    def __init__(self, name: str = "etsy_scraper"):
-        self.name = name
-        self.logger = self._setup_logger()
+    Records are buffered and written with a single write call once
+    `batch_size` records are pending, `flush_interval` seconds have passed,
+    an ERROR or worse arrives, or the handler is flushed or closed.
+    """
     
-    def _setup_logger(self) -> logging.Logger:
-        """Set up the logger with file and console handlers"""
-        logger = logging.getLogger(self.name)
-        logger.setLevel(logging.DEBUG)
-        
-        # Clear existing handlers
-        logger.handlers.clear()
+    def __init__(self, filename: str, max_bytes: int = 0, backup_count: int = 0,
+                 batch_size: int = 64, flush_interval: float = 1.0):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+    
+    def emit(self, record):
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if (len(self._buffer) >= self.batch_size or record.levelno >= logging.ERROR
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """Write pending records, rotating first if the batch would overflow the file"""
+        self.acquire()
+        try:
+            if self._buffer:
+                data = '\n'.join(self._buffer) + '\n'
+                self._buffer.clear()
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0 and 0 < self.stream.tell() and self.stream.tell() + len(data) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                self.stream.write(data)
+            super().flush()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+    
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class SampledConsoleHandler(logging.StreamHandler):
+    """Console handler that caps output at `max_per_second` records
+    
+    WARNING and above are always shown. Suppressed records still reach the
+    log file; the console gets a count of how many were skipped.
+    """
+    
+    def __init__(self, stream=None, max_per_second: int = 50):
+        super().__init__(stream or sys.stdout)
+        self.max_per_second = max_per_second
+        self.suppressed = 0
+        self._window = 0
+        self._window_count = 0
+    
+    def emit(self, record):
+        if self.max_per_second and record.levelno < logging.WARNING:
+            window = int(record.created)
+            if window != self._window:
+                self._window, self._window_count = window, 0
+                self._report_suppressed()
+            self._window_count += 1
+            if self._window_count > self.max_per_second:
+                self.suppressed += 1
+                return
+        super().emit(record)
+    
+    def flush(self):
+        self._report_suppressed()
+        super().flush()
+    
+    def _report_suppressed(self):
+        """Print how many records were skipped since the last report"""
+        if self.suppressed and self.stream:
+            timestamp = datetime.now().strftime(CONSOLE_DATE_FORMAT)
+            self.stream.write(f"[{timestamp}] INFO: … {self.suppressed} console messages skipped (see log file)\n")
+            self.suppressed = 0
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers whenever the queue goes idle"""
+    
+    def __init__(self, log_queue, *handlers, flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+    
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block=block, timeout=self.flush_interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for a listener in the same process
+    
+    Records are queued without the copy and pre-formatting the stock
+    QueueHandler does for cross-process queues.
+    """
+    
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def parse_size(value: Union[str, int]) -> int:
+    """Parse a size such as "10MB" into bytes"""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip().upper()
+    for suffix, factor in (('GB', 1024 ** 3), ('MB', 1024 ** 2), ('KB', 1024), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+class LoggingBackend:
+    """Queue, listener and output handlers shared by every logger"""
+    
+    def __init__(self, handlers: List[logging.Handler], level: int, flush_interval: float = 1.0):
+        self.handlers = handlers
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.queue_handler = LocalQueueHandler(self.queue)
+        self.listener = BatchingQueueListener(self.queue, *handlers, flush_interval=flush_interval)
         
-        # Console handler with rich formatting
-        console_handler = RichHandler(
-            console=Console(),
-            show_time=True,
-            show_path=False,
-            markup=True
-        )
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.handlers.clear()
+        root.addHandler(self.queue_handler)
+        root.setLevel(level)
+        root.propagate = False
+        self.listener.start()
+    
+    def stop(self):
+        """Drain the queue, then flush and close the output handlers"""
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        if self.queue_handler in root.handlers:
+            root.removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+_backend: Optional[LoggingBackend] = None
+_backend_lock = threading.Lock()
+
+
+def configure_logging(log_file: Optional[str] = None,
+                      level: Optional[Union[str, int]] = None,
+                      fmt: Optional[str] = None,
+                      console: bool = True,
+                      console_max_per_second: Optional[int] = None,
+                      batch_size: int = 64,
+                      flush_interval: float = 1.0) -> LoggingBackend:
+    """Start (or restart) the shared logging backend
+    
+    Unset options come from the `logging` and `output` sections of config.yaml.
+    """
+    global _backend
+    from .config import config
+    
+    log_config = config.get_logging_config()
+    log_file = log_file or config.get('output.log_filename', 'scraping_log.txt')
+    level = level or log_config.get('level', 'INFO')
+    fmt = fmt or log_config.get('format', 'json')
+    if console_max_per_second is None:
+        console_max_per_second = log_config.get('console_max_per_second', 50)
+    max_bytes = parse_size(log_config.get('max_file_size', '10MB'))
+    backup_count = log_config.get('backup_count', 7)
+    
+    file_formatter = JSONFormatter() if fmt == 'json' else logging.Formatter(CONSOLE_FORMAT, CONSOLE_DATE_FORMAT)
+    handlers: List[logging.Handler] = []
+    
+    file_handler = BatchingRotatingFileHandler(log_file, max_bytes, backup_count, batch_size, flush_interval)
+    file_handler.setFormatter(file_formatter)
+    handlers.append(file_handler)
+    
+    # Debug file handler (if debug mode is enabled)
+    if config.is_debug_mode():
+        level = logging.DEBUG
+        debug_handler = BatchingRotatingFileHandler(f"debug_{log_file}", max_bytes, 3, batch_size, flush_interval)
+        debug_handler.setFormatter(JSONFormatter())
+        handlers.append(debug_handler)
+    
+    if console:
+        console_handler = SampledConsoleHandler(max_per_second=console_max_per_second)
         console_handler.setLevel(logging.INFO)
-        logger.addHandler(console_handler)
-        
-        # File handler with JSON formatting
-        log_config = config.get_logging_config()
-        log_filename = log_config.get('log_filename', 'scraping_log.txt')
-        
-        # Create logs directory if it doesn't exist
-        log_path = Path(log_filename)
-        log_path.parent.mkdir(exist_ok=True)
-        
-        # Rotating file handler
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_filename,
-            maxBytes=10 * 1024 * 1024,  # 10MB
-            backupCount=7
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(JSONFormatter())
-        logger.addHandler(file_handler)
-        
-        # Debug file handler (if debug mode is enabled)
-        if config.is_debug_mode():
-            debug_handler = logging.handlers.RotatingFileHandler(
-                f"debug_{log_filename}",
-                maxBytes=10 * 1024 * 1024,
-                backupCount=3
-            )
-            debug_handler.setLevel(logging.DEBUG)
-            debug_handler.setFormatter(JSONFormatter())
-            logger.addHandler(debug_handler)
-        
-        return logger
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, CONSOLE_DATE_FORMAT))
+        handlers.append(console_handler)
+    
+    with _backend_lock:
+        if _backend is not None:
+            _backend.stop()
+        _backend = LoggingBackend(handlers, to_level(level), flush_interval)
+    return _backend
+
+
+def shutdown_logging():
+    """Flush everything still queued and stop the backend"""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.stop()
+            _backend = None
+
+
+atexit.register(shutdown_logging)
+
+
+def ensure_logging() -> LoggingBackend:
+    """Return the running backend, starting it with config defaults if needed"""
+    if _backend is None:
+        configure_logging()
+    return _backend
+
+
+def to_level(level: Union[str, int]) -> int:
+    """Convert a level name such as "WARNING" to its number"""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+class StructuredLogger:
+    """Structured logger that hands records to the shared queued backend"""
+    
+    def __init__(self, name: str = ROOT_LOGGER_NAME):
+        self.name = name
+        if name != ROOT_LOGGER_NAME and not name.startswith(ROOT_LOGGER_NAME + '.'):
+            name = f"{ROOT_LOGGER_NAME}.{name}"
+        self.logger = logging.getLogger(name)
     
     def info(self, message: str, **kwargs):
         """Log info message with extra fields"""
@@ -116,15 +318,24 @@ class StructuredLogger:
         """Log critical message with extra fields"""
         self._log_with_extra(logging.CRITICAL, message, **kwargs)
     
+    def log(self, level: Union[str, int], message: str, **kwargs):
+        """Log message at a level given by name or number"""
+        self._log_with_extra(to_level(level), message, **kwargs)
+    
     def _log_with_extra(self, level: int, message: str, **kwargs):
         """Log message with extra fields"""
+        if _backend is None:
+            ensure_logging()
+        if not self.logger.isEnabledFor(level):
+            return
         record = self.logger.makeRecord(
-            self.name, level, "", 0, message, (), None
+            self.logger.name, level, "", 0, message, (), None
         )
-        record.extra_fields = kwargs
+        if kwargs:
+            record.extra_fields = kwargs
         self.logger.handle(record)
     
-    def log_scraping_event(self, event_type: str, seed: str = None, 
+    def log_scraping_event(self, event_type: str, seed: str = None,
                           suggestion: str = None, **kwargs):
         """Log scraping-specific events"""
         extra_fields = {
@@ -147,17 +358,24 @@ class StructuredLogger:
 
 # Global logger instance
 logger = StructuredLogger()
+_loggers: Dict[str, StructuredLogger] = {ROOT_LOGGER_NAME: logger}
 
 
 def get_logger(name: str = None) -> StructuredLogger:
-    """Get a logger instance"""
-    if name:
-        return StructuredLogger(name)
-    return logger
+    """Get a logger instance (cached per name)"""
+    if not name:
+        return logger
+    if name not in _loggers:
+        _loggers[name] = StructuredLogger(name)
+    return _loggers[name]
 
 
 def setup_logging():
     """Set up logging configuration"""
+    import structlog
+    
+    ensure_logging()
+    
     # Configure structlog for additional structured logging
     structlog.configure(
         processors=[
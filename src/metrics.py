@@ -0,0 +1,289 @@
+"""
+Lightweight metrics registry for the scrape pipeline
+
+Counters, gauges and latency histograms with optional labels, exported in
+the Prometheus text format (for node_exporter's textfile collector) and as
+a JSON summary with p50/p95/p99 per series.
+"""
+import json
+import math
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Latency buckets in seconds, from fast DOM reads to page-load timeouts
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0)
+RESERVOIR_SIZE = 4096
+
+
+def label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Canonical, hashable form of a label set"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as {a="x",b="y"}"""
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in items) + '}'
+
+
+def escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines in a label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def series_name(key: LabelKey) -> str:
+    """Short name of a label set for the JSON summary, e.g. "stage=navigate" """
+    return ','.join(f"{name}={value}" for name, value in key) or 'all'
+
+
+def format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects"""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """Base class for a named metric with labelled series"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str = ''):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def prometheus_lines(self) -> Iterator[str]:
+        """Prometheus exposition lines for this metric"""
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str = ''):
+        super().__init__(name, help_text)
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Add `amount` to the series for these labels"""
+        key = label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        """Current value of the series for these labels"""
+        return self.values.get(label_key(labels), 0.0)
+
+    def prometheus_lines(self) -> Iterator[str]:
+        yield from super().prometheus_lines()
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{format_labels(key)} {format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        """Set the series for these labels"""
+        with self._lock:
+            self.values[label_key(labels)] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        """Subtract `amount` from the series for these labels"""
+        self.inc(-amount, **labels)
+
+
+class HistogramSeries:
+    """Bucket counts, totals and a bounded sample of observations for one label set"""
+
+    __slots__ = ('bucket_counts', 'count', 'sum', 'min', 'max', 'samples', '_random')
+
+    def __init__(self, bucket_count: int):
+        self.bucket_counts = [0] * bucket_count
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.samples: List[float] = []
+        self._random = random.Random(0)
+
+    def observe(self, value: float, buckets: Sequence[float]):
+        """Add one observation"""
+        index = bisect_left(buckets, value)
+        if index < len(buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        # Reservoir sampling keeps quantiles accurate with bounded memory on long runs
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(value)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = value
+
+    def quantiles(self, *qs: float) -> List[float]:
+        """Quantiles of the sampled observations (linear interpolation)"""
+        if not self.samples:
+            return [0.0] * len(qs)
+        ordered = sorted(self.samples)
+        values = []
+        for q in qs:
+            position = q * (len(ordered) - 1)
+            lower = int(position)
+            upper = min(lower + 1, len(ordered) - 1)
+            values.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+        return values
+
+
+class Timer:
+    """Context manager that observes elapsed seconds into a histogram"""
+
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: 'Histogram', labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Histogram(Metric):
+    """Distribution of observed values, usually latencies in seconds"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str = '', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self.series: Dict[LabelKey, HistogramSeries] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation"""
+        key = label_key(labels)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = HistogramSeries(len(self.buckets))
+            series.observe(value, self.buckets)
+
+    def time(self, **labels) -> Timer:
+        """Time a block: `with histogram.time(stage="navigate"): ...`"""
+        return Timer(self, labels)
+
+    def prometheus_lines(self) -> Iterator[str]:
+        yield from super().prometheus_lines()
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series.bucket_counts):
+                cumulative += count
+                yield f"{self.name}_bucket{format_labels(key, ('le', format_value(bound)))} {cumulative}"
+            yield f"{self.name}_bucket{format_labels(key, ('le', '+Inf'))} {series.count}"
+            yield f"{self.name}_sum{format_labels(key)} {format_value(series.sum)}"
+            yield f"{self.name}_count{format_labels(key)} {series.count}"
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-series count, total, mean, p50/p95/p99 and max"""
+        result = {}
+        for key, series in sorted(self.series.items()):
+            p50, p95, p99 = series.quantiles(0.50, 0.95, 0.99)
+            result[series_name(key)] = {
+                'count': series.count,
+                'total': round(series.sum, 6),
+                'mean': round(series.sum / series.count, 6) if series.count else 0.0,
+                'p50': round(p50, 6),
+                'p95': round(p95, 6),
+                'p99': round(p99, 6),
+                'max': round(series.max, 6) if series.count else 0.0,
+            }
+        return result
+
+
+class MetricsRegistry:
+    """Named collection of metrics with Prometheus and JSON export"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.started = time.time()
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs) -> Any:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help_text, **kwargs)
+        elif type(metric) is not cls:
+            raise ValueError(f"metric '{name}' already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str = '') -> Counter:
+        """Get or register a counter"""
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = '') -> Gauge:
+        """Get or register a gauge"""
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = '', buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or register a histogram"""
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.prometheus_lines())
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly snapshot: counter/gauge values and histogram quantiles"""
+        snapshot: Dict[str, Any] = {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'elapsed_seconds': round(time.time() - self.started, 3),
+        }
+        for name, metric in self.metrics.items():
+            if isinstance(metric, Histogram):
+                snapshot[name] = metric.summary()
+            else:
+                snapshot[name] = {series_name(key): value for key, value in sorted(metric.values.items())}
+        return snapshot
+
+    def write_prometheus(self, path: str):
+        """Write the Prometheus text file atomically"""
+        _atomic_write(path, self.to_prometheus())
+
+    def write_summary(self, path: str):
+        """Write the JSON summary atomically"""
+        _atomic_write(path, json.dumps(self.summary(), indent=2))
+
+
+def _atomic_write(path: str, content: str):
+    """Replace a file in one step so readers never see a partial export"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Global registry used by the scraper
+metrics = MetricsRegistry()
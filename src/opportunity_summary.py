@@ -0,0 +1,162 @@
+"""
+Single-pass opportunity summary over a results CSV
+
+Rows are streamed once; each seed counts once, with its most recent row
+winning. Memory grows with the number of distinct seeds, never with the
+number of rows, so multi-GB result histories summarize in one read. Knowing
+which row is a seed's latest already takes one entry per seed (about 240
+bytes), so the top-N lists are picked from that map when the report is
+rendered rather than kept in bounded heaps. The
+high/good bands default to `scoring.thresholds` in config.yaml, the same
+thresholds the recommendations use.
+
+Usage:
+    python -m src.opportunity_summary etsy_market_research.csv -o opportunity_summary.txt
+"""
+import argparse
+import csv
+import heapq
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+TOP_N = 10
+
+
+def score_thresholds() -> Tuple[float, float]:
+    """(high, good) opportunity score thresholds from the scoring config"""
+    from .scoring import get_scoring_weights  # numpy/pandas only once a summary is made
+
+    thresholds = get_scoring_weights().thresholds
+    return float(thresholds['high']), float(thresholds['good'])
+
+
+class OpportunityAggregator:
+    """Latest score per seed with running band counts and category aggregates"""
+
+    def __init__(self, top_n: int = TOP_N, high_score: Optional[float] = None, good_score: Optional[float] = None):
+        if high_score is None or good_score is None:
+            default_high, default_good = score_thresholds()
+            high_score = default_high if high_score is None else high_score
+            good_score = default_good if good_score is None else good_score
+        self.top_n = top_n
+        self.high_score = high_score
+        self.good_score = good_score
+        self.latest: Dict[str, Tuple[float, str]] = {}
+        # category -> [seed count, score total]; insertion order is first-seen order
+        self.categories: Dict[str, List[float]] = {}
+        self.high_count = 0
+        self.good_count = 0
+        self.rows = 0
+
+    def _band(self, score: float) -> int:
+        if score >= self.high_score:
+            return 2
+        if score >= self.good_score:
+            return 1
+        return 0
+
+    def _apply(self, score: float, category: str, sign: int):
+        stats = self.categories.setdefault(category, [0, 0.0])
+        stats[0] += sign
+        stats[1] += sign * score
+        band = self._band(score)
+        if band == 2:
+            self.high_count += sign
+        elif band == 1:
+            self.good_count += sign
+
+    def add(self, seed: str, score: float, category: str):
+        """Record a row; a later row for the same seed replaces the earlier one"""
+        self.rows += 1
+        previous = self.latest.get(seed)
+        if previous is not None:
+            if previous == (score, category):
+                return
+            self._apply(previous[0], previous[1], -1)
+        self.latest[seed] = (score, category)
+        self._apply(score, category, 1)
+
+    def top(self, min_score: float, max_score: Optional[float] = None, n: Optional[int] = None) -> List[Tuple[str, float, str]]:
+        """Highest-scoring seeds in [min_score, max_score) as (seed, score, category)"""
+        candidates = (
+            (seed, score, category) for seed, (score, category) in self.latest.items()
+            if score >= min_score and (max_score is None or score < max_score)
+        )
+        return heapq.nlargest(self.top_n if n is None else n, candidates, key=lambda item: item[1])
+
+    def high_opportunities(self) -> List[Tuple[str, float, str]]:
+        return self.top(self.high_score)
+
+    def good_opportunities(self) -> List[Tuple[str, float, str]]:
+        return self.top(self.good_score, self.high_score)
+
+    def category_stats(self) -> Iterator[Tuple[str, int, float]]:
+        """(category, seed count, average score) for categories that still hold seeds"""
+        for category, (count, total) in self.categories.items():
+            if count > 0:
+                yield category, int(count), total / count
+
+    def render(self) -> str:
+        """Summary report text"""
+        lines = ["🎯 ETSY OPPORTUNITY ANALYSIS SUMMARY", "=" * 50, ""]
+        lines.append(f"🔥 HIGH OPPORTUNITIES (Score ≥ {self.high_score:g}): {self.high_count}")
+        lines.append("-" * 40)
+        for seed, score, category in self.high_opportunities():
+            lines.append(f"• {seed} (Score: {score:.1f}, Category: {category})")
+
+        lines.append("")
+        lines.append(f"✅ GOOD OPPORTUNITIES (Score {self.good_score:g}–<{self.high_score:g}): {self.good_count}")
+        lines.append("-" * 40)
+        for seed, score, category in self.good_opportunities():
+            lines.append(f"• {seed} (Score: {score:.1f}, Category: {category})")
+
+        lines.append("")
+        lines.append("📊 CATEGORY BREAKDOWN")
+        lines.append("-" * 40)
+        for category, count, average in self.category_stats():
+            lines.append(f"• {category}: {count} opportunities, avg score: {average:.1f}")
+        return "\n".join(lines) + "\n"
+
+
+def summarize_csv(csv_file: str, top_n: int = TOP_N) -> OpportunityAggregator:
+    """Stream a results CSV into an aggregator; rows without a numeric score are skipped"""
+    aggregator = OpportunityAggregator(top_n)
+    add = aggregator.add
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return aggregator
+        seed_col = header.index('seed')
+        score_col = header.index('opportunity_score')
+        category_col = header.index('category')
+        width = max(seed_col, score_col, category_col) + 1
+        for row in reader:
+            if len(row) < width or not row[score_col]:
+                continue
+            try:
+                score = float(row[score_col])
+            except ValueError:
+                continue
+            add(row[seed_col], score, row[category_col])
+    return aggregator
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Summarize the best opportunities in a results file")
+    parser.add_argument("csv_file", help="Results CSV")
+    parser.add_argument("-o", "--output", help="Write the summary here instead of printing it")
+    parser.add_argument("--top", type=int, default=TOP_N, help="Seeds listed per band")
+    args = parser.parse_args(argv)
+
+    aggregator = summarize_csv(args.csv_file, args.top)
+    report = aggregator.render()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"✅ Summarized {aggregator.rows:,} rows ({len(aggregator.latest):,} seeds) → {args.output}")
+    else:
+        print(report, end="")
+
+
+if __name__ == "__main__":
+    main()
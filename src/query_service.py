@@ -0,0 +1,345 @@
+"""
+Read-only local HTTP service answering JSON queries about a results file
+
+The results are loaded once (through the feature cache) into an immutable
+`ResultsStore` that request threads only read. Responses are cached by
+normalized query and store generation in an LRU, and the store is swapped
+for a fresh one (and the cache cleared) when the results file changes on
+disk. If the changed file cannot be read, every request gets a 503 until
+a reload succeeds; the previous store is kept meanwhile. Unexpected errors
+answer a JSON 500.
+
+Endpoints (GET, JSON):
+    /opportunities?category=&competition=&trend=&min_score=&limit=&offset=
+    /seeds/<seed>
+    /categories
+    /trends
+    /health
+
+Usage:
+    python -m src.query_service etsy_market_research.csv --port 8765
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+HOST = "127.0.0.1"
+PORT = 8765
+CACHE_SIZE = 256
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+CHECK_INTERVAL = 2.0
+FLOAT_DECIMALS = 4
+SEED_COLUMNS = ('category', 'opportunity_score', 'competition_level', 'trend_direction', 'trend_score',
+                'listing_count', 'avg_price', 'recommendation', 'timestamp_utc')
+
+
+def server_settings(cfg: Any = None) -> Dict[str, Any]:
+    """Service settings from the `server` config section"""
+    if cfg is None:
+        from .config import config as cfg
+    section = cfg.get('server', {}) or {}
+    return {
+        'host': section.get('host', HOST),
+        'port': int(section.get('port', PORT)),
+        'cache_size': int(section.get('cache_size', CACHE_SIZE)),
+        'page_size': int(section.get('page_size', PAGE_SIZE)),
+        'max_page_size': int(section.get('max_page_size', MAX_PAGE_SIZE)),
+    }
+
+
+def _scalar(value: Any) -> Any:
+    """JSON-ready value: numpy scalars become Python values and NaN becomes null"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    return [{key: _scalar(value) for key, value in record.items()} for record in frame.to_dict('records')]
+
+
+def _level_key(level: Any) -> str:
+    """"Low Competition - Good Opportunity" -> "low", matching the scoring labels"""
+    return str(level).split(' ', 1)[0].casefold()
+
+
+class ResultsStore:
+    """Seed-level views of a results frame, built once and only read afterwards"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.rows = len(frame)
+        frame = frame[frame['seed'].notna()] if 'seed' in frame.columns else frame.iloc[0:0]
+        # Rows are appended in scrape order, so a seed's last row holds its latest scores
+        latest = frame.drop_duplicates('seed', keep='last').set_index('seed')
+        columns = [column for column in SEED_COLUMNS if column in latest.columns]
+        seeds = latest[columns].copy()
+        for column in seeds.columns:
+            if isinstance(seeds[column].dtype, pd.CategoricalDtype):
+                seeds[column] = seeds[column].astype(object)
+            elif seeds[column].dtype == 'float32':
+                # float32 values read back as e.g. 15.199999809265137; the CSV has at most a few decimals
+                seeds[column] = seeds[column].astype('float64').round(FLOAT_DECIMALS)
+        seeds.index = seeds.index.astype(object)
+        seeds['suggestions'] = frame.groupby('seed', observed=True)['suggestion'].nunique().reindex(seeds.index)
+        if 'opportunity_score' in seeds.columns:
+            seeds = seeds.sort_values('opportunity_score', ascending=False, kind='stable')
+        self.seeds = seeds
+        self._keys = {
+            'category': seeds.get('category', pd.Series(index=seeds.index, dtype=object)).map(
+                lambda value: str(value).casefold()),
+            'competition': seeds.get('competition_level', pd.Series(index=seeds.index, dtype=object)).map(_level_key),
+            'trend': seeds.get('trend_direction', pd.Series(index=seeds.index, dtype=object)).map(
+                lambda value: str(value).casefold()),
+        }
+        self._positions = frame.groupby('seed', observed=True, sort=False).indices
+        self._frame = frame
+
+    def opportunities(self, category: Optional[str] = None, competition: Optional[str] = None,
+                      trend: Optional[str] = None, min_score: Optional[float] = None,
+                      limit: int = PAGE_SIZE, offset: int = 0) -> Dict[str, Any]:
+        """Seeds by opportunity score, optionally filtered, one page at a time"""
+        mask = np.ones(len(self.seeds), dtype=bool)
+        for name, value in (('category', category), ('competition', competition), ('trend', trend)):
+            if value:
+                mask &= (self._keys[name] == value.casefold()).to_numpy()
+        if min_score is not None and 'opportunity_score' in self.seeds.columns:
+            mask &= (self.seeds['opportunity_score'] >= min_score).to_numpy()
+        matches = self.seeds[mask]
+        page = matches.iloc[offset:offset + limit]
+        return {
+            'total': len(matches),
+            'offset': offset,
+            'limit': limit,
+            'items': _records(page.rename_axis('seed').reset_index()),
+        }
+
+    def seed(self, seed: str) -> Optional[Dict[str, Any]]:
+        """Latest scores of one seed and the suggestions from its latest scrape"""
+        if seed not in self.seeds.index:
+            return None
+        detail = _records(self.seeds.loc[[seed]].rename_axis('seed').reset_index())[0]
+        rows = self._frame.iloc[self._positions[seed]]
+        if 'timestamp_utc' in rows.columns and detail.get('timestamp_utc') is not None:
+            rows = rows[rows['timestamp_utc'] == detail['timestamp_utc']]
+        detail['suggestion_list'] = list(dict.fromkeys(rows['suggestion'].astype(str)))
+        return detail
+
+    def categories(self) -> List[Dict[str, Any]]:
+        """Seeds, mean score and competition mix per category"""
+        if 'category' not in self.seeds.columns:
+            return []
+        summary = self.seeds.groupby('category', sort=False).agg(
+            seeds=('suggestions', 'size'), mean_opportunity_score=('opportunity_score', 'mean')
+        ).sort_values('seeds', ascending=False, kind='stable').round(FLOAT_DECIMALS)
+        mix = pd.crosstab(self.seeds['category'], self._keys['competition'])
+        records = _records(summary.rename_axis('category').reset_index())
+        for record in records:
+            row = mix.loc[record['category']]
+            record['competition'] = {level: int(count) for level, count in row.items() if count}
+        return records
+
+    def trends(self, top: int = 5) -> Dict[str, Any]:
+        """Seed counts and best seeds per trend direction"""
+        if 'trend_direction' not in self.seeds.columns:
+            return {}
+        directions = {}
+        for direction, group in self.seeds.groupby(self._keys['trend'], sort=True):
+            directions[direction] = {
+                'seeds': len(group),
+                'mean_opportunity_score': _scalar(round(group['opportunity_score'].mean(), FLOAT_DECIMALS)),
+                'top': _records(group.head(top)[['opportunity_score', 'category']].rename_axis('seed').reset_index()),
+            }
+        return directions
+
+
+class ReloadError(Exception):
+    """The results file changed but could not be loaded"""
+
+
+class QueryService:
+    """Routes queries to the current store, with an LRU response cache shared by all threads"""
+
+    def __init__(self, csv_file: str, settings: Optional[Dict[str, Any]] = None, use_cache: bool = True,
+                 check_interval: float = CHECK_INTERVAL):
+        self.csv_file = csv_file
+        self.settings = settings or server_settings()
+        self.use_cache = use_cache
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[Tuple[Any, ...], bytes]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self._reload_error: Optional[str] = None
+        store, self._signature = self._load()
+        # Store and generation are swapped together so a reader never pairs one with the other's peer
+        self._current: Tuple[ResultsStore, int] = (store, 0)
+
+    @property
+    def store(self) -> ResultsStore:
+        return self._current[0]
+
+    @property
+    def generation(self) -> int:
+        return self._current[1]
+
+    def _stat(self) -> Tuple[int, int]:
+        stat = os.stat(self.csv_file)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load(self) -> Tuple[ResultsStore, Tuple[int, int]]:
+        from .features import load_features
+
+        signature = self._stat()
+        frame, _ = load_features(self.csv_file, use_cache=self.use_cache)
+        return ResultsStore(frame), signature
+
+    def current_store(self) -> Tuple[ResultsStore, int]:
+        """(store, generation), reloaded first if the results file changed; one thread reloads while
+        the others keep answering from the previous store. Raises ReloadError in every thread from a
+        failed reload until one succeeds (the previous store stays loaded)"""
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval and self._reload_lock.acquire(blocking=False):
+            try:
+                self._checked = now
+                try:
+                    changed = self._stat() != self._signature
+                    loaded = self._load() if changed else None
+                except (OSError, ValueError, KeyError) as e:
+                    self._reload_error = f"results file unavailable: {e}"
+                    raise ReloadError(self._reload_error) from e
+                self._reload_error = None
+                if loaded is not None:
+                    store, signature = loaded
+                    with self._cache_lock:
+                        self._signature = signature
+                        self._current = (store, self._current[1] + 1)
+                        self._cache.clear()
+            finally:
+                self._reload_lock.release()
+        error = self._reload_error
+        if error is not None:
+            raise ReloadError(error)
+        return self._current
+
+    def _page(self, params: Dict[str, str]) -> Tuple[int, int]:
+        limit = int(params.get('limit', self.settings['page_size']))
+        offset = int(params.get('offset', 0))
+        if limit < 1 or offset < 0:
+            raise ValueError("limit must be positive and offset non-negative")
+        return min(limit, self.settings['max_page_size']), offset
+
+    def _answer(self, store: ResultsStore, generation: int, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        if path == '/health':
+            return 200, {'rows': store.rows, 'seeds': len(store.seeds), 'generation': generation,
+                         'cache': {'size': len(self._cache), 'hits': self.hits, 'misses': self.misses}}
+        if path == '/opportunities':
+            limit, offset = self._page(params)
+            min_score = float(params['min_score']) if params.get('min_score') else None
+            return 200, store.opportunities(params.get('category'), params.get('competition'),
+                                            params.get('trend'), min_score, limit, offset)
+        if path.startswith('/seeds/'):
+            detail = store.seed(unquote(path[len('/seeds/'):]))
+            return (200, detail) if detail is not None else (404, {'error': 'unknown seed'})
+        if path == '/categories':
+            return 200, store.categories()
+        if path == '/trends':
+            return 200, store.trends()
+        return 404, {'error': f'unknown endpoint {path}'}
+
+    def handle(self, url: str) -> Tuple[int, bytes]:
+        """(status, JSON body) for a GET request URL"""
+        parts = urlsplit(url)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip('/') or '/'
+        try:
+            store, generation = self.current_store()
+        except ReloadError as e:
+            return 503, json.dumps({'error': str(e)}).encode('utf-8')
+        key = (generation, path, tuple(sorted(params.items())))
+        if path != '/health':
+            with self._cache_lock:
+                body = self._cache.get(key)
+                if body is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return 200, body
+        try:
+            status, payload = self._answer(store, generation, path, params)
+        except ValueError as e:
+            return 400, json.dumps({'error': str(e)}).encode('utf-8')
+        except Exception as e:
+            return 500, json.dumps({'error': f"internal error: {type(e).__name__}: {e}"}).encode('utf-8')
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        if status == 200 and path != '/health':
+            with self._cache_lock:
+                self.misses += 1
+                self._cache[key] = body
+                if len(self._cache) > self.settings['cache_size']:
+                    self._cache.popitem(last=False)
+        return status, body
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """GET-only JSON handler; the service is attached to the server"""
+
+    def do_GET(self):
+        status, body = self.server.service.handle(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the console
+
+
+def make_server(service: QueryService, host: str = HOST, port: int = PORT) -> ThreadingHTTPServer:
+    """Threading HTTP server bound to host:port (port 0 picks a free one)"""
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    settings = server_settings()
+    parser = argparse.ArgumentParser(description="Serve JSON queries about a results file")
+    parser.add_argument("csv_file", nargs="?", default="etsy_market_research.csv", help="Results CSV")
+    parser.add_argument("--host", default=settings['host'], help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=settings['port'], help="Port to listen on")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write the derived-feature cache")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    service = QueryService(args.csv_file, settings, use_cache=not args.no_cache)
+    server = make_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"✅ Loaded {service.store.rows:,} rows ({len(service.store.seeds):,} seeds) "
+          f"in {time.perf_counter() - started:.1f}s")
+    print(f"🌐 Serving http://{host}:{port}/opportunities (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
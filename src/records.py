@@ -0,0 +1,67 @@
+"""
+Compact record types for the scrape -> score -> write path
+
+A results row used to be a dict with 12 string keys per suggestion and each
+seed's market data a nested dict holding a list of Python floats. Here a row
+is a `ResultRow` named tuple (no per-instance dict; csv.writer writes it as
+is, in header order) and market data is a slotted `MarketData` whose prices
+live in a packed array('d').
+"""
+from array import array
+from typing import Any, Iterable, Mapping, NamedTuple
+
+RESULT_FIELDS = (
+    "timestamp_utc", "seed", "suggestion", "competition_level", "opportunity_score",
+    "trend_score", "trend_direction", "listing_count", "avg_price", "price_range",
+    "category", "recommendation",
+)
+
+
+class ResultRow(NamedTuple):
+    """One suggestion row of the results CSV, fields in column order"""
+    timestamp_utc: str
+    seed: str
+    suggestion: str
+    competition_level: str
+    opportunity_score: float
+    trend_score: float
+    trend_direction: str
+    listing_count: int
+    avg_price: float
+    price_range: str
+    category: str
+    recommendation: str
+
+    @classmethod
+    def from_mapping(cls, row: Mapping[str, Any], **overrides: Any) -> 'ResultRow':
+        """Row from a dict keyed by column name (e.g. a csv.DictReader row)"""
+        return cls(*(overrides[field] if field in overrides else row.get(field, '') for field in RESULT_FIELDS))
+
+
+class MarketData:
+    """Listing count and price statistics parsed from one search page"""
+    __slots__ = ('listing_count', 'competition_level', 'prices', 'min_price', 'max_price', 'avg_price')
+
+    def __init__(self, listing_count: int = 0, prices: Iterable[float] = (), competition_level: str = 'unknown'):
+        self.listing_count = listing_count
+        self.competition_level = competition_level
+        self.set_prices(prices)
+
+    def set_prices(self, prices: Iterable[float]):
+        """Store the listing prices and their min/max/average (0 when there are none)"""
+        self.prices = array('d', prices)
+        if self.prices:
+            self.min_price = min(self.prices)
+            self.max_price = max(self.prices)
+            self.avg_price = sum(self.prices) / len(self.prices)
+        else:
+            self.min_price = self.max_price = self.avg_price = 0
+
+    @property
+    def price_range(self) -> str:
+        """"$min-$max" as written to the results CSV"""
+        return f"${self.min_price:.2f}-${self.max_price:.2f}"
+
+    def __repr__(self) -> str:
+        return (f"MarketData(listing_count={self.listing_count}, competition_level={self.competition_level!r}, "
+                f"prices={len(self.prices)}, avg_price={self.avg_price:.2f})")
@@ -0,0 +1,203 @@
+"""
+HTML report rendering with a shared plotly.js bundle
+
+Every report page references one local plotly.min.js instead of embedding
+its own multi-megabyte copy, pages are rendered in a process pool, and an
+index page links them all.
+
+Builds are incremental: a page queued with a `key` (a hash of the data it
+depends on, see `partition_digests` and `artifact_key`) is skipped when the
+manifest in the output directory records the same key for an existing file.
+The manifest is merged on write, so entries of pages another build put in
+the same directory are kept.
+
+Usage:
+    builder = ReportBuilder("reports")
+    builder.add("dashboard.html", "Dashboard", fig, key=key)            # a built figure
+    builder.add_task("cat_maps.html", "Maps", build_figure, payload)    # built in a worker
+    builder.build()
+"""
+import hashlib
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PLOTLY_BUNDLE = "plotly.min.js"
+INDEX_FILE = "index.html"
+MANIFEST_FILE = ".report_manifest.json"
+MIN_PARALLEL_PAGES = 4
+# Bump when page layouts change so existing pages are rebuilt
+REPORT_VERSION = 1
+
+
+def write_plotly_bundle(output_dir: str) -> str:
+    """Write plotly.min.js into the output directory once; returns its path"""
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(output_dir, PLOTLY_BUNDLE)
+    bundle = get_plotlyjs().encode("utf-8")
+    # Rewritten only when missing or from a different plotly version
+    if not os.path.exists(path) or os.path.getsize(path) != len(bundle):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(bundle)
+        os.replace(tmp_path, path)
+    return path
+
+
+def render_page(path: str, figure: Any) -> int:
+    """Write one page referencing the shared bundle; returns the file size"""
+    import plotly.io as pio
+
+    pio.write_html(figure, path, include_plotlyjs=PLOTLY_BUNDLE, full_html=True, validate=False)
+    return os.path.getsize(path)
+
+
+def partition_digests(frame, by: str, columns: Sequence[str]) -> Dict[Any, str]:
+    """Order-independent content digest of each `by` partition (rows with no value under None)"""
+    import pandas as pd
+
+    if frame.empty:
+        return {}
+    rows = pd.util.hash_pandas_object(frame[list(columns)], index=False).to_numpy()
+    codes, labels = pd.factorize(frame[by], use_na_sentinel=True)
+    codes = codes.astype(np.int64) + 1  # 0 holds missing values
+    sums = np.zeros(len(labels) + 1, dtype=np.uint64)
+    np.add.at(sums, codes, rows)  # wraps modulo 2**64
+    counts = np.bincount(codes, minlength=len(labels) + 1)
+    names = [None] + list(labels)
+    return {names[code]: f"{counts[code]:x}-{sums[code]:016x}" for code in np.flatnonzero(counts)}
+
+
+def artifact_key(*parts: Any) -> str:
+    """Build key for a page from the digests and settings it depends on"""
+    payload = json.dumps([REPORT_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _render_task(path: str, build: Callable[..., Any], args: Tuple[Any, ...]) -> int:
+    return render_page(path, build(*args))
+
+
+class ReportBuilder:
+    """Collects report pages and renders them together"""
+
+    def __init__(self, output_dir: str = ".", workers: Optional[int] = None, index_title: str = "Etsy Market Research Reports",
+                 force: bool = False):
+        if workers is None:
+            from .config import config
+            workers = config.get('reports.workers', 0)
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.index_title = index_title
+        self.force = force
+        self.pages: List[Dict[str, Any]] = []
+        self._stored_manifest = self.read_manifest()
+        self.manifest = {} if force else dict(self._stored_manifest)
+
+    def read_manifest(self) -> Dict[str, str]:
+        """filename -> key of the pages written by the last build"""
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f).get('pages', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def is_current(self, filename: str, key: Optional[str]) -> bool:
+        """True when the page exists and was built from the same key"""
+        return (key is not None and self.manifest.get(filename) == key
+                and os.path.exists(os.path.join(self.output_dir, filename)))
+
+    def keep(self, filename: str, title: str, key: str, section: str = "Reports"):
+        """List an up-to-date page without building its figure"""
+        self.pages.append({'filename': filename, 'title': title, 'section': section,
+                           'build': None, 'args': None, 'key': key})
+
+    def add(self, filename: str, title: str, figure: Any, section: str = "Reports", key: Optional[str] = None):
+        """Queue an already-built figure; it is sent to the worker as a plain dict"""
+        if hasattr(figure, "to_dict"):
+            figure = figure.to_dict()
+        self.pages.append({'filename': filename, 'title': title, 'section': section,
+                           'build': None, 'args': (figure,), 'key': key})
+
+    def add_task(self, filename: str, title: str, build: Callable[..., Any], *args: Any, section: str = "Reports",
+                 key: Optional[str] = None):
+        """Queue a page whose figure is built in the worker by a module-level function"""
+        self.pages.append({'filename': filename, 'title': title, 'section': section,
+                           'build': build, 'args': args, 'key': key})
+
+    def build(self, index: bool = True) -> Dict[str, Any]:
+        """Render stale queued pages (in parallel when worthwhile), the manifest and the index page"""
+        started = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        bundle = write_plotly_bundle(self.output_dir)
+        stale = [page for page in self.pages
+                 if page['args'] is not None and not self.is_current(page['filename'], page['key'])]
+        jobs = [(os.path.join(self.output_dir, page['filename']), page['build'] or _identity, page['args'])
+                for page in stale]
+
+        workers = min(self.workers, len(jobs)) if len(jobs) >= MIN_PARALLEL_PAGES else 1
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                sizes = list(pool.map(_render_task, *zip(*jobs)))
+        else:
+            sizes = [_render_task(*job) for job in jobs]
+        stale_names = {page['filename'] for page in stale}
+        sizes += [os.path.getsize(os.path.join(self.output_dir, page['filename']))
+                  for page in self.pages if page['filename'] not in stale_names]
+
+        self.write_manifest()
+        if index:
+            self.write_index()
+        return {
+            'pages': len(self.pages),
+            'rebuilt': len(jobs),
+            'skipped': len(self.pages) - len(jobs),
+            'bytes': sum(sizes) + os.path.getsize(bundle),
+            'seconds': time.perf_counter() - started,
+            'workers': workers,
+        }
+
+    def write_manifest(self) -> str:
+        """Record the key of every keyed page so the next build can skip unchanged ones; entries for
+        pages this build didn't touch are kept"""
+        built = {page['filename'] for page in self.pages}
+        self.manifest = {filename: key for filename, key in self._stored_manifest.items() if filename not in built}
+        self.manifest.update((page['filename'], page['key']) for page in self.pages if page['key'] is not None)
+        self._stored_manifest = dict(self.manifest)
+        path = os.path.join(self.output_dir, MANIFEST_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'version': REPORT_VERSION, 'pages': self.manifest}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+        return path
+
+    def write_index(self) -> str:
+        """Index page linking every queued report, grouped by section"""
+        sections: Dict[str, List[Dict[str, Any]]] = {}
+        for page in self.pages:
+            sections.setdefault(page['section'], []).append(page)
+
+        parts = [f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(self.index_title)}</title>",
+                 "<style>body{font-family:sans-serif;max-width:60em;margin:2em auto}li{margin:.3em 0}</style>",
+                 f"</head><body>\n<h1>{html.escape(self.index_title)}</h1>"]
+        for section, pages in sections.items():
+            parts.append(f"<h2>{html.escape(section)}</h2>\n<ul>")
+            for page in pages:
+                parts.append(f"<li><a href=\"{html.escape(page['filename'])}\">{html.escape(page['title'])}</a></li>")
+            parts.append("</ul>")
+        parts.append(f"<p>Generated {time.strftime('%Y-%m-%d %H:%M:%S')}</p>\n</body></html>\n")
+
+        path = os.path.join(self.output_dir, INDEX_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(parts))
+        return path
+
+
+def _identity(figure: Any) -> Any:
+    return figure
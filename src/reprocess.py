@@ -0,0 +1,154 @@
+"""
+Re-categorize, re-classify competition and re-score a whole results archive in parallel
+
+The results file is streamed in chunks (never loaded whole). Each chunk goes
+to a process pool, which re-derives category and competition_level from the
+keyword engine (what categorize_term and analyze_competition_level use),
+keyword scores from each scrape's seed and suggestions, and
+opportunity_score and recommendation from the scoring weights. Chunks are
+written back in input order, with every other column left exactly as
+stored. A chunk never splits one scrape of a seed (rows sharing
+timestamp_utc and seed), so keyword scores see all of a seed's suggestions.
+
+Usage:
+    python -m src.reprocess etsy_market_research.csv -o reprocessed.csv --workers 4
+"""
+import argparse
+import csv
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .keyword_engine import get_keyword_engine
+from .scoring import ScoringWeights, get_scoring_weights, keyword_scores_by_seed, score_frame
+
+CHUNK_ROWS = 50_000
+GROUP_COLUMNS = ['timestamp_utc', 'seed']
+NUMERIC_COLUMNS = ['listing_count', 'trend_score', 'avg_price']
+# Chunks queued per worker; bounds memory while keeping every worker busy
+PREFETCH = 2
+
+
+def reprocess_frame(frame: pd.DataFrame, weights: Optional[ScoringWeights] = None) -> pd.DataFrame:
+    """Recompute the derived columns of a string-typed results chunk; other columns are untouched"""
+    engine = get_keyword_engine()
+    seeds = frame['seed'].astype(str)
+    distinct = seeds.unique()
+    classified = engine.classify_many(list(distinct))
+    frame['category'] = seeds.map(dict(zip(distinct, (c.category for c in classified))))
+    frame['competition_level'] = seeds.map(dict(zip(distinct, (c.competition_level for c in classified))))
+
+    numeric = frame[NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce')
+    scoring_input = frame[['timestamp_utc', 'seed', 'suggestion', 'trend_direction', 'price_range']].assign(**numeric)
+    scoring_input['keyword_score'] = keyword_scores_by_seed(scoring_input)
+    scored = score_frame(scoring_input, weights)
+    frame['opportunity_score'] = scored['opportunity_score'].map(repr)
+    frame['recommendation'] = scored['recommendation']
+    return frame
+
+
+def _process_chunk(frame: pd.DataFrame, weights: ScoringWeights, lineterminator: str) -> Tuple[str, int, float]:
+    """Worker: reprocess one chunk and render it as CSV text (without header)"""
+    started = time.process_time()
+    reprocess_frame(frame, weights)
+    # Every column is a string by now; csv.writer over row tuples beats DataFrame.to_csv here
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator=lineterminator).writerows(zip(*(frame[column].tolist() for column in frame)))
+    return buffer.getvalue(), len(frame), time.process_time() - started
+
+
+def read_seed_chunks(csv_file: str, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Chunks of the file as strings, cut only between scrapes of a seed"""
+    carry = None
+    reader = pd.read_csv(csv_file, dtype=str, keep_default_na=False, chunksize=chunksize)
+    for chunk in reader:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        # Hold back the last scrape, which may continue in the next chunk
+        keys = chunk[GROUP_COLUMNS]
+        last = (keys == keys.iloc[-1]).all(axis=1).to_numpy()
+        cut = len(chunk) - int(last[::-1].argmin() if not last.all() else len(chunk))
+        carry = chunk.iloc[cut:]
+        if cut:
+            yield chunk.iloc[:cut].reset_index(drop=True)
+    if carry is not None and len(carry):
+        yield carry.reset_index(drop=True)
+
+
+def reprocess_csv(csv_file: str, output_file: str, workers: Optional[int] = None,
+                  weights: Optional[ScoringWeights] = None, chunksize: int = CHUNK_ROWS) -> Dict[str, Any]:
+    """Reprocess a results file into output_file (which may be the input); returns throughput stats"""
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    weights = weights or get_scoring_weights()
+    with open(csv_file, 'rb') as f:
+        header = f.readline()
+    lineterminator = '\r\n' if header.endswith(b'\r\n') else '\n'
+    tmp_path = output_file + ".tmp"
+
+    totals = {'rows': 0, 'cpu_seconds': 0.0}
+    with open(tmp_path, 'wb') as out:
+        out.write(header)
+
+        def write(result: Tuple[str, int, float]):
+            text, rows, cpu_seconds = result
+            out.write(text.encode('utf-8'))
+            totals['rows'] += rows
+            totals['cpu_seconds'] += cpu_seconds
+
+        chunks = read_seed_chunks(csv_file, chunksize)
+        if workers == 1:
+            for chunk in chunks:
+                write(_process_chunk(chunk, weights, lineterminator))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Submit ahead in input order and write each result when its turn comes
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_process_chunk, chunk, weights, lineterminator))
+                    if len(pending) >= workers * PREFETCH:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    os.replace(tmp_path, output_file)
+
+    seconds = time.perf_counter() - started
+    rows, cpu_seconds = totals['rows'], totals['cpu_seconds']
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'workers': workers,
+        'rows_per_second': rows / seconds if seconds else 0.0,
+        'rows_per_second_per_core': rows / seconds / workers if seconds else 0.0,
+        'rows_per_cpu_second': rows / cpu_seconds if cpu_seconds else 0.0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Re-categorize and re-score a results archive with the current rules, in parallel")
+    parser.add_argument("csv_file", help="Results CSV")
+    parser.add_argument("-o", "--output", help="Output CSV (default: overwrite input)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help="Rows per chunk sent to a worker")
+    parser.add_argument("--config", help="Alternative config.yaml with scoring weights")
+    args = parser.parse_args(argv)
+
+    cfg = None
+    if args.config:
+        from .config import Config
+        cfg = Config(args.config)
+    output = args.output or args.csv_file
+    stats = reprocess_csv(args.csv_file, output, args.workers, ScoringWeights.from_config(cfg), args.chunksize)
+    print(f"✅ Reprocessed {stats['rows']:,} rows in {stats['seconds']:.1f}s with {stats['workers']} workers → {output}")
+    print(f"⚡ {stats['rows_per_second']:,.0f} rows/s ({stats['rows_per_second_per_core']:,.0f} rows/s per core, "
+          f"{stats['rows_per_cpu_second']:,.0f} rows per worker CPU-second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Vectorized opportunity scoring driven by the scoring weights in config.yaml
+
+Usage:
+    python -m src.scoring etsy_market_research.csv -o rescored.csv
+"""
+import argparse
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .keyword_engine import get_keyword_engine
+
+PERFECT = "🔥 PERFECT OPPORTUNITY - Low Competition + Growing Trend"
+HIGH_GROWING = "🔥 HIGH OPPORTUNITY - Growing Trend"
+HIGH = "🔥 HIGH OPPORTUNITY - Research Further"
+GOOD_GROWING = "✅ GOOD OPPORTUNITY - Growing Trend"
+GOOD = "✅ GOOD OPPORTUNITY - Consider"
+MODERATE = "⚠️ MODERATE - Check Competition"
+AVOID = "❌ HIGH COMPETITION - Avoid"
+
+
+class ScoringWeights:
+    """Opportunity scoring weights and recommendation thresholds"""
+
+    def __init__(self,
+                 keyword_weight: float = 1.0,
+                 competition_weights: Optional[Dict[str, float]] = None,
+                 trend_weight: float = 0.05,
+                 direction_bonus: Optional[Dict[str, float]] = None,
+                 price_weight: float = 2.0,
+                 price_scale: float = 5.0,
+                 dispersion_bonus: float = 1.0,
+                 thresholds: Optional[Dict[str, float]] = None,
+                 low_threshold: int = 1000,
+                 moderate_threshold: int = 10000):
+        self.keyword_weight = keyword_weight
+        self.competition_weights = competition_weights or {'low': 3.0, 'moderate': 1.0, 'high': -2.0}
+        self.trend_weight = trend_weight
+        self.direction_bonus = direction_bonus or {'growing': 1.5, 'stable': 0.0, 'declining': -1.0}
+        self.price_weight = price_weight
+        self.price_scale = price_scale
+        self.dispersion_bonus = dispersion_bonus
+        self.thresholds = {'high': 5.0, 'good': 2.0, 'moderate': 0.0, **(thresholds or {})}
+        self.low_threshold = low_threshold
+        self.moderate_threshold = moderate_threshold
+
+    @classmethod
+    def from_config(cls, cfg: Any = None) -> 'ScoringWeights':
+        """Build weights from the `scoring` and `competition` config sections"""
+        if cfg is None:
+            from .config import config as cfg
+        scoring = cfg.get('scoring', {}) or {}
+        competition = cfg.get_competition_config()
+        keys = ('keyword_weight', 'competition_weights', 'trend_weight', 'direction_bonus',
+                'price_weight', 'price_scale', 'dispersion_bonus', 'thresholds')
+        return cls(
+            low_threshold=competition.get('low_threshold', 1000),
+            moderate_threshold=competition.get('moderate_threshold', 10000),
+            **{key: scoring[key] for key in keys if key in scoring}
+        )
+
+
+_default_weights: Optional[ScoringWeights] = None
+
+
+def get_scoring_weights() -> ScoringWeights:
+    """Return weights loaded once from config.yaml"""
+    global _default_weights
+    if _default_weights is None:
+        _default_weights = ScoringWeights.from_config()
+    return _default_weights
+
+
+def market_competition(listing_count: Any, weights: ScoringWeights) -> np.ndarray:
+    """Competition level from listing counts ("unknown" where no count was found)"""
+    counts = np.nan_to_num(np.asarray(listing_count, dtype=float))
+    return np.select(
+        [counts <= 0, counts < weights.low_threshold, counts < weights.moderate_threshold],
+        ['unknown', 'low', 'moderate'],
+        'high'
+    ).astype(object)
+
+
+def compute_scores(keyword_score: Any, listing_count: Any, trend_score: Any, trend_direction: Any,
+                   avg_price: Any, min_price: Any, max_price: Any,
+                   weights: Optional[ScoringWeights] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score whole arrays of seeds at once
+
+    Returns (opportunity_score, recommendation, market_competition) arrays.
+    """
+    weights = weights or get_scoring_weights()
+    keyword_score = np.nan_to_num(np.asarray(keyword_score, dtype=float))
+    trend_score = np.nan_to_num(np.asarray(trend_score, dtype=float))
+    direction = np.asarray(trend_direction, dtype=object)
+    avg_price = np.nan_to_num(np.asarray(avg_price, dtype=float))
+    spread = np.nan_to_num(np.asarray(max_price, dtype=float) - np.asarray(min_price, dtype=float))
+
+    level = market_competition(listing_count, weights)
+    competition = np.zeros(level.shape)
+    for name, weight in weights.competition_weights.items():
+        competition[level == name] = weight
+
+    direction_component = np.zeros(direction.shape)
+    for name, bonus in weights.direction_bonus.items():
+        direction_component[direction == name] = bonus
+
+    priced = avg_price > 0
+    price_component = np.where(
+        priced, np.minimum(weights.price_weight, np.sqrt(np.clip(avg_price, 0, None)) / weights.price_scale), 0.0
+    )
+    dispersion = np.divide(spread, avg_price, out=np.zeros_like(avg_price), where=priced)
+    dispersion_component = weights.dispersion_bonus * np.clip(dispersion, 0.0, 1.0)
+
+    score = (weights.keyword_weight * keyword_score + competition + weights.trend_weight * trend_score
+             + direction_component + price_component + dispersion_component)
+
+    thresholds = weights.thresholds
+    growing = direction == 'growing'
+    recommendation = np.select(
+        [
+            (score >= thresholds['high']) & growing & (level == 'low'),
+            (score >= thresholds['high']) & growing,
+            score >= thresholds['high'],
+            (score >= thresholds['good']) & growing,
+            score >= thresholds['good'],
+            score >= thresholds['moderate'],
+        ],
+        [PERFECT, HIGH_GROWING, HIGH, GOOD_GROWING, GOOD, MODERATE],
+        AVOID
+    ).astype(object)
+    return score, recommendation, level
+
+
+def score_seed(keyword_score: float, market_data: Any, trends_data: Dict[str, Any],
+               weights: Optional[ScoringWeights] = None) -> Tuple[float, str]:
+    """Score a single scraped seed from a records.MarketData (or the equivalent dict);
+    returns (opportunity_score, recommendation)"""
+    if isinstance(market_data, Mapping):
+        listing_count = market_data['listing_count']
+        price_range = market_data['price_range']
+        avg_price, min_price, max_price = price_range['avg'], price_range['min'], price_range['max']
+    else:
+        listing_count = market_data.listing_count
+        avg_price, min_price, max_price = market_data.avg_price, market_data.min_price, market_data.max_price
+    score, recommendation, _ = compute_scores(
+        [keyword_score], [listing_count], [trends_data['trend_score']], [trends_data['trend_direction']],
+        [avg_price], [min_price], [max_price], weights
+    )
+    return float(score[0]), str(recommendation[0])
+
+
+def parse_price_ranges(price_range: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Split "$min-$max" strings into numeric min and max columns"""
+    # Every suggestion row of a seed repeats the same range, so parse each distinct value once
+    codes, uniques = pd.factorize(price_range.astype(str))
+    parts = pd.Series(uniques).str.extract(r'\$?([\d.]+)\s*-\s*\$?([\d.]+)')
+    bounds = parts.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    bounds = np.vstack([bounds, [np.nan, np.nan]])  # code -1 (missing) maps to the NaN row
+    return (pd.Series(bounds[codes, 0], index=price_range.index),
+            pd.Series(bounds[codes, 1], index=price_range.index))
+
+
+def keyword_scores_by_seed(frame: pd.DataFrame) -> pd.Series:
+    """Recompute keyword scores for each scrape of a seed from its stored suggestions"""
+    engine = get_keyword_engine()
+    keys = ['timestamp_utc', 'seed'] if 'timestamp_utc' in frame.columns else ['seed']
+    codes = frame.groupby(keys, sort=False, dropna=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    seeds = frame['seed'].fillna('').astype(str).to_numpy()
+    suggestions = frame['suggestion'].fillna('').astype(str).to_numpy()
+
+    scores = np.empty(len(frame))
+    cache: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+    for rows in np.split(order, bounds):
+        if not len(rows):
+            continue
+        # Unchanged pages give identical seed/suggestion groups across runs
+        key = (seeds[rows[0]], tuple(suggestions[rows]))
+        if key not in cache:
+            cache[key] = engine.keyword_score(key[0], key[1])
+        scores[rows] = cache[key]
+    return pd.Series(scores, index=frame.index, name='keyword_score')
+
+
+def score_frame(frame: pd.DataFrame, weights: Optional[ScoringWeights] = None) -> pd.DataFrame:
+    """Re-score a results frame (output CSV schema) with the given weights
+
+    Keyword scores are taken from a `keyword_score` column if present, otherwise
+    recomputed from each seed's suggestions.
+    """
+    frame = frame.copy()
+    if 'keyword_score' in frame.columns:
+        keyword_score = frame['keyword_score']
+    else:
+        keyword_score = keyword_scores_by_seed(frame)
+
+    if 'min_price' in frame.columns and 'max_price' in frame.columns:
+        min_price, max_price = frame['min_price'], frame['max_price']
+    else:
+        min_price, max_price = parse_price_ranges(frame['price_range'])
+
+    score, recommendation, _ = compute_scores(
+        keyword_score, frame['listing_count'], frame['trend_score'], frame['trend_direction'],
+        frame['avg_price'], min_price, max_price, weights
+    )
+    frame['opportunity_score'] = score
+    frame['recommendation'] = recommendation
+    return frame
+
+
+def rescore_csv(csv_file: str, output_file: str, weights: Optional[ScoringWeights] = None) -> Dict[str, Any]:
+    """Re-score a saved results file without re-scraping"""
+    started = time.perf_counter()
+    frame = pd.read_csv(csv_file)
+    scored = score_frame(frame, weights)
+    scored.to_csv(output_file, index=False)
+    return {
+        'rows': len(scored),
+        'seconds': time.perf_counter() - started,
+        'recommendations': scored['recommendation'].value_counts().to_dict()
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-score saved results with the configured weights")
+    parser.add_argument("csv_file", help="Results CSV to re-score")
+    parser.add_argument("-o", "--output", help="Output CSV (default: overwrite input)")
+    parser.add_argument("--config", help="Alternative config.yaml with scoring weights")
+    args = parser.parse_args(argv)
+
+    cfg = None
+    if args.config:
+        from .config import Config
+        cfg = Config(args.config)
+    stats = rescore_csv(args.csv_file, args.output or args.csv_file, ScoringWeights.from_config(cfg))
+
+    print(f"✅ Re-scored {stats['rows']} rows in {stats['seconds']:.2f}s → {args.output or args.csv_file}")
+    for recommendation, count in stats['recommendations'].items():
+        print(f"   {recommendation}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Streaming seed sources for the Etsy scraper
+
+Seeds are read lazily from text files, CSV files, stdin or SQLite tables and
+pass through sharding, dedup and resume filters one at a time, so seed lists
+of any size never have to be loaded into memory. Only a 64-bit key per
+distinct seed of the current shard is kept (about 70 bytes each), and
+processed seeds are recorded in an append-only `ProcessedSeedLog`.
+
+Source specs:
+    builtin                     the SEEDS list in etsy_autocomplete.py
+    seeds.txt                   one seed per line (# comments allowed)
+    seeds.csv                   `seed` column, or the first column
+    -                           stdin, one seed per line
+    sqlite:terms.db             table `seeds`, column `seed`
+    sqlite:terms.db:table:col   explicit table and column
+"""
+import csv
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Set, TextIO, Tuple
+
+from .suggestion_filter import normalize_suggestion
+
+
+def iter_text_seeds(path: str) -> Iterator[str]:
+    """Yield seeds from a text file, one per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_lines(f)
+
+
+def iter_lines(stream: TextIO) -> Iterator[str]:
+    """Yield non-empty, non-comment lines from a text stream"""
+    for line in stream:
+        seed = line.strip()
+        if seed and not seed.startswith('#'):
+            yield seed
+
+
+def iter_csv_seeds(path: str, column: str = 'seed') -> Iterator[str]:
+    """Yield seeds from a CSV column (the first column if `column` is missing)"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        index = header.index(column) if column in header else 0
+        for row in reader:
+            if len(row) > index and row[index].strip():
+                yield row[index].strip()
+
+
+def iter_stdin_seeds(stream: Optional[TextIO] = None) -> Iterator[str]:
+    """Yield seeds from stdin, one per line"""
+    yield from iter_lines(stream or sys.stdin)
+
+
+def iter_sqlite_seeds(path: str, table: str = 'seeds', column: str = 'seed',
+                      batch_size: int = 1000) -> Iterator[str]:
+    """Yield seeds from a SQLite table in batches"""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(
+            f"SELECT {quote_identifier(column)} FROM {quote_identifier(table)} ORDER BY rowid"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for (value,) in rows:
+                if value is not None and str(value).strip():
+                    yield str(value).strip()
+    finally:
+        connection.close()
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a SQLite identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def open_seed_source(spec: str, builtin: Sequence[str] = ()) -> Iterator[str]:
+    """Return a lazy iterator over the seeds described by a source spec"""
+    if spec == 'builtin':
+        return iter(builtin)
+    if spec == '-':
+        return iter_stdin_seeds()
+    if spec.startswith('sqlite:'):
+        path, _, rest = spec[len('sqlite:'):].partition(':')
+        table, _, column = rest.partition(':')
+        return iter_sqlite_seeds(path, table or 'seeds', column or 'seed')
+    if spec.lower().endswith('.csv'):
+        return iter_csv_seeds(spec)
+    return iter_text_seeds(spec)
+
+
+def seed_key(seed: str) -> int:
+    """Stable 64-bit key of a normalized seed, used for dedup and sharding"""
+    digest = hashlib.blake2b(normalize_suggestion(seed).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an "I/N" shard spec (1-based) into a zero-based (index, count) pair"""
+    index, _, count = spec.partition('/')
+    index, count = int(index), int(count)
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard '{spec}', expected I/N with 1 <= I <= N")
+    return index - 1, count
+
+
+def seed_stream(sources: Iterable[Iterable[str]],
+                shard: Tuple[int, int] = (0, 1),
+                skip: Optional[Iterable[int]] = None) -> Iterator[str]:
+    """Chain seed sources, dropping other shards' seeds, duplicates and seeds whose key is in `skip`
+
+    Shard assignment depends only on the normalized seed, so every worker
+    agrees on it and duplicates always land in the same shard; only this
+    shard's keys are remembered. Memory grows by one 64-bit key (not the seed
+    text) per distinct seed of the shard. `skip` holds `seed_key` values of
+    already processed seeds and starts the dedup set, so it costs nothing extra.
+    """
+    shard_index, shard_count = shard
+    seen: Set[int] = set(skip or ())
+    del skip  # keep only the copy
+    for seed in chain.from_iterable(sources):
+        key = seed_key(seed)
+        if key % shard_count != shard_index or key in seen:
+            continue
+        seen.add(key)
+        yield seed
+
+
+class ProcessedSeedLog:
+    """Append-only log of processed seeds, one hex `seed_key` per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def keys(self) -> Set[int]:
+        """Keys of every logged seed (a torn last line from a crash is ignored)"""
+        keys: Set[int] = set()
+        try:
+            with open(self.path, 'r', encoding='ascii') as f:
+                for line in f:
+                    if len(line) == 17 and line.endswith('\n'):
+                        keys.add(int(line[:16], 16))
+        except FileNotFoundError:
+            pass
+        return keys
+
+    def append(self, seed: str):
+        """Record one processed seed"""
+        with open(self.path, 'a', encoding='ascii') as f:
+            f.write(f"{seed_key(seed):016x}\n")
+
+    def clear(self):
+        """Forget every processed seed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SeedProgress:
+    """Progress reporting for a seed stream of unknown length"""
+
+    def __init__(self, report: Callable[[str], None], every_seeds: int = 25, every_seconds: float = 60.0):
+        self.report = report
+        self.every_seeds = every_seeds
+        self.every_seconds = every_seconds
+        self.count = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    def step(self):
+        """Record one processed seed and report if due"""
+        self.count += 1
+        now = time.monotonic()
+        if self.count % self.every_seeds == 0 or now - self._last_report >= self.every_seconds:
+            self._last_report = now
+            self.report(self.summary())
+
+    @property
+    def rate(self) -> float:
+        """Seeds processed per second"""
+        elapsed = time.monotonic() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Human-readable progress line"""
+        elapsed = time.monotonic() - self.started
+        return f"📈 {self.count} seeds processed in {elapsed / 60:.1f} min ({self.rate * 60:.1f} seeds/min)"
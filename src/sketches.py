@@ -0,0 +1,384 @@
+"""
+Mergeable approximate sketches for summaries of very large result histories
+
+`ResultsSketch` keeps, in a fixed amount of memory regardless of history size:
+
+- HyperLogLog unique counts of seeds and suggestions. With the default
+  precision (p=14, 16 KB each) the standard error is 1.04 / sqrt(2**14),
+  about 0.8%, so estimates are within ~1.6% of the true count 95% of the time.
+- A Count-Min sketch of suggestion frequencies (width 8192, depth 5,
+  320 KB). An estimate never undercounts and overcounts by at most
+  e / width * N (about 0.03% of all rows) with probability 1 - e**-5 (99.3%);
+  conservative updates keep the typical overcount far below that bound.
+- A heavy-hitters list: the `capacity` suggestions with the highest
+  Count-Min estimates, re-ranked as rows arrive. Any term more frequent
+  than the smallest tracked estimate is in the list.
+- Exact counts of categories and competition levels (low cardinality).
+
+The scraper updates the sketch as it writes rows and saves it next to the
+results file; sketches of different runs or shards merge exactly as if
+they had seen all rows.
+"""
+import base64
+import json
+import math
+import os
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 14
+CMS_WIDTH = 8192
+CMS_DEPTH = 5
+HEAVY_HITTERS = 100
+SKETCH_COLUMNS = ('seed', 'suggestion', 'competition_level', 'category')
+
+
+def hash_values(values: Iterable[Any]) -> np.ndarray:
+    """Stable 64-bit hashes of string values (the same in every process)"""
+    if not isinstance(values, (np.ndarray, pd.Series, pd.Index, pd.Categorical)):
+        values = list(values)
+    return pd.util.hash_array(np.asarray(values, dtype=object), categorize=False)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of each uint64"""
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        lengths[high] += shift
+        values[high] >>= np.uint64(shift)
+    return lengths + (values > 0)
+
+
+def _sigma(x: float) -> float:
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+def _encode(array: np.ndarray) -> str:
+    return base64.b64encode(zlib.compress(array.tobytes())).decode('ascii')
+
+
+def _decode(text: str, dtype, shape) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=dtype).reshape(shape).copy()
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2**precision one-byte registers"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> 'HyperLogLog':
+        """Add hashed values"""
+        if len(hashes):
+            shift = np.uint64(64 - self.precision)
+            index = (hashes >> shift).astype(np.int64)
+            rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+            rank = (64 - self.precision + 1 - _bit_length(rest)).astype(np.uint8)
+            np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog precision {other.precision} into {self.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> int:
+        """Ertl's improved estimator, unbiased from empty to very large sets without correction tables"""
+        m = len(self.registers)
+        q = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=q + 2)
+        if histogram[0] == m:
+            return 0
+        z = m * _tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return int(round(m * m / (2 * math.log(2) * z)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'precision': self.precision, 'registers': _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = _decode(data['registers'], np.uint8, (1 << sketch.precision,))
+        return sketch
+
+
+class CountMinSketch:
+    """Frequency estimates that never undercount, in depth x width counters"""
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.counts = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Column of each hash in every row (double hashing)"""
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = hashes >> np.uint64(32)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def update(self, hashes: np.ndarray, counts: Optional[np.ndarray] = None) -> 'CountMinSketch':
+        """Add hashed values, each `counts` times (default once)
+
+        Conservative update: each counter is only raised as far as the new
+        estimate of the values it holds requires, which keeps the upper
+        bound but overcounts far less than adding to every counter.
+        """
+        if len(hashes):
+            counts = np.ones(len(hashes), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+            hashes, inverse = np.unique(hashes, return_inverse=True)
+            counts = np.bincount(inverse, weights=counts, minlength=len(hashes)).astype(np.int64)
+            columns = self._columns(hashes)
+            target = self.counts[np.arange(self.depth)[:, None], columns].min(axis=0) + counts
+            for row in range(self.depth):
+                np.maximum.at(self.counts[row], columns[row], target)
+            self.total += int(counts.sum())
+        return self
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        if not len(hashes):
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(hashes)
+        return self.counts[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f"Cannot merge Count-Min {other.depth}x{other.width} into {self.depth}x{self.width}")
+        self.counts += other.counts
+        self.total += other.total
+        return self
+
+    @property
+    def error_bound(self) -> float:
+        """Maximum overcount as a fraction of all rows, with probability 1 - e**-depth"""
+        return math.e / self.width
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'width': self.width, 'depth': self.depth, 'total': self.total, 'counts': _encode(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'CountMinSketch':
+        sketch = cls(data['width'], data['depth'])
+        sketch.counts = _decode(data['counts'], np.int64, (sketch.depth, sketch.width))
+        sketch.total = data['total']
+        return sketch
+
+
+class HeavyHitters:
+    """Most frequent terms, tracked as Count-Min estimates for a bounded candidate set"""
+
+    def __init__(self, capacity: int = HEAVY_HITTERS, width: int = CMS_WIDTH, depth: int = CMS_DEPTH):
+        self.capacity = capacity
+        self.cms = CountMinSketch(width, depth)
+        self.candidates: Dict[str, int] = {}
+
+    def _rerank(self, terms: List[str]):
+        """Re-estimate the candidates plus new terms and keep the top `capacity`"""
+        pool = list(dict.fromkeys(list(self.candidates) + terms))
+        estimates = self.cms.estimate(hash_values(pool))
+        keep = np.argsort(-estimates, kind='stable')[:self.capacity]
+        self.candidates = {pool[i]: int(estimates[i]) for i in keep}
+
+    def update_counts(self, counts: Mapping[str, int]) -> 'HeavyHitters':
+        """Add term -> occurrences"""
+        if counts:
+            terms = list(counts)
+            self.cms.update(hash_values(terms), np.fromiter(counts.values(), dtype=np.int64, count=len(terms)))
+            self._rerank(terms)
+        return self
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        self.cms.merge(other.cms)
+        self._rerank(list(other.candidates))
+        return self
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """(term, estimated count), most frequent first"""
+        return sorted(self.candidates.items(), key=lambda item: -item[1])[:n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'capacity': self.capacity, 'cms': self.cms.to_dict(), 'candidates': self.candidates}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'HeavyHitters':
+        sketch = cls(data['capacity'])
+        sketch.cms = CountMinSketch.from_dict(data['cms'])
+        sketch.candidates = dict(data['candidates'])
+        return sketch
+
+
+def sketch_path_for(results_path: str) -> str:
+    """Return the sketch file path that sits next to a results file"""
+    path = Path(results_path)
+    return str(path.with_name(f"{path.stem}.sketch.json"))
+
+
+class ResultsSketch:
+    """Bounded-memory summary of a results history, updated as rows are written"""
+
+    VERSION = 1
+
+    def __init__(self):
+        self.rows = 0
+        self.seeds = HyperLogLog()
+        self.suggestions = HyperLogLog()
+        self.terms = HeavyHitters()
+        self.categories: Counter = Counter()
+        self.competition: Counter = Counter()
+        self.source_bytes = 0
+
+    def update_rows(self, rows: List[Any]) -> 'ResultsSketch':
+        """Fold result rows (records.ResultRow tuples or dicts keyed by column) into the sketch"""
+        if rows and isinstance(rows[0], Mapping):
+            columns = [(row.get('seed'), row.get('suggestion'), row.get('category'), row.get('competition_level'))
+                       for row in rows]
+        else:
+            columns = [(row.seed, row.suggestion, row.category, row.competition_level) for row in rows]
+        columns = [column for column in columns if column[1]]
+        if not columns:
+            return self
+        seeds, suggestions, categories, competition = zip(*columns)
+        self.rows += len(suggestions)
+        self.seeds.update(hash_values(set(seeds)))
+        self.suggestions.update(hash_values(set(suggestions)))
+        self.terms.update_counts(Counter(suggestions))
+        self.categories.update(category for category in categories if category)
+        self.competition.update(level for level in competition if level)
+        return self
+
+    def update_frame(self, frame: pd.DataFrame) -> 'ResultsSketch':
+        """Fold a results frame or chunk into the sketch"""
+        frame = frame[frame['suggestion'].notna()]
+        if frame.empty:
+            return self
+        self.rows += len(frame)
+        self.seeds.update(hash_values(frame['seed'].dropna().unique()))
+        self.suggestions.update(hash_values(frame['suggestion'].unique()))
+        self.terms.update_counts(frame['suggestion'].value_counts().to_dict())
+        for column, counter in (('category', self.categories), ('competition_level', self.competition)):
+            counter.update({value: int(count) for value, count in frame[column].value_counts().items() if count})
+        return self
+
+    def merge(self, other: 'ResultsSketch') -> 'ResultsSketch':
+        """Combine with the sketch of another run or shard"""
+        self.rows += other.rows
+        self.seeds.merge(other.seeds)
+        self.suggestions.merge(other.suggestions)
+        self.terms.merge(other.terms)
+        self.categories.update(other.categories)
+        self.competition.update(other.competition)
+        return self
+
+    def unique_seeds(self) -> int:
+        return self.seeds.estimate()
+
+    def unique_suggestions(self) -> int:
+        return self.suggestions.estimate()
+
+    def top_terms(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.terms.top(n)
+
+    def error_bounds(self) -> Dict[str, float]:
+        """Documented error of each approximate figure, as a fraction"""
+        return {'unique_counts': self.seeds.relative_error, 'term_counts': self.terms.cms.error_bound}
+
+    def save(self, path: str):
+        data = {
+            'version': self.VERSION,
+            'rows': self.rows,
+            'source_bytes': self.source_bytes,
+            'seeds': self.seeds.to_dict(),
+            'suggestions': self.suggestions.to_dict(),
+            'terms': self.terms.to_dict(),
+            'categories': dict(self.categories),
+            'competition': dict(self.competition),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['ResultsSketch']:
+        """Saved sketch, or None when missing, unreadable or from another version"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION:
+                return None
+            sketch = cls()
+            sketch.rows = data['rows']
+            sketch.source_bytes = data['source_bytes']
+            sketch.seeds = HyperLogLog.from_dict(data['seeds'])
+            sketch.suggestions = HyperLogLog.from_dict(data['suggestions'])
+            sketch.terms = HeavyHitters.from_dict(data['terms'])
+            sketch.categories = Counter(data['categories'])
+            sketch.competition = Counter(data['competition'])
+            return sketch
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
+
+
+def build_sketch(csv_file: str, chunksize: Optional[int] = None) -> ResultsSketch:
+    """Sketch a results file chunk by chunk"""
+    from .data_loader import CHUNK_ROWS, available_columns, read_chunks
+
+    sketch = ResultsSketch()
+    columns = available_columns(csv_file, SKETCH_COLUMNS)
+    for chunk in read_chunks(csv_file, columns, chunksize or CHUNK_ROWS):
+        sketch.update_frame(chunk)
+    sketch.source_bytes = os.path.getsize(csv_file)
+    return sketch
+
+
+def load_or_build_sketch(csv_file: str, path: Optional[str] = None) -> Tuple[ResultsSketch, bool]:
+    """The saved sketch if it covers the whole results file, else a rebuilt (and saved) one;
+    the flag says whether the saved sketch was used"""
+    path = path or sketch_path_for(csv_file)
+    sketch = ResultsSketch.load(path)
+    if sketch is not None and sketch.source_bytes == os.path.getsize(csv_file):
+        return sketch, True
+    sketch = build_sketch(csv_file)
+    try:
+        sketch.save(path)
+    except OSError:
+        pass  # read-only location: use it unsaved
+    return sketch, False
@@ -0,0 +1,100 @@
+"""
+Suggestion filtering and deduplication for scraped related terms
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Set
+
+from .keyword_engine import trie_pattern
+
+# Navigation and non-relevant terms (matched as substrings, like the original scrape loop)
+SKIP_TERMS = [
+    'home', 'shop', 'cart', 'account', 'help', 'sign', 'login', 'register',
+    'more like this', 'all filters', 'special offers', 'free shipping', 'on sale',
+    'personalizable', 'price', 'enter minimum', 'enter maximum', 'apply',
+    'sort by', 'relevance', 'newest', 'price low', 'price high'
+]
+
+# Search-filter facet labels Etsy renders in front of their glued-together options,
+# e.g. "Item formatAllPhysical itemsDigital downloads" or "FramingUnframedFramed"
+FACET_LABELS = [
+    'Item format', 'Item type', 'Color', 'Colour', 'Primary color', 'Subject', 'Framing',
+    'Size', 'Material', 'Orientation', 'Style', 'Occasion', 'Holiday', 'Room',
+    'Shop location', 'Ready to dispatch', 'Delivery', 'Shipping', 'Craft type'
+]
+
+_FACET_LABEL_PATTERN = re.compile(
+    r'^(?:' + '|'.join(re.escape(label) for label in sorted(FACET_LABELS, key=len, reverse=True)) + r')(?=[A-Z])'
+)
+# Widget text that only shows up in filter panels
+FACET_MARKERS = ('Show more', 'Show less', 'Applied filters', '\n', '\r')
+# Words glued together without spaces ("BlueYellowWhite"); two joins within one word rule out
+# names like "iPhone", even when several of them appear ("iPhone iPad case")
+_GLUED_WORDS_PATTERN = re.compile(r'\b\w*[a-z][A-Z]\w*[a-z][A-Z]\w*\b')
+
+
+def compile_skip_pattern(skip_terms: Iterable[str]) -> Optional['re.Pattern']:
+    """Compile skip terms into one lowercase substring matcher"""
+    return _compile_skip_pattern(frozenset(term.lower() for term in skip_terms if term))
+
+
+@lru_cache(maxsize=32)
+def _compile_skip_pattern(terms: FrozenSet[str]) -> Optional['re.Pattern']:
+    if not terms:
+        return None
+    return re.compile(trie_pattern(terms))
+
+
+def normalize_suggestion(text: str) -> str:
+    """Normalize suggestion text for deduplication"""
+    return ' '.join(text.split()).casefold()
+
+
+def is_facet_string(text: str) -> bool:
+    """Return True if text looks like a search-filter facet rather than a search term"""
+    if any(marker in text for marker in FACET_MARKERS):
+        return True
+    # Facet labels and glued words both need capitals; most real suggestions are lowercase
+    if text.islower():
+        return False
+    return bool(_FACET_LABEL_PATTERN.match(text) or _GLUED_WORDS_PATTERN.search(text))
+
+
+class SuggestionFilter:
+    """Linear-time filter that drops navigation text, facet junk and duplicates
+
+    Duplicates are detected on normalized text (case and whitespace folded), so
+    the first spelling seen is kept. The filter is stateful: call reset() before
+    reusing it for another seed.
+    """
+
+    def __init__(self, skip_terms: Iterable[str] = SKIP_TERMS,
+                 min_length: int = 4, max_length: int = 99,
+                 drop_facets: bool = True):
+        self.skip_pattern = compile_skip_pattern(skip_terms)
+        self.min_length = min_length
+        self.max_length = max_length
+        self.drop_facets = drop_facets
+        self._seen: Set[str] = set()
+
+    def reset(self):
+        """Forget previously accepted suggestions"""
+        self._seen.clear()
+
+    def accept(self, text: str) -> bool:
+        """Return True if text should be kept, recording it as seen"""
+        if not text or not self.min_length <= len(text) <= self.max_length:
+            return False
+        key = normalize_suggestion(text)
+        if key in self._seen:
+            return False
+        if self.skip_pattern is not None and self.skip_pattern.search(key):
+            return False
+        if self.drop_facets and is_facet_string(text):
+            return False
+        self._seen.add(key)
+        return True
+
+    def filter(self, texts: Iterable[str]) -> List[str]:
+        """Return the accepted suggestions in their original order"""
+        return [text for text in texts if self.accept(text)]
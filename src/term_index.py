@@ -0,0 +1,340 @@
+"""
+On-disk inverted index from suggestion tokens to suggestions and seeds
+
+The index is a SQLite file next to the results (`<results>.index.sqlite`).
+It is updated incrementally: it remembers how many bytes of the results
+file it has indexed and only parses rows appended since then. Queries are
+answered from the postings table without loading the CSV, ranked by
+opportunity score.
+
+Query syntax (case-insensitive):
+    botanical print        suggestions containing both tokens
+    botanical OR floral    either side
+    bot*                   any token starting with "bot"
+    botanical -vintage     "botanical" but not "vintage"
+
+Usage:
+    python -m src.term_index build etsy_market_research.csv
+    python -m src.term_index query etsy_market_research.csv "botanical print" --seeds
+    python -m src.term_index query etsy_market_research.csv -q "-vintage botanical"
+"""
+import argparse
+import csv
+import hashlib
+import json
+import operator
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+INDEX_COLUMNS = ('seed', 'suggestion', 'opportunity_score', 'category', 'competition_level')
+BATCH_ROWS = 100_000
+# Stays under SQLite's default limit on bound parameters per statement
+SQL_VARIABLES = 900
+PREFIX_CHECK_BYTES = 1 << 16
+CACHE_KIB = 64 * 1024
+DEFAULT_LIMIT = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS seeds (id INTEGER PRIMARY KEY, seed TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS suggestions (id INTEGER PRIMARY KEY, suggestion TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL, suggestion_id INTEGER NOT NULL, PRIMARY KEY (token, suggestion_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entries (
+    suggestion_id INTEGER NOT NULL, seed_id INTEGER NOT NULL, opportunity_score REAL,
+    category TEXT, competition_level TEXT, PRIMARY KEY (suggestion_id, seed_id)
+) WITHOUT ROWID;
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a suggestion or query word"""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def index_path_for(results_path: str) -> str:
+    """Return the index path that sits next to a results file"""
+    path = Path(results_path)
+    return str(path.with_name(f"{path.stem}.index.sqlite"))
+
+
+def _prefix_digest(path: str, length: int) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(min(length, PREFIX_CHECK_BYTES)), digest_size=16).hexdigest()
+
+
+def read_appended_rows(path: str, offset: int) -> Iterator[Tuple[List[str], int]]:
+    """Yield (row, byte offset after the row) for complete CSV rows after `offset`"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        position = offset
+
+        def lines() -> Iterator[str]:
+            nonlocal position
+            for line in f:
+                if not line.endswith(b'\n'):
+                    return  # a row still being written
+                position += len(line)
+                yield line.decode('utf-8')
+
+        for row in csv.reader(lines()):
+            yield row, position
+
+
+def parse_query(query: str) -> List[Tuple[List[str], List[str]]]:
+    """OR-separated groups of (required terms, excluded terms); a trailing * marks a prefix"""
+    groups = []
+    for part in re.split(r"\s+OR\s+", query.strip()):
+        include: List[str] = []
+        exclude: List[str] = []
+        for word in part.split():
+            target = exclude if word.startswith('-') and len(word) > 1 else include
+            tokens = tokenize(word)
+            if tokens and word.endswith('*'):
+                tokens[-1] += '*'
+            target.extend(tokens)
+        if include:
+            groups.append((include, exclude))
+    return groups
+
+
+def _term_select(term: str) -> Tuple[str, Tuple[str, ...]]:
+    if term.endswith('*'):
+        prefix = term[:-1]
+        return "SELECT suggestion_id FROM postings WHERE token >= ? AND token < ?", (prefix, prefix + '\U0010ffff')
+    return "SELECT suggestion_id FROM postings WHERE token = ?", (term,)
+
+
+def query_sql(groups: Sequence[Tuple[List[str], List[str]]]) -> Tuple[str, List[str]]:
+    """Compound SELECT of the matching suggestion ids"""
+    selects, params = [], []
+    for include, exclude in groups:
+        parts = []
+        for op, terms in (("INTERSECT", include), ("EXCEPT", exclude)):
+            for term in terms:
+                sql, term_params = _term_select(term)
+                parts.append(f"{op} {sql}" if parts else sql)
+                params.extend(term_params)
+        selects.append(f"SELECT suggestion_id FROM ({' '.join(parts)})")
+    return " UNION ".join(selects), params
+
+
+class TermIndex:
+    """SQLite inverted index over the suggestions of one results file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(f"PRAGMA cache_size = -{CACHE_KIB}")
+        # The index can always be rebuilt from the CSV, so commits need not wait for fsync
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'TermIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def _meta(self, key: str, default: Any = None) -> Any:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, **values: Any):
+        self.connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                    [(key, json.dumps(value)) for key, value in values.items()])
+
+    def clear(self):
+        """Drop everything indexed so far"""
+        with self.connection:
+            for table in ('meta', 'seeds', 'suggestions', 'postings', 'entries'):
+                self.connection.execute(f"DELETE FROM {table}")
+
+    def is_current(self, csv_file: str) -> bool:
+        """True when every complete row of the results file is indexed"""
+        return self._meta('source') == os.path.abspath(csv_file) and self._meta('offset', 0) == os.path.getsize(csv_file)
+
+    def update(self, csv_file: str, rebuild: bool = False) -> Dict[str, Any]:
+        """Index rows appended since the last update; starts over if the file was replaced"""
+        started = time.perf_counter()
+        offset = self._meta('offset', 0)
+        replaced = (self._meta('source') != os.path.abspath(csv_file) or os.path.getsize(csv_file) < offset
+                    or (offset and self._meta('prefix_digest') != _prefix_digest(csv_file, offset)))
+        if rebuild or replaced:
+            self.clear()
+            offset = 0
+
+        header = self._meta('header')
+        columns = _column_getter(header) if header else None
+        rows_added = 0
+        batch: List[Tuple[Any, ...]] = []
+        for row, end in read_appended_rows(csv_file, offset):
+            offset = end
+            if columns is None:
+                header = row
+                columns = _column_getter(header)
+                continue
+            values = columns(row)
+            if values[0] and values[1]:
+                batch.append(values)
+            if len(batch) >= BATCH_ROWS:
+                rows_added += self._add_batch(batch, csv_file, header, offset)
+                batch = []
+        rows_added += self._add_batch(batch, csv_file, header, offset)
+        return {
+            'rows': rows_added,
+            'suggestions': self.connection.execute("SELECT COUNT(*) FROM suggestions").fetchone()[0],
+            'rebuilt': bool(rebuild or replaced),
+            'seconds': time.perf_counter() - started,
+        }
+
+    def _ids(self, table: str, column: str, values: set) -> Dict[str, int]:
+        """value -> id for the given values, inserting the missing ones"""
+        db = self.connection
+        db.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", [(value,) for value in values])
+        ids: Dict[str, int] = {}
+        values = list(values)
+        for start in range(0, len(values), SQL_VARIABLES):
+            chunk = values[start:start + SQL_VARIABLES]
+            ids.update(db.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({','.join('?' * len(chunk))})",
+                                  chunk))
+        return ids
+
+    def _add_batch(self, batch: List[Tuple[Any, ...]], csv_file: str, header: Optional[List[str]], offset: int) -> int:
+        """Insert one batch of (seed, suggestion, score, category, level) rows and advance the offset"""
+        with self.connection:
+            db = self.connection
+            if batch:
+                seed_ids = self._ids('seeds', 'seed', {row[0] for row in batch})
+                last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM suggestions").fetchone()[0]
+                suggestion_ids = self._ids('suggestions', 'suggestion', {row[1] for row in batch})
+                # Rows go in in key order, which keeps B-tree inserts local
+                db.executemany("INSERT OR IGNORE INTO postings (token, suggestion_id) VALUES (?, ?)",
+                               sorted((token, suggestion_id) for suggestion, suggestion_id in suggestion_ids.items()
+                                      if suggestion_id > last_id for token in set(tokenize(suggestion))))
+                # Later rows for the same seed and suggestion replace earlier ones
+                latest = {(suggestion_ids[suggestion], seed_ids[seed]): (_to_float(score), category, level)
+                          for seed, suggestion, score, category, level in batch}
+                db.executemany(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (suggestion_id, seed_id) DO UPDATE SET opportunity_score = excluded.opportunity_score, "
+                    "category = excluded.category, competition_level = excluded.competition_level",
+                    [(*key, *latest[key]) for key in sorted(latest)]
+                )
+            self._set_meta(source=os.path.abspath(csv_file), header=header, offset=offset,
+                           prefix_digest=_prefix_digest(csv_file, offset))
+        return len(batch)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Matching (suggestion, seed) entries, highest opportunity score first"""
+        groups = parse_query(query)
+        if not groups:
+            return []
+        matches, params = query_sql(groups)
+        cursor = self.connection.execute(
+            f"WITH matches (suggestion_id) AS ({matches}) "
+            "SELECT s.suggestion, d.seed, e.opportunity_score, e.category, e.competition_level "
+            "FROM matches m JOIN entries e ON e.suggestion_id = m.suggestion_id "
+            "JOIN suggestions s ON s.id = e.suggestion_id JOIN seeds d ON d.id = e.seed_id "
+            "ORDER BY e.opportunity_score DESC, s.suggestion, d.seed LIMIT ?",
+            [*params, limit]
+        )
+        columns = ('suggestion', 'seed', 'opportunity_score', 'category', 'competition_level')
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def search_seeds(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Seeds with matching suggestions, by their best matching opportunity score"""
+        groups = parse_query(query)
+        if not groups:
+            return []
+        matches, params = query_sql(groups)
+        cursor = self.connection.execute(
+            f"WITH matches (suggestion_id) AS ({matches}) "
+            "SELECT d.seed, MAX(e.opportunity_score) AS best, COUNT(*) "
+            "FROM matches m JOIN entries e ON e.suggestion_id = m.suggestion_id JOIN seeds d ON d.id = e.seed_id "
+            "GROUP BY d.id ORDER BY best DESC, d.seed LIMIT ?",
+            [*params, limit]
+        )
+        return [{'seed': seed, 'opportunity_score': best, 'matches': count} for seed, best, count in cursor]
+
+
+def _column_getter(header: List[str]):
+    """Row -> tuple of INDEX_COLUMNS values (None for columns the file lacks)"""
+    positions = [header.index(column) if column in header else None for column in INDEX_COLUMNS]
+    if None not in positions:
+        getter = operator.itemgetter(*positions)
+        return lambda row: getter(row) if len(row) == len(header) else _padded(row, positions)
+    return lambda row: _padded(row, positions)
+
+
+def _padded(row: List[str], positions: List[Optional[int]]) -> Tuple[Optional[str], ...]:
+    return tuple(row[i] if i is not None and i < len(row) else None for i in positions)
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def update_index(csv_file: str, index_path: Optional[str] = None, rebuild: bool = False) -> Dict[str, Any]:
+    """Bring the index next to a results file up to date"""
+    with TermIndex(index_path or index_path_for(csv_file)) as index:
+        return index.update(csv_file, rebuild=rebuild)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Build and query the suggestion token index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index rows appended since the last build")
+    build.add_argument("csv_file", help="Results CSV")
+    build.add_argument("--index", help="Index file (default: <results>.index.sqlite)")
+    build.add_argument("--rebuild", action="store_true", help="Re-index the whole file")
+    query = commands.add_parser("query", help="Search suggestions, best opportunity first")
+    query.add_argument("csv_file", help="Results CSV")
+    query.add_argument("query", nargs="?", help='e.g. "botanical print", "bot* -vintage", "maps OR atlas"')
+    query.add_argument("-q", "--query", dest="query_option", metavar="QUERY",
+                       help='The query as an option, for queries starting with "-" (or put them after --)')
+    query.add_argument("--index", help="Index file (default: <results>.index.sqlite)")
+    query.add_argument("--seeds", action="store_true", help="List seeds instead of suggestions")
+    query.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Maximum results")
+    args = parser.parse_args(argv)
+    if args.command == "query":
+        args.query = args.query_option or args.query
+        if not args.query:
+            query.error("a query is required")
+
+    with TermIndex(args.index or index_path_for(args.csv_file)) as index:
+        if args.command == "build" or not index.is_current(args.csv_file):
+            stats = index.update(args.csv_file, rebuild=getattr(args, 'rebuild', False))
+            print(f"🔎 Indexed {stats['rows']:,} new rows ({stats['suggestions']:,} suggestions) "
+                  f"in {stats['seconds']:.1f}s → {index.path}")
+        if args.command == "build":
+            return
+
+        started = time.perf_counter()
+        if args.seeds:
+            results = index.search_seeds(args.query, args.limit)
+            for result in results:
+                print(f"{result['opportunity_score'] or 0:6.2f}  {result['seed']}  ({result['matches']} matches)")
+        else:
+            results = index.search(args.query, args.limit)
+            for result in results:
+                print(f"{result['opportunity_score'] or 0:6.2f}  {result['suggestion']}  ← {result['seed']}"
+                      f"  [{result['category']}]")
+        print(f"⚡ {len(results)} results in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Optional span tracing for the scrape pipeline
+
+Spans are recorded as Chrome trace events ("X" complete events), so a run
+can be opened in Perfetto (ui.perfetto.dev), chrome://tracing or speedscope.
+Nesting comes from time containment on the same thread: a `seed` span
+encloses its `fetch`, `homepage`, `consent`, ... spans.
+
+Tracing is off by default; while disabled, `span()` returns a shared no-op
+object, so instrumented code pays one attribute check per span.
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class Span:
+    """A timed, named region; recorded when the `with` block exits"""
+
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        """Attach extra arguments shown in the trace viewer"""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer.record(self.name, self.start, end - self.start, self.args)
+        return False
+
+
+class NullSpan:
+    """Span stand-in used while tracing is disabled"""
+
+    __slots__ = ()
+
+    def set(self, **args):
+        """Ignore span arguments"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """Collects spans and writes them as Chrome trace-event JSON"""
+
+    def __init__(self, enabled: bool = False, max_events: int = 2_000_000, process_name: str = "etsy_scraper"):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.process_name = process_name
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Start recording spans"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans (already recorded events are kept)"""
+        self.enabled = False
+
+    def span(self, name: str, **args) -> Any:
+        """Open a span: `with tracer.span("navigate", url=url): ...`"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def instant(self, name: str, **args):
+        """Record a point-in-time event such as a retry"""
+        if self.enabled:
+            self._append({'name': name, 'ph': 'i', 's': 't', 'ts': self._micros(time.perf_counter_ns()), 'args': args})
+
+    def record(self, name: str, start_ns: int, duration_ns: int, args: Dict[str, Any]):
+        """Record a completed span"""
+        self._append({
+            'name': name, 'ph': 'X',
+            'ts': self._micros(start_ns), 'dur': duration_ns / 1000,
+            'args': args
+        })
+
+    def _micros(self, ns: int) -> float:
+        """Microseconds since the tracer was created (trace timestamps)"""
+        return (ns - self._origin) / 1000
+
+    def _append(self, event: Dict[str, Any]):
+        """Stamp an event with process/thread ids and store it, up to max_events"""
+        event['cat'] = 'scrape'
+        event['pid'] = self._pid
+        event['tid'] = threading.get_ident()
+        with self._lock:
+            if len(self._events) < self.max_events:
+                self._events.append(event)
+            else:
+                self.dropped += 1
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded span and instant events"""
+        return list(self._events)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """The trace as a Chrome trace-event document"""
+        thread_ids = {event['tid'] for event in self._events}
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'args': {'name': self.process_name}}]
+        metadata += [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+             'args': {'name': 'main' if tid == threading.main_thread().ident else f'thread-{tid}'}}
+            for tid in sorted(thread_ids)
+        ]
+        return {
+            'traceEvents': metadata + sorted(self._events, key=lambda event: (event['ts'], -event.get('dur', 0))),
+            'displayTimeUnit': 'ms',
+            'otherData': {'dropped_events': self.dropped},
+        }
+
+    def write(self, path: str):
+        """Write the trace atomically as JSON"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, separators=(',', ':'), default=str)
+        os.replace(tmp_path, path)
+
+
+def slowest_spans(trace: Dict[str, Any], name: str = 'seed', limit: int = 10) -> List[Dict[str, Any]]:
+    """Return the longest spans with a given name from a Chrome trace document"""
+    spans = [event for event in trace.get('traceEvents', []) if event.get('ph') == 'X' and event['name'] == name]
+    return sorted(spans, key=lambda event: event['dur'], reverse=True)[:limit]
+
+
+# Global tracer used by the scraper (disabled until --trace)
+tracer = Tracer()
@@ -0,0 +1,176 @@
+"""
+Batch trend analytics over many interest series at once
+
+`trend_features` takes a 2D array with one interest series per row (shorter
+series right-aligned and padded with NaN, see `align_series`) and computes,
+with whole-array NumPy operations and no per-term Python loop:
+
+    trend_score       % change of the mean of the last `window` points over
+                      the first `window` points (the scraper's long-standing score)
+    trend_direction   growing / declining / stable at +-5%
+    current_interest  mean of the last `window` points
+    slope             least-squares slope in interest points per period, and
+    slope_pct         the same as % of the series mean
+    volatility        std of period-to-period changes relative to the mean
+    seasonality       strongest autocorrelation of the detrended series at lags
+                      MIN_SEASON_LAG .. length / 2 (0 = none, 1 = perfectly periodic),
+    seasonal_lag      at which lag
+    breakout          the last `breakout_window` points average more than
+                      `breakout_z` standard deviations above the points before
+
+The scraper scores each seed through `trend_metrics`, a one-row call of the
+same engine; `store_trend_features` and the CLI re-derive every stored term:
+
+    python -m src.trend_engine etsy_market_research.csv --output trend_features.csv
+"""
+import argparse
+import time
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+TREND_WINDOW = 30
+DIRECTION_THRESHOLD = 5
+BREAKOUT_WINDOW = 4
+BREAKOUT_Z = 3.0
+MIN_BASELINE = 8
+MIN_SEASON_LAG = 4
+
+
+def align_series(series: Iterable[Sequence[float]], length: Optional[int] = None) -> np.ndarray:
+    """Stack series into a float64 matrix, right-aligned (latest points in the last column) and NaN-padded"""
+    rows = [np.asarray(values, dtype=np.float64) for values in series]
+    length = length or max((len(values) for values in rows), default=0)
+    matrix = np.full((len(rows), length), np.nan)
+    for i, values in enumerate(rows):
+        values = values[-length:] if length else values[:0]
+        matrix[i, length - len(values):] = values
+    return matrix
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    counts = mask.sum(axis=1)
+    return np.where(mask, values, 0).sum(axis=1) / np.maximum(counts, 1)
+
+
+def trend_features(matrix: Any, index: Optional[Sequence[Any]] = None, window: int = TREND_WINDOW,
+                   breakout_window: int = BREAKOUT_WINDOW, breakout_z: float = BREAKOUT_Z) -> pd.DataFrame:
+    """Trend features of every row of `matrix` (NaN = missing point); see the module docstring"""
+    values = np.atleast_2d(np.asarray(matrix, dtype=np.float64))
+    rows, length = values.shape
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    points = valid.sum(axis=1)
+    rank = np.cumsum(valid, axis=1)  # 1-based position among each row's valid points
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Recent vs older means
+        older_avg = _masked_mean(filled, valid & (rank <= window))
+        recent_avg = _masked_mean(filled, valid & (rank > (points - window)[:, None]))
+        trend_score = np.where(older_avg == 0, 0.0, (recent_avg - older_avg) / older_avg * 100)
+
+        # Least-squares line through the valid points
+        mean = filled.sum(axis=1) / np.maximum(points, 1)
+        x = np.arange(length, dtype=np.float64)
+        x_mean = (x * valid).sum(axis=1) / np.maximum(points, 1)
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dx2 = (dx * dx).sum(axis=1)
+        slope = np.where(dx2 > 0, (dx * (filled - mean[:, None])).sum(axis=1) / dx2, 0.0)
+        slope_pct = np.where(mean > 0, slope / mean * 100, 0.0)
+
+        # Spread of consecutive changes
+        pairs = valid[:, 1:] & valid[:, :-1]
+        changes = np.where(pairs, np.diff(filled, axis=1), 0.0)
+        pair_counts = np.maximum(pairs.sum(axis=1), 1)
+        change_mean = changes.sum(axis=1) / pair_counts
+        change_var = (np.where(pairs, changes - change_mean[:, None], 0.0) ** 2).sum(axis=1) / pair_counts
+        volatility = np.where(mean > 0, np.sqrt(change_var) / mean, 0.0)
+
+        # Autocorrelation of the detrended series for all lags at once, via FFT
+        residual = np.where(valid, filled - mean[:, None] - slope[:, None] * dx, 0.0)
+        size = 1 << int(2 * max(length, 1) - 1).bit_length()
+        spectrum = np.fft.rfft(residual, size, axis=1)
+        covariance = np.fft.irfft(spectrum * spectrum.conj(), size, axis=1)[:, :length]
+        mask_spectrum = np.fft.rfft(valid.astype(np.float64), size, axis=1)
+        overlap = np.rint(np.fft.irfft(mask_spectrum * mask_spectrum.conj(), size, axis=1)[:, :length])
+        covariance = np.where(overlap > 0, covariance / np.maximum(overlap, 1), 0.0)
+        autocorrelation = np.where(covariance[:, :1] > 0, covariance / covariance[:, :1], 0.0)
+        lags = np.arange(length)
+        usable = (lags >= MIN_SEASON_LAG) & (lags[None, :] <= points[:, None] // 2)
+        autocorrelation = np.where(usable, autocorrelation, -np.inf)
+        seasonal_lag = autocorrelation.argmax(axis=1) if length else np.zeros(rows, dtype=int)
+        seasonality = np.clip(autocorrelation[np.arange(rows), seasonal_lag], 0, 1) if length else np.zeros(rows)
+        seasonal_lag = np.where(seasonality > 0, seasonal_lag, 0)
+
+        # Latest points against the spread of everything before them
+        latest = valid & (rank > (points - breakout_window)[:, None])
+        baseline = valid & ~latest
+        baseline_points = baseline.sum(axis=1)
+        baseline_mean = _masked_mean(filled, baseline)
+        baseline_std = np.sqrt(_masked_mean((filled - baseline_mean[:, None]) ** 2, baseline))
+        lift = _masked_mean(filled, latest) - baseline_mean
+        breakout = (baseline_points >= MIN_BASELINE) & (lift > 0) & (lift >= breakout_z * baseline_std)
+
+    direction = np.select([trend_score > DIRECTION_THRESHOLD, trend_score < -DIRECTION_THRESHOLD],
+                          ['growing', 'declining'], 'stable')
+    return pd.DataFrame({
+        'points': points,
+        'trend_score': trend_score,
+        'trend_direction': direction,
+        'trend_strength': np.abs(trend_score),
+        'current_interest': recent_avg,
+        'slope': slope,
+        'slope_pct': slope_pct,
+        'volatility': volatility,
+        'seasonality': seasonality,
+        'seasonal_lag': seasonal_lag,
+        'breakout': breakout,
+    }, index=index)
+
+
+def trend_metrics(values: Sequence[float], window: int = TREND_WINDOW) -> Dict[str, Any]:
+    """Trend features of a single interest series as a plain dict"""
+    row = trend_features(align_series([values]), window=window).iloc[0]
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in row.items()}
+
+
+def store_trend_features(store: Any, terms: Optional[Iterable[str]] = None, history: bool = False,
+                         **options: Any) -> pd.DataFrame:
+    """Trend features of stored terms from their latest fetch (or whole merged history), one row per term"""
+    terms = store.terms() if terms is None else [term for term in terms if term in store]
+    if history:
+        matrix = align_series(store.history(term).to_numpy() for term in terms)
+    else:
+        matrix = store.latest_matrix(terms)
+    return trend_features(matrix, index=pd.Index(terms, name='term'), **options)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    from .trends_store import TrendsStore, trends_path_for
+
+    parser = argparse.ArgumentParser(description="Re-derive trend features of every stored Google Trends series")
+    parser.add_argument("csv_file", help="Results CSV (its .trends store is read)")
+    parser.add_argument("--history", action="store_true", help="Use every fetch of a term, not just the latest")
+    parser.add_argument("--output", help="Write the features as CSV")
+    parser.add_argument("--top", type=int, default=10, help="Breakout terms to list")
+    args = parser.parse_args(argv)
+
+    store = TrendsStore(trends_path_for(args.csv_file))
+    started = time.perf_counter()
+    features = store_trend_features(store, history=args.history)
+    seconds = time.perf_counter() - started
+    directions = features['trend_direction'].value_counts()
+    print(f"📈 {len(features):,} terms in {seconds:.2f}s: " + ", ".join(
+        f"{directions.get(direction, 0):,} {direction}" for direction in ('growing', 'stable', 'declining')))
+    breakouts = features[features['breakout']].sort_values('slope_pct', ascending=False)
+    print(f"🚀 {len(breakouts):,} breakouts")
+    for term, row in breakouts.head(args.top).iterrows():
+        print(f"   {term}: {row['trend_score']:+.0f}% (slope {row['slope_pct']:+.1f}%/week)")
+    if args.output:
+        features.to_csv(args.output)
+        print(f"✅ Features saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
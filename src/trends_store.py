@@ -0,0 +1,176 @@
+"""
+Append-only store of full Google Trends interest series and related queries
+
+Every fetched series is kept, not just the trend score derived from it, so
+trend metrics can be recomputed or changed later without refetching (see
+trend_engine.py). The store is a directory next to the results
+(`<results>.trends/`):
+
+    values.f32     float32 interest values of all series, back to back
+    days.i32       int32 day numbers (days since 1970-01-01), parallel to values
+    index.jsonl    one JSON line per series: term, fetch time, offset and
+                   length in the arrays, and the rising/top related queries
+
+Appending writes the arrays first and the index line last, so a crash can
+only leave unindexed bytes, which the next writer truncates. Reads slice a
+read-only memory map, so only the requested series are paged in. A year of
+weekly interest takes 416 bytes, versus several KB as CSV text.
+
+Usage:
+    store = TrendsStore(trends_path_for("etsy_market_research.csv"))
+    store.append("botanical print", interest_over_time["botanical print"], rising=..., top=...)
+    store.series("botanical print")       # latest fetch, indexed by date
+    store.history("botanical print")      # all fetches merged, newest value per date
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+VALUES_FILE = "values.f32"
+DAYS_FILE = "days.i32"
+INDEX_FILE = "index.jsonl"
+VALUE_DTYPE = np.dtype('<f4')
+DAY_DTYPE = np.dtype('<i4')
+VERSION = 1
+
+
+def trends_path_for(results_path: str) -> str:
+    """Return the trends store directory that sits next to a results file"""
+    path = Path(results_path)
+    return str(path.with_name(f"{path.stem}.trends"))
+
+
+def _query_records(queries: Any) -> List[Dict[str, Any]]:
+    """Related queries (a DataFrame or records) as JSON-safe records"""
+    if queries is None:
+        return []
+    if isinstance(queries, pd.DataFrame):
+        queries = queries.to_dict('records')
+    return [{key: value.item() if isinstance(value, np.generic) else value for key, value in record.items()}
+            for record in queries]
+
+
+class TrendsStore:
+    """Interest series indexed by term; see the module docstring for the layout"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.points = 0
+        self._index_bytes = 0
+        self._maps: Dict[str, np.memmap] = {}
+        self.refresh()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def refresh(self) -> int:
+        """Read index lines appended since the last refresh (by this or another process); returns how many"""
+        try:
+            with open(self._path(INDEX_FILE), 'rb') as f:
+                f.seek(self._index_bytes)
+                data = f.read()
+        except OSError:
+            return 0
+        # A trailing line without a newline is still being written
+        complete = data[:data.rfind(b'\n') + 1]
+        added = 0
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            self.entries.setdefault(entry['term'], []).append(entry)
+            self.points = max(self.points, entry['offset'] + entry['length'])
+            added += 1
+        self._index_bytes += len(complete)
+        return added
+
+    def terms(self) -> List[str]:
+        """Terms with at least one stored series"""
+        return list(self.entries)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.entries
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+    def append(self, term: str, interest: pd.Series, rising: Any = None, top: Any = None,
+               fetched: Optional[float] = None, **info: Any) -> Dict[str, Any]:
+        """Store one fetched series (values indexed by date) with its related queries"""
+        os.makedirs(self.directory, exist_ok=True)
+        self.refresh()
+        values = np.asarray(interest, dtype=VALUE_DTYPE)
+        days = pd.DatetimeIndex(interest.index).to_numpy(dtype='datetime64[D]').astype(DAY_DTYPE)
+
+        offset = self.points
+        for name, array in ((VALUES_FILE, values), (DAYS_FILE, days)):
+            with open(self._path(name), 'ab') as f:
+                # Drop bytes of an append that crashed before its index line was written
+                f.truncate(offset * array.itemsize)
+                f.write(array.tobytes())
+        entry = {'term': term, 'fetched': time.time() if fetched is None else fetched,
+                 'offset': offset, 'length': len(values),
+                 'rising': _query_records(rising), 'top': _query_records(top), 'version': VERSION, **info}
+        line = (json.dumps(entry, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        with open(self._path(INDEX_FILE), 'ab') as f:
+            f.write(line)
+        self._index_bytes += len(line)
+        self.entries.setdefault(term, []).append(entry)
+        self.points = offset + len(values)
+        return entry
+
+    def _array(self, name: str, dtype: np.dtype) -> np.ndarray:
+        """Read-only map of a whole array file, remapped when it has grown"""
+        mapped = self._maps.get(name)
+        if mapped is None or len(mapped) < self.points:
+            mapped = np.memmap(self._path(name), dtype=dtype, mode='r', shape=(self.points,)) \
+                if self.points else np.zeros(0, dtype=dtype)
+            self._maps[name] = mapped
+        return mapped
+
+    def _slice(self, entry: Dict[str, Any]) -> pd.Series:
+        window = slice(entry['offset'], entry['offset'] + entry['length'])
+        days = self._array(DAYS_FILE, DAY_DTYPE)[window]
+        values = np.array(self._array(VALUES_FILE, VALUE_DTYPE)[window])
+        dates = pd.DatetimeIndex(days.astype('datetime64[D]').astype('datetime64[ns]'), name='date')
+        return pd.Series(values, index=dates, name=entry['term'])
+
+    def series(self, term: str, fetch: int = -1) -> pd.Series:
+        """One stored fetch of a term's interest (the latest by default); KeyError if never stored"""
+        return self._slice(self.entries[term][fetch])
+
+    def history(self, term: str) -> pd.Series:
+        """Every fetch of a term merged into one series, the newest fetch winning on overlapping dates"""
+        parts = [self._slice(entry) for entry in sorted(self.entries[term], key=lambda entry: entry['fetched'])]
+        merged = pd.concat(parts)
+        return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+    def related(self, term: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Rising and top related queries of the latest fetch"""
+        entry = self.entries[term][-1]
+        return {'rising': entry['rising'], 'top': entry['top']}
+
+    def latest(self, terms: Optional[Iterable[str]] = None) -> Dict[str, pd.Series]:
+        """Latest series of each term (all stored terms by default)"""
+        terms = self.terms() if terms is None else [term for term in terms if term in self.entries]
+        return {term: self.series(term) for term in terms}
+
+    def latest_matrix(self, terms: Sequence[str]) -> np.ndarray:
+        """Latest values of each term as one float64 matrix, right-aligned and NaN-padded, in a single gather"""
+        offsets = np.array([self.entries[term][-1]['offset'] for term in terms], dtype=np.int64)
+        lengths = np.array([self.entries[term][-1]['length'] for term in terms], dtype=np.int64)
+        width = int(lengths.max()) if len(terms) else 0
+        columns = np.arange(width)
+        present = columns[None, :] >= (width - lengths)[:, None]
+        positions = np.where(present, offsets[:, None] + columns[None, :] - (width - lengths)[:, None], 0)
+        values = self._array(VALUES_FILE, VALUE_DTYPE)
+        return np.where(present, values[positions] if len(values) else 0.0, np.nan)
+
+    def nbytes(self) -> int:
+        """Size of the store on disk"""
+        return sum(os.path.getsize(self._path(name)) for name in (VALUES_FILE, DAYS_FILE, INDEX_FILE)
+                   if os.path.exists(self._path(name)))
@@ -0,0 +1,75 @@
+"""
+Scatter plots that stay small and interactive at any row count
+
+Up to `visualization.scatter_max_points` rows the plot is an ordinary
+plotly express scatter. Above that, all rows are aggregated into a 2D
+density heatmap and drawn with a WebGL (scattergl) layer of a sample,
+stratified by color group, that carries the hover data. Output size
+depends on the bin and sample settings, not on the number of rows.
+"""
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SCATTER_MAX_POINTS = 20_000
+SAMPLE_POINTS = 5_000
+DENSITY_BINS = 60
+
+
+def visualization_settings(cfg: Any = None) -> Dict[str, int]:
+    """Scatter thresholds from the `visualization` config section"""
+    if cfg is None:
+        from .config import config as cfg
+    section = cfg.get('visualization', {}) or {}
+    return {
+        'max_points': int(section.get('scatter_max_points', SCATTER_MAX_POINTS)),
+        'sample_points': int(section.get('scatter_sample_points', SAMPLE_POINTS)),
+        'bins': int(section.get('density_bins', DENSITY_BINS)),
+    }
+
+
+def stratified_sample(df: pd.DataFrame, size: int, by: Optional[str] = None, seed: int = 0) -> pd.DataFrame:
+    """Random sample of about `size` rows that keeps every `by` group represented"""
+    if len(df) <= size:
+        return df
+    shuffled = df.iloc[np.random.default_rng(seed).permutation(len(df))]
+    if by is None:
+        return shuffled.iloc[:size]
+    groups = df[by].nunique(dropna=False) or 1
+    return shuffled.groupby(by, observed=True, sort=False, dropna=False).head(max(1, size // groups))
+
+
+def density_heatmap(x: pd.Series, y: pd.Series, bins: int):
+    """go.Heatmap of row counts over a bins x bins grid"""
+    import plotly.graph_objects as go
+
+    mask = x.notna().to_numpy() & y.notna().to_numpy()
+    xs, ys = x.to_numpy(dtype=float)[mask], y.to_numpy(dtype=float)[mask]
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=[min(bins, max(1, len(np.unique(xs)))), bins])
+    counts[counts == 0] = np.nan  # empty cells stay transparent
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=counts.T,
+        colorscale='Greys', opacity=0.5, showscale=False, name='All rows',
+        hovertemplate='%{z:,} rows<extra>density</extra>',
+    )
+
+
+def scalable_scatter(df: pd.DataFrame, x: str, y: str, color: Optional[str] = None, size: Optional[str] = None,
+                     hover_data: Optional[Sequence[str]] = None, title: str = '',
+                     labels: Optional[Dict[str, str]] = None, settings: Optional[Dict[str, int]] = None):
+    """px.scatter for small frames; density heatmap plus sampled scattergl for large ones"""
+    import plotly.express as px
+
+    settings = settings or visualization_settings()
+    kwargs = dict(x=x, y=y, color=color, size=size, hover_data=list(hover_data or []), labels=labels or {})
+    if len(df) <= settings['max_points']:
+        return px.scatter(df, title=title, **kwargs)
+
+    sample = stratified_sample(df, settings['sample_points'], by=color)
+    fig = px.scatter(sample, render_mode='webgl', title=f"{title} ({len(sample):,} of {len(df):,} rows shown, "
+                                                        f"shading counts all rows)", **kwargs)
+    fig.add_trace(density_heatmap(df[x], df[y], settings['bins']))
+    # Draw the density underneath the points
+    fig.data = fig.data[-1:] + fig.data[:-1]
+    return fig
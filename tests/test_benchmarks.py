@@ -0,0 +1,59 @@
+"""
+Tests for the benchmark data generator and regression check
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks.datagen import HEADER, format_count, generate_results, parse_count
+from benchmarks.harness import measure
+from benchmarks.suite import compare
+
+
+class TestBenchmarks:
+    """Test suite for synthetic data, measurement and baseline comparison"""
+
+    def setup_method(self):
+        """Set up a temporary directory"""
+        self.tmpdir = tempfile.mkdtemp()
+
+    def test_generated_schema(self):
+        """Test that generated files match the scraper's output schema"""
+        path = generate_results(os.path.join(self.tmpdir, "results.csv"), 1_000, chunk_rows=300)
+        frame = pd.read_csv(path)
+        assert list(frame.columns) == HEADER
+        assert len(frame) == 1_000
+        growing = frame[frame['trend_score'] > 5]
+        assert (growing['trend_direction'] == 'growing').all()
+
+    def test_generation_is_deterministic(self):
+        """Test that the same seed produces the same file"""
+        first = generate_results(os.path.join(self.tmpdir, "a.csv"), 500, seed=7)
+        second = generate_results(os.path.join(self.tmpdir, "b.csv"), 500, seed=7)
+        with open(first) as a, open(second) as b:
+            assert a.read() == b.read()
+
+    def test_counts(self):
+        """Test row-count parsing and labels"""
+        assert parse_count("10k") == 10_000
+        assert parse_count("1.5M") == 1_500_000
+        assert format_count(10_000_000) == "10M"
+
+    def test_measure(self):
+        """Test that measure reports timing spread and peak memory"""
+        stats = measure(lambda: [0] * 10_000, repeat=3)
+        assert stats['runs'] == 3
+        assert stats['min'] <= stats['median'] <= stats['max']
+        assert stats['peak_bytes'] >= 80_000
+
+    def test_compare_flags_regressions(self):
+        """Test the threshold on best time and memory"""
+        baseline = {'results': {'a@10k': {'min': 1.0, 'median': 1.0, 'peak_bytes': 100},
+                                'b@10k': {'min': 1.0, 'median': 1.0, 'peak_bytes': 100},
+                                'd@10k': {'min': 1.0, 'median': 1.0, 'peak_bytes': 100}}}
+        results = {'results': {'a@10k': {'min': 1.2, 'median': 1.6, 'peak_bytes': 100},
+                               'b@10k': {'min': 1.0, 'median': 1.0, 'peak_bytes': 200},
+                               'c@10k': {'min': 9.0, 'median': 9.0},
+                               'd@10k': {'min': 1.3, 'median': 1.3, 'peak_bytes': 100}}}
+        assert compare(results, baseline, 0.25, report=lambda line: None) == ['b@10k', 'd@10k']
@@ -0,0 +1,49 @@
+"""
+Tests for the single-pass per-category report
+"""
+import pandas as pd
+import pytest
+
+from src.category_report import compute_category_report
+
+
+class TestCategoryReport:
+    """Test suite for per-category statistics against per-category filtering"""
+
+    def setup_method(self):
+        """Set up a frame shaped like the analyzer's"""
+        suggestions = ['fern print', 'fern print', 'herbarium', 'moon map', 'moon map', 'moon map', 'star chart',
+                       'planet art', 'vintage map']
+        self.df = pd.DataFrame({
+            'category': pd.Categorical(['Botanical'] * 3 + ['Space'] * 5 + ['Maps'],
+                                       categories=['Botanical', 'Maps', 'Space', 'Unused']),
+            'suggestion': suggestions,
+            'competition_level': ['Low', 'Low', 'High', 'Moderate', 'Moderate', 'High', 'Moderate', 'Low', 'High'],
+            'suggestion_length': [len(text) for text in suggestions],
+            'opportunity_score': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0],
+            'competition_score': [3.0, 3.0, 1.0, 2.0, 2.0, 1.0, 2.0, 3.0, 1.0],
+        })
+        self.report = compute_category_report(self.df, top_terms=2, length_bins=4)
+
+    def test_categories_ordered_by_rows(self):
+        """Test that unused categories are dropped and the largest comes first"""
+        assert self.report.categories == ['Space', 'Botanical', 'Maps']
+        assert self.report.counts.tolist() == [5, 3, 1]
+
+    def test_matches_filtered_frames(self):
+        """Test each statistic against filtering the frame per category"""
+        for category in self.report.categories:
+            subset = self.df[self.df['category'] == category]
+            assert self.report.competition_mix(category).to_dict() == subset['competition_level'].value_counts().to_dict()
+            assert self.report.means.loc[category, 'opportunity_score'] == pytest.approx(subset['opportunity_score'].mean())
+            assert self.report.score_quantiles.loc[category, 0.5] == pytest.approx(subset['opportunity_score'].median())
+            assert self.report.length_histogram(category)[1].sum() == len(subset)
+
+    def test_top_terms(self):
+        """Test per-category top terms, most frequent first and capped"""
+        assert self.report.terms('Space').to_dict() == {'moon map': 3, 'star chart': 1}
+        assert self.report.terms('Botanical').index[0] == 'fern print'
+
+    def test_most_common_competition(self):
+        """Test the dashboard's most common competition level per category"""
+        assert self.report.most_common_competition()['Botanical'] == 'Low'
@@ -0,0 +1,86 @@
+"""
+Tests for content-hash change detection
+"""
+import csv
+import io
+import os
+import tempfile
+
+from src.change_detection import FingerprintStore, fingerprint_payload, fingerprint_path_for
+
+
+class TestChangeDetection:
+    """Test suite for page fingerprinting and the fingerprint store"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.payload = {
+            'related_texts': ['botanical wall art', 'vintage plant poster'],
+            'listing_count_text': '847 results',
+            'price_texts': ['$12.99', '$49.00']
+        }
+        self.rows = [['2024-01-01T12:00:00', 'vintage botanical prints', 'botanical wall art', '7.2'],
+                     ['2024-01-01T12:00:00', 'vintage botanical prints', 'plant poster, "framed"', '7.2']]
+        self.path = os.path.join(tempfile.mkdtemp(), 'results.fingerprints.sqlite')
+        self.data = self.encode(self.rows)
+
+    def encode(self, rows):
+        """Render rows as CSV bytes the way the scraper writes them"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+    def test_fingerprint_is_stable_and_content_sensitive(self):
+        """Test that equal payloads hash equally and changed payloads do not"""
+        same = dict(self.payload, price_texts=list(self.payload['price_texts']))
+        changed = dict(self.payload, listing_count_text='848 results')
+
+        assert fingerprint_payload(self.payload) == fingerprint_payload(same)
+        assert fingerprint_payload(self.payload) != fingerprint_payload(changed)
+        assert fingerprint_payload(self.payload, trends=True) != fingerprint_payload(self.payload, trends=False)
+
+    def test_fingerprint_path_sits_next_to_results(self):
+        """Test the fingerprint store path derived from the results file"""
+        path = fingerprint_path_for(os.path.join('data', 'etsy_market_research.csv'))
+        assert path == os.path.join('data', 'etsy_market_research.fingerprints.sqlite')
+
+    def test_store_round_trip_and_hit_rate(self):
+        """Test lookups return the stored rows, persistence and hit-rate reporting"""
+        fingerprint = fingerprint_payload(self.payload)
+
+        store = FingerprintStore(self.path)
+        assert store.lookup('vintage botanical prints', fingerprint) is None
+        store.update('vintage botanical prints', fingerprint, self.data)
+        store.close()
+
+        reloaded = FingerprintStore(self.path)
+        assert reloaded.lookup('vintage botanical prints', fingerprint) == self.rows
+        assert reloaded.lookup('vintage botanical prints', 'sha256:other') is None
+        assert reloaded.stats()['hits'] == 1 and reloaded.stats()['stored_seeds'] == 1
+        assert reloaded.hit_rate == 0.5
+        reloaded.close()
+
+    def test_update_replaces_rows_of_a_changed_page(self):
+        """Test a new fingerprint for a seed replaces its stored rows"""
+        store = FingerprintStore(self.path)
+        store.update('vintage botanical prints', 'sha256:old', self.data)
+        rows = [['2024-01-02T12:00:00', 'vintage botanical prints', 'fern print', '8.1']]
+        store.update('vintage botanical prints', 'sha256:new', self.encode(rows))
+        assert store.lookup('vintage botanical prints', 'sha256:old') is None
+        assert store.lookup('vintage botanical prints', 'sha256:new') == rows
+        assert store.stats()['stored_seeds'] == 1
+        store.close()
+
+    def test_refresh_ignores_stored_fingerprints(self):
+        """Test that refresh mode always misses but still records new rows"""
+        fingerprint = fingerprint_payload(self.payload)
+
+        store = FingerprintStore(self.path)
+        store.update('vintage botanical prints', fingerprint, self.data)
+        store.close()
+
+        refreshed = FingerprintStore(self.path, refresh=True)
+        assert refreshed.lookup('vintage botanical prints', fingerprint) is None
+        assert refreshed.misses == 1
+        assert refreshed.stats()['stored_seeds'] == 1
+        refreshed.close()
@@ -0,0 +1,87 @@
+"""
+Tests for MinHash/LSH suggestion clustering
+"""
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.clustering import SuggestionClusterer, _union_find, cluster_counts, cluster_suggestions
+
+
+class TestSuggestionClusterer:
+    """Test suite for near-duplicate clustering"""
+
+    def setup_method(self):
+        """Create a clusterer with the default parameters"""
+        self.clusterer = SuggestionClusterer()
+
+    def test_words_are_normalized(self):
+        """Test casefolding, plural stripping and synonyms"""
+        assert self.clusterer.words("Custom Travel Posters") == ['personalized', 'print', 'travel']
+        assert self.clusterer.words("glass vases") == ['glass', 'vase']
+
+    def test_near_duplicates_share_a_cluster(self):
+        """Test variants cluster together and distinct suggestions stay apart"""
+        labels = self.clusterer.cluster([
+            "personalized travel poster", "custom travel prints", "leather dog collar",
+            "dog collar leather", "vintage travel poster", "vintage travel mug", "",
+        ])
+        assert labels[0] == labels[1]
+        assert labels[2] == labels[3]
+        assert len({labels[0], labels[2], labels[4], labels[5], labels[6]}) == 5
+        assert labels[0] == 0  # numbered by first appearance
+
+    def test_linked_suggestions_form_one_cluster(self):
+        """Test clusters are connected components: a chain of similar suggestions ends up together"""
+        texts = ["a b c d e", "zz yy xx", "a b c d e f", "a b c d e f g", "a b c d e f g h", "a b c d e f g h i j"]
+        labels = SuggestionClusterer(num_perm=128, bands=32, threshold=0.7).cluster(texts)
+        assert labels.tolist() == [0, 1, 0, 0, 0, 0]
+
+    def test_union_find_matches_connected_components(self):
+        """Test the vectorized union-find against a plain traversal on random pairs"""
+        rng = np.random.default_rng(7)
+        a, b = rng.integers(0, 500, 400), rng.integers(0, 500, 400)
+        roots = _union_find(500, a, b)
+        neighbours = {node: set() for node in range(500)}
+        for x, y in zip(a.tolist(), b.tolist()):
+            neighbours[x].add(y)
+            neighbours[y].add(x)
+        for node in range(500):
+            component, stack = {node}, [node]
+            while stack:
+                for other in neighbours[stack.pop()] - component:
+                    component.add(other)
+                    stack.append(other)
+            assert roots[node] == min(component)
+
+    def test_signatures_do_not_depend_on_chunking(self):
+        """Test words hashed in earlier chunks give the same signatures as one pass"""
+        texts = [f"word{i % 7} item{i % 11} thing{i}" for i in range(50)] + ["", "word1 item2"]
+        with patch('src.clustering.CHUNK_SUGGESTIONS', 8):
+            chunked = self.clusterer.signatures(texts)
+        assert np.array_equal(chunked, self.clusterer.signatures(texts))
+
+    def test_scales_without_pairwise_work(self):
+        """Test many unrelated suggestions stay in their own clusters"""
+        texts = [f"word{i} word{i + 1} item{i}" for i in range(0, 60_000, 3)]
+        assert self.clusterer.cluster(texts).max() + 1 == len(texts)
+
+    def test_bands_must_divide_signature(self):
+        """Test invalid banding is rejected"""
+        with pytest.raises(ValueError):
+            SuggestionClusterer(num_perm=64, bands=10)
+
+    def test_cluster_columns_and_counts(self):
+        """Test rows get cluster ids and labels and clusters aggregate"""
+        frame = pd.DataFrame({'suggestion': ["custom travel prints"] * 3 + ["personalized travel poster",
+                                                                          "cat toy", None]})
+        cluster_suggestions(frame, clusterer=self.clusterer)
+        assert frame['cluster_id'].tolist() == [0, 0, 0, 0, 1, -1]
+        assert frame['cluster_label'].iloc[3] == "custom travel prints"
+        assert pd.isna(frame['cluster_label'].iloc[5])
+
+        counts = cluster_counts(frame)
+        assert counts[['label', 'rows', 'variants']].values.tolist() == [
+            ["custom travel prints", 4, 2], ["cat toy", 1, 1]]
@@ -0,0 +1,47 @@
+"""
+Tests for typed and chunked loading of results files
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from src.data_loader import load_results
+from src.features import competition_scores
+
+
+class TestDataLoader:
+    """Test suite for dtype optimization and chunk concatenation"""
+
+    def setup_method(self):
+        """Write a small results file"""
+        self.path = os.path.join(tempfile.mkdtemp(), "results.csv")
+        pd.DataFrame({
+            'timestamp_utc': ['t1'] * 6,
+            'seed': ['maps', 'maps', 'botany', 'botany', 'space', 'space'],
+            'suggestion': ['vintage maps', None, 'fern print', 'herbarium', 'moon phases', 'planet art'],
+            'competition_level': ['Low Competition - Good Opportunity'] * 2 + ['High Competition - Avoid'] * 2
+                                 + ['Moderate'] * 2,
+            'opportunity_score': [6.5, 6.5, 1.0, 1.0, 3.0, 3.0],
+            'listing_count': [500, 500, 40000, 40000, 5000, 5000],
+            'category': ['Maps', 'Maps', 'Botanical', 'Botanical', 'Space', 'Space'],
+            'unused': ['x'] * 6,
+        }).to_csv(self.path, index=False)
+
+    def test_typed_load(self):
+        """Test usecols, categoricals, downcasting and derived columns"""
+        frame, stats = load_results(self.path, chunksize=2)
+        assert len(frame) == 5 and stats.rows == 5
+        assert 'unused' not in frame.columns
+        assert isinstance(frame['seed'].dtype, pd.CategoricalDtype)
+        assert sorted(frame['seed'].cat.categories) == ['botany', 'maps', 'space']
+        assert frame['opportunity_score'].dtype == 'float32'
+        assert frame['listing_count'].dtype == 'int32'
+        assert frame['suggestion_length'].tolist() == [12, 10, 9, 11, 10]
+        assert stats.typed_bytes > 0 and stats.raw_bytes > 0
+
+    def test_competition_scores_use_leading_word(self):
+        """Test that scraper labels and bare levels score the same"""
+        levels = pd.Series(['Low Competition - Good Opportunity', 'Moderate', 'High', 'Unknown'])
+        assert competition_scores(levels).tolist()[:3] == [3.0, 2.0, 1.0]
+        assert pd.isna(competition_scores(levels.astype('category')).iloc[3])
@@ -192,6 +192,55 @@ class TestEtsyAutocomplete:
         assert 0 <= trend_score <= 100
     
     # Helper methods (these would be extracted from the main script)
+    def test_unchanged_pages_reuse_rows_across_fresh_runs(self):
+        """Test a second fresh run over the same pages reuses the stored rows without re-analyzing"""
+        import etsy_autocomplete
+        
+        directory = tempfile.mkdtemp()
+        output_csv = os.path.join(directory, "results.csv")
+        checkpoint = os.path.join(directory, "checkpoint.json")
+        seeds_file = os.path.join(directory, "seeds.txt")
+        with open(seeds_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.sample_seeds[:2]) + "\n")
+        payloads = {
+            seed: {'related_texts': self.sample_suggestions, 'listing_count_text': '847 results',
+                   'price_texts': ['$12.99', '$49.00']}
+            for seed in self.sample_seeds[:2]
+        }
+        paths = {
+            'OUTPUT_CSV': output_csv,
+            'CHECKPOINT_FILE': checkpoint,
+            'PROCESSED_SEEDS_FILE': os.path.join(directory, "checkpoint.seeds"),
+            'FINGERPRINT_FILE': etsy_autocomplete.fingerprint_path_for(output_csv),
+            'METRICS_PROM_FILE': os.path.join(directory, "results.metrics.prom"),
+            'METRICS_SUMMARY_FILE': os.path.join(directory, "results.metrics.json"),
+            'SKETCH_FILE': os.path.join(directory, "results.sketch.json"),
+        }
+        
+        def run():
+            analyze = Mock(wraps=etsy_autocomplete.analyze_seed)
+            with patch.multiple(etsy_autocomplete, **paths), \
+                    patch.object(etsy_autocomplete, 'analyze_seed', analyze), \
+                    patch.object(etsy_autocomplete, 'fetch_seed_payload_with_retry',
+                                 side_effect=lambda page, seed, retries: payloads[seed]), \
+                    patch.object(etsy_autocomplete, 'random_delay'), \
+                    patch.object(etsy_autocomplete, 'log_message'), \
+                    patch.object(etsy_autocomplete, 'configure_logging'), \
+                    patch.object(etsy_autocomplete, 'generate_opportunity_summary'), \
+                    patch.dict(etsy_autocomplete.CONFIG), \
+                    patch('playwright.sync_api.sync_playwright', MagicMock()), \
+                    patch('sys.argv', ['etsy_autocomplete.py', '--no-trends', '--seeds', seeds_file]):
+                etsy_autocomplete.main()
+            return analyze.call_count, pd.read_csv(output_csv)
+        
+        calls, first = run()
+        assert calls == 2
+        calls, second = run()
+        assert calls == 0
+        assert len(first) and len(second) == len(first)
+        columns = [column for column in first.columns if column != 'timestamp_utc']
+        pd.testing.assert_frame_equal(first[columns], second[columns])
+    
     def _calculate_competition_level(self, listing_count):
         """Calculate competition level based on listing count"""
         if listing_count < 1000:
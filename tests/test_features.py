@@ -0,0 +1,73 @@
+"""
+Tests for derived features and the feature cache
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.config import config
+from src.features import FeatureCache, add_features, load_features
+
+
+class TestFeatures:
+    """Test suite for feature derivation and cache hits, misses and invalidation"""
+
+    def setup_method(self):
+        """Write a small results file and point the cache at a temp directory"""
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "results.csv")
+        self.cache = FeatureCache(os.path.join(directory, "cache"))
+        self.write(['vintage maps', 'fern print', 'moon phases'])
+
+    def write(self, suggestions):
+        pd.DataFrame({
+            'seed': ['maps', 'botany', 'space'][:len(suggestions)],
+            'suggestion': suggestions,
+            'competition_level': ['Low Competition - Good Opportunity', 'High', 'Moderate'][:len(suggestions)],
+            'category': ['Maps', 'Botanical', 'Space'][:len(suggestions)],
+        }).to_csv(self.path, index=False)
+
+    def test_add_features(self):
+        """Test relative opportunity is competition score scaled by relative length"""
+        frame = add_features(pd.DataFrame({'suggestion': ['ab', 'abcd'], 'competition_level': ['Low', 'High']}))
+        assert frame['competition_score'].tolist() == [3.0, 1.0]
+        assert frame['relative_opportunity'].tolist() == [1.5, 1.0]
+        assert frame['relative_opportunity'].dtype == 'float32'
+
+    def test_cache_hit(self):
+        """Test the second load comes from the cache with the same frame"""
+        first, meta = load_features(self.path, self.cache)
+        assert not meta['cache_hit'] and meta['rows'] == 3
+        second, meta = load_features(self.path, self.cache)
+        assert meta['cache_hit']
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_invalidated_by_content(self):
+        """Test editing the source misses the cache and replaces the stale entry"""
+        load_features(self.path, self.cache)
+        self.write(['vintage maps', 'fern print'])
+        frame, meta = load_features(self.path, self.cache)
+        assert not meta['cache_hit'] and len(frame) == 2
+        assert len([name for name in os.listdir(self.cache.cache_dir) if name.endswith('.pkl')]) == 1
+
+    def test_invalidated_by_version(self):
+        """Test a feature version bump misses the cache"""
+        load_features(self.path, self.cache)
+        _, meta = load_features(self.path, FeatureCache(self.cache.cache_dir, version=self.cache.version + 1))
+        assert not meta['cache_hit']
+
+    def test_invalidated_by_clustering_settings(self):
+        """Test changing the clustering config misses the cache and replaces the stale entry"""
+        load_features(self.path, self.cache)
+        with patch.dict(config._merged_config, {'clustering': {'threshold': 0.9}}):
+            _, meta = load_features(self.path, self.cache)
+        assert not meta['cache_hit']
+        assert len([name for name in os.listdir(self.cache.cache_dir) if name.endswith('.pkl')]) == 1
+
+    def test_no_cache(self):
+        """Test use_cache=False neither reads nor writes the cache"""
+        _, meta = load_features(self.path, self.cache, use_cache=False)
+        assert not meta['cache_hit']
+        assert not os.path.exists(self.cache.cache_dir)
@@ -0,0 +1,202 @@
+"""
+Tests for the compiled keyword engine
+"""
+import random
+
+from src.keyword_engine import (
+    CATEGORY_KEYWORDS, DEMAND_KEYWORDS, HIGH_COMPETITION_KEYWORDS, LOW_COMPETITION_KEYWORDS,
+    NEGATIVE_FACTORS, POSITIVE_FACTORS, KeywordEngine, KeywordMatcher
+)
+
+
+class TestKeywordEngine:
+    """Test suite checking the keyword engine against the original keyword scans"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.engine = KeywordEngine()
+        vocabulary = sorted(
+            {keyword for _, keywords in CATEGORY_KEYWORDS for keyword in keywords}
+            | set(HIGH_COMPETITION_KEYWORDS) | set(LOW_COMPETITION_KEYWORDS) | set(DEMAND_KEYWORDS)
+            | set(POSITIVE_FACTORS) | set(NEGATIVE_FACTORS)
+            | {'wall', 'prints', 'scarf', 'cartoon', 'artistic', 'oldest', 'shipwreck', 'named'}
+        )
+        rng = random.Random(7)
+        self.terms = [
+            "vintage botanical prints", "japanese wall art", "custom family tree",
+            "best seller christmas gift", "art deco prints", "street photography",
+            "old street maps", "unique handmade office decor", "", "Personalized NAME Art",
+        ]
+        for _ in range(2000):
+            words = rng.sample(vocabulary, rng.randint(1, 4))
+            self.terms.append(rng.choice([' ', '', '-']).join(words))
+
+    def test_matcher_finds_overlapping_keywords(self):
+        """Test that nested and overlapping keywords are all reported"""
+        matcher = KeywordMatcher(['art', 'art deco', 'deco', 'wall art', 'car'])
+        assert matcher.find('wall art deco cartography') == {'art', 'art deco', 'deco', 'wall art', 'car'}
+        assert matcher.find('nothing here') == set()
+
+    def test_find_many_matches_find(self):
+        """Test that the batch scan agrees with per-text scans"""
+        matcher = self.engine.matcher
+        texts = [term.lower() for term in self.terms]
+        assert matcher.find_many(texts) == [matcher.find(text) for text in texts]
+
+    def test_categorize_matches_original(self):
+        """Test categorization against the original if/elif chain"""
+        for term in self.terms:
+            assert self.engine.categorize(term) == self._legacy_categorize(term), term
+
+    def test_competition_level_matches_original(self):
+        """Test competition labels against the original keyword counts"""
+        for term in self.terms:
+            assert self.engine.competition_level(term) == self._legacy_competition_level(term), term
+
+    def test_opportunity_score_matches_original(self):
+        """Test keyword scores, including the joined-suggestion scan"""
+        for i in range(0, len(self.terms) - 3, 3):
+            seed, suggestions = self.terms[i], self.terms[i + 1:i + 3]
+            trends = {'trend_score': 12.5}
+            expected = self._legacy_opportunity_score(seed, suggestions, trends)
+            assert self.engine.keyword_score(seed, suggestions) + 12.5 * 0.3 == expected, seed
+
+    def test_classify_many_matches_classify(self):
+        """Test the batch API against single-term classification"""
+        batch = self.engine.classify_many(self.terms)
+        for term, result in zip(self.terms, batch):
+            assert result == self.engine.classify(term)
+            assert result.category == self._legacy_categorize(term)
+            assert result.keyword_score == self._legacy_opportunity_score(term, [])
+
+    # Original implementations from etsy_autocomplete.py, kept as the reference
+    def _legacy_competition_level(self, seed):
+        """Analyze competition level and opportunity potential"""
+        seed_lower = seed.lower()
+    
+        # High competition indicators (avoid these)
+        high_comp_keywords = [
+            'gift', 'personalized', 'custom', 'print', 'poster', 'wall art', 'decor',
+            'christmas', 'birthday', 'anniversary', 'wedding', 'baby', 'kids',
+            'popular', 'trending', 'viral', 'best seller', 'top rated'
+        ]
+    
+        # Low competition opportunities (target these)
+        low_comp_keywords = [
+            'niche', 'specific', 'unique', 'rare', 'vintage', 'antique', 'historical',
+            'obscure', 'specialized', 'professional', 'technical', 'academic',
+            'regional', 'local', 'cultural', 'heritage', 'traditional'
+        ]
+    
+        # High demand indicators (good for sales)
+        demand_keywords = [
+            'wall art', 'decor', 'home', 'office', 'gift', 'personalized',
+            'vintage', 'antique', 'unique', 'custom', 'handmade'
+        ]
+    
+        high_count = sum(1 for keyword in high_comp_keywords if keyword in seed_lower)
+        low_count = sum(1 for keyword in low_comp_keywords if keyword in seed_lower)
+        demand_count = sum(1 for keyword in demand_keywords if keyword in seed_lower)
+    
+        # Calculate opportunity score (higher = better opportunity)
+        opportunity_score = demand_count - high_count + (low_count * 2)
+    
+        if high_count > low_count and high_count > 2:
+            return "High Competition - Avoid"
+        elif low_count > high_count and demand_count > 0:
+            return "Low Competition - Good Opportunity"
+        elif opportunity_score > 2:
+            return "Moderate Competition - Consider"
+        else:
+            return "High Competition - Avoid"
+
+    def _legacy_opportunity_score(self, seed, suggestions, trends_data=None):
+        """Calculate opportunity score based on seed, suggestions, and market trends"""
+        seed_lower = seed.lower()
+    
+        # Factors that increase opportunity score
+        positive_factors = {
+            'vintage': 3, 'antique': 3, 'historical': 3, 'niche': 4,
+            'specific': 2, 'unique': 3, 'rare': 4, 'obscure': 4,
+            'regional': 3, 'cultural': 3, 'heritage': 3, 'traditional': 2,
+            'professional': 2, 'technical': 2, 'academic': 2
+        }
+    
+        # Factors that decrease opportunity score
+        negative_factors = {
+            'gift': -2, 'personalized': -1, 'custom': -1, 'print': -1,
+            'poster': -1, 'christmas': -3, 'birthday': -2, 'wedding': -2,
+            'popular': -3, 'trending': -3, 'viral': -3, 'best seller': -3
+        }
+    
+        score = 0
+    
+        # Analyze seed term
+        for factor, points in positive_factors.items():
+            if factor in seed_lower:
+                score += points
+    
+        for factor, points in negative_factors.items():
+            if factor in seed_lower:
+                score += points
+    
+        # Analyze suggestions for additional insights
+        if suggestions:
+            suggestion_text = ' '.join(suggestions).lower()
+            for factor, points in positive_factors.items():
+                if factor in suggestion_text:
+                    score += points * 0.5  # Suggestions get half weight
+        
+            for factor, points in negative_factors.items():
+                if factor in suggestion_text:
+                    score += points * 0.5
+    
+        # Add trend data to score
+        if trends_data:
+            trend_score = trends_data.get('trend_score', 0)
+            score += trend_score * 0.3  # Trends get 30% weight
+    
+        return score
+
+    def _legacy_categorize(self, term):
+        """Categorize search terms for better analysis"""
+        term_lower = term.lower()
+    
+        if any(word in term_lower for word in ['japanese', 'ukiyo-e', 'hokusai', 'fuji', 'cherry', 'zen', 'tokyo', 'kyoto']):
+            return "Japanese Art"
+        elif any(word in term_lower for word in ['national park', 'yosemite', 'yellowstone', 'grand canyon', 'park ranger', 'hiking', 'camping']):
+            return "National Parks"
+        elif any(word in term_lower for word in ['vintage travel', 'retro travel', 'airline', 'cruise', 'tourism', 'destination']):
+            return "Vintage Travel"
+        elif any(word in term_lower for word in ['map', 'cartography', 'atlas', 'street map', 'city plan']):
+            return "Maps/Cartography"
+        elif any(word in term_lower for word in ['botanical', 'scientific', 'medical', 'anatomy', 'butterfly', 'bird', 'natural history', 'herbarium']):
+            return "Botanical/Scientific"
+        elif any(word in term_lower for word in ['literature', 'book', 'shakespeare', 'novel', 'library', 'manuscript', 'poetry']):
+            return "Literature/Books"
+        elif any(word in term_lower for word in ['art nouveau', 'art deco', 'deco', 'advertising', 'typography', 'logo', 'brand']):
+            return "Art Nouveau/Deco"
+        elif any(word in term_lower for word in ['photograph', 'photo', 'portrait', 'street photography', 'landscape photo', 'architectural']):
+            return "Vintage Photography"
+        elif any(word in term_lower for word in ['fashion', 'beauty', 'pinup', 'clothing', 'style']):
+            return "Vintage Fashion"
+        elif any(word in term_lower for word in ['car', 'train', 'airplane', 'transportation', 'motorcycle', 'ship', 'vehicle']):
+            return "Vintage Transportation"
+        elif any(word in term_lower for word in ['american', 'western', 'cowboy', 'patriotic', 'baseball']):
+            return "Vintage Americana"
+        elif any(word in term_lower for word in ['european', 'french', 'italian', 'british', 'german', 'paris']):
+            return "Vintage European"
+        elif any(word in term_lower for word in ['vintage', 'antique', 'classic', 'old', 'historical', 'retro']):
+            return "Vintage/Classic"
+        elif any(word in term_lower for word in ['personalized', 'custom', 'name']):
+            return "Personalized"
+        elif any(word in term_lower for word in ['space', 'nasa', 'astronomy', 'galaxy']):
+            return "Space/Science"
+        elif any(word in term_lower for word in ['gift', 'present']):
+            return "Gifts"
+        elif any(word in term_lower for word in ['wall', 'decor', 'art']):
+            return "Wall Art"
+        elif any(word in term_lower for word in ['print', 'poster']):
+            return "Prints/Posters"
+        else:
+            return "Other"
@@ -0,0 +1,111 @@
+"""
+Tests for the queued logging backend
+"""
+import io
+import json
+import logging
+import os
+import tempfile
+
+from src.logging_config import (
+    BatchingRotatingFileHandler, JSONFormatter, SampledConsoleHandler, configure_logging,
+    get_logger, parse_size, shutdown_logging
+)
+
+
+class TestLoggingConfig:
+    """Test suite for batched file output, console sampling and logger caching"""
+
+    def setup_method(self):
+        """Set up a temporary log directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmpdir, "scraping_log.txt")
+
+    def teardown_method(self):
+        """Stop the backend so later tests start clean"""
+        shutdown_logging()
+
+    def make_record(self, message, level=logging.INFO, created=None):
+        """Build a log record"""
+        record = logging.LogRecord("etsy_scraper", level, "", 0, message, (), None)
+        if created is not None:
+            record.created = created
+        return record
+
+    def read_lines(self, path):
+        """Read a log file as JSON lines"""
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_file_handler_writes_in_batches(self):
+        """Test that records are held until the batch fills"""
+        handler = BatchingRotatingFileHandler(self.log_file, batch_size=3, flush_interval=3600)
+        handler.setFormatter(JSONFormatter())
+        handler.handle(self.make_record("one"))
+        handler.handle(self.make_record("two"))
+        assert not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0
+        handler.handle(self.make_record("three"))
+        assert [line["message"] for line in self.read_lines(self.log_file)] == ["one", "two", "three"]
+        handler.close()
+
+    def test_errors_flush_immediately(self):
+        """Test that an ERROR record is written without waiting for the batch"""
+        handler = BatchingRotatingFileHandler(self.log_file, batch_size=100, flush_interval=3600)
+        handler.setFormatter(JSONFormatter())
+        handler.handle(self.make_record("boom", logging.ERROR))
+        assert self.read_lines(self.log_file)[0]["level"] == "ERROR"
+        handler.close()
+
+    def test_file_handler_rotates(self):
+        """Test size-based rotation with batched writes"""
+        handler = BatchingRotatingFileHandler(self.log_file, max_bytes=500, backup_count=2, batch_size=1)
+        handler.setFormatter(JSONFormatter())
+        for i in range(20):
+            handler.handle(self.make_record(f"message {i}"))
+        handler.close()
+        assert os.path.exists(self.log_file + ".1")
+        assert os.path.getsize(self.log_file) <= 500
+
+    def test_console_is_sampled(self):
+        """Test that INFO output is capped per second but warnings always pass"""
+        stream = io.StringIO()
+        handler = SampledConsoleHandler(stream, max_per_second=2)
+        for i in range(5):
+            handler.handle(self.make_record(f"info {i}", created=1000.0))
+        handler.handle(self.make_record("careful", logging.WARNING, created=1000.5))
+        handler.flush()
+        output = stream.getvalue()
+        assert "info 1" in output and "info 2" not in output
+        assert "careful" in output
+        assert "3 console messages skipped" in output
+
+    def test_queued_backend_writes_json_lines(self):
+        """Test end to end: log through the queue, shut down, read the file"""
+        configure_logging(self.log_file, level="INFO", fmt="json", console=False)
+        logger = get_logger()
+        logger.info("Processing seed", seed="vintage maps")
+        logger.log("WARNING", "No suggestions")
+        logger.debug("not written")
+        shutdown_logging()
+        lines = self.read_lines(self.log_file)
+        assert [line["message"] for line in lines] == ["Processing seed", "No suggestions"]
+        assert lines[0]["seed"] == "vintage maps"
+        assert lines[1]["level"] == "WARNING"
+
+    def test_success_level(self):
+        """Test that the scraper's SUCCESS level keeps its name"""
+        configure_logging(self.log_file, level="INFO", fmt="json", console=False)
+        get_logger().log("SUCCESS", "HIGH OPPORTUNITY FOUND")
+        shutdown_logging()
+        assert self.read_lines(self.log_file)[0]["level"] == "SUCCESS"
+
+    def test_loggers_are_cached(self):
+        """Test that get_logger returns the same instance per name"""
+        assert get_logger("scoring") is get_logger("scoring")
+        assert get_logger("scoring").logger.name == "etsy_scraper.scoring"
+
+    def test_parse_size(self):
+        """Test size strings from config.yaml"""
+        assert parse_size("10MB") == 10 * 1024 * 1024
+        assert parse_size("512KB") == 512 * 1024
+        assert parse_size(2048) == 2048
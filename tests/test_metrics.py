@@ -0,0 +1,97 @@
+"""
+Tests for the metrics registry and its exports
+"""
+import json
+import os
+import tempfile
+
+import pytest
+
+from src.metrics import MetricsRegistry, RESERVOIR_SIZE
+
+
+class TestMetrics:
+    """Test suite for counters, gauges, histograms and exports"""
+
+    def setup_method(self):
+        """Set up a fresh registry"""
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self):
+        """Test labelled counters and gauges"""
+        seeds = self.registry.counter("seeds_total", "Seeds")
+        seeds.inc(outcome="ok")
+        seeds.inc(2, outcome="ok")
+        seeds.inc(outcome="failed")
+        assert seeds.get(outcome="ok") == 3
+        gauge = self.registry.gauge("in_flight")
+        gauge.set(5)
+        gauge.dec()
+        assert gauge.get() == 4
+        assert self.registry.counter("seeds_total") is seeds
+
+    def test_kind_conflict_is_rejected(self):
+        """Test that one name cannot be registered as two metric kinds"""
+        self.registry.counter("requests")
+        with pytest.raises(ValueError):
+            self.registry.gauge("requests")
+
+    def test_histogram_quantiles(self):
+        """Test p50/p95/p99 from observations"""
+        latency = self.registry.histogram("stage_seconds")
+        for value in range(1, 101):
+            latency.observe(value / 100, stage="navigate")
+        stats = latency.summary()["stage=navigate"]
+        assert stats["count"] == 100
+        assert stats["p50"] == pytest.approx(0.505)
+        assert stats["p95"] == pytest.approx(0.9505)
+        assert stats["p99"] == pytest.approx(0.9901)
+        assert stats["max"] == 1.0
+
+    def test_histogram_memory_is_bounded(self):
+        """Test that long runs keep a fixed-size sample"""
+        latency = self.registry.histogram("stage_seconds")
+        for i in range(RESERVOIR_SIZE * 3):
+            latency.observe(i % 100 / 100)
+        series = next(iter(latency.series.values()))
+        assert len(series.samples) == RESERVOIR_SIZE
+        assert series.count == RESERVOIR_SIZE * 3
+        assert 0.4 < series.quantiles(0.5)[0] < 0.6
+
+    def test_timer_records_elapsed_time(self):
+        """Test the context-manager timer"""
+        latency = self.registry.histogram("stage_seconds")
+        with latency.time(stage="write"):
+            pass
+        assert latency.summary()["stage=write"]["count"] == 1
+
+    def test_prometheus_export(self):
+        """Test the text exposition format"""
+        self.registry.counter("rows_total", "Rows written").inc(12)
+        latency = self.registry.histogram("stage_seconds", "Stage time", buckets=(0.1, 1.0))
+        latency.observe(0.05, stage="consent")
+        latency.observe(0.5, stage="consent")
+        latency.observe(5.0, stage="consent")
+        text = self.registry.to_prometheus()
+        assert "# TYPE rows_total counter\nrows_total 12\n" in text
+        assert 'stage_seconds_bucket{stage="consent",le="0.1"} 1' in text
+        assert 'stage_seconds_bucket{stage="consent",le="1"} 2' in text
+        assert 'stage_seconds_bucket{stage="consent",le="+Inf"} 3' in text
+        assert 'stage_seconds_count{stage="consent"} 3' in text
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and newlines in label values"""
+        self.registry.counter("errors_total").inc(seed='say "hi"\n')
+        assert 'errors_total{seed="say \\"hi\\"\\n"} 1' in self.registry.to_prometheus()
+
+    def test_write_exports(self):
+        """Test writing the Prometheus and JSON files"""
+        tmpdir = tempfile.mkdtemp()
+        self.registry.histogram("stage_seconds").observe(0.2, stage="trends")
+        prom_path = os.path.join(tmpdir, "metrics.prom")
+        json_path = os.path.join(tmpdir, "metrics.json")
+        self.registry.write_prometheus(prom_path)
+        self.registry.write_summary(json_path)
+        assert "stage_seconds_sum" in open(prom_path).read()
+        with open(json_path) as f:
+            assert json.load(f)["stage_seconds"]["stage=trends"]["p99"] == 0.2
@@ -0,0 +1,75 @@
+"""
+Tests for the streaming opportunity summary
+"""
+import csv
+import os
+import tempfile
+from unittest.mock import patch
+
+from src.opportunity_summary import OpportunityAggregator, summarize_csv
+from src.scoring import ScoringWeights
+
+
+class TestOpportunitySummary:
+    """Test suite for seed dedup, top-N bands and category aggregates"""
+
+    def setup_method(self):
+        """Set up an aggregator listing the top 2 seeds per band"""
+        self.aggregator = OpportunityAggregator(top_n=2)
+
+    def test_seeds_counted_once(self):
+        """Test that repeated suggestion rows for a seed count as one opportunity"""
+        for _ in range(5):
+            self.aggregator.add("vintage maps", 6.0, "Art & Prints")
+        assert self.aggregator.high_count == 1
+        assert list(self.aggregator.category_stats()) == [("Art & Prints", 1, 6.0)]
+
+    def test_latest_row_wins(self):
+        """Test that a re-scrape moves the seed between bands and categories"""
+        self.aggregator.add("vintage maps", 6.0, "Art & Prints")
+        self.aggregator.add("vintage maps", 3.0, "Home Decor")
+        assert self.aggregator.high_count == 0
+        assert self.aggregator.good_count == 1
+        assert list(self.aggregator.category_stats()) == [("Home Decor", 1, 3.0)]
+
+    def test_bands_are_bounded(self):
+        """Test that only the top N seeds are listed but all are counted"""
+        for i, score in enumerate([5.5, 9.0, 7.0, 3.0, 4.5, 1.0]):
+            self.aggregator.add(f"seed {i}", score, "Other")
+        assert [seed for seed, _, _ in self.aggregator.high_opportunities()] == ["seed 1", "seed 2"]
+        assert [seed for seed, _, _ in self.aggregator.good_opportunities()] == ["seed 4", "seed 3"]
+        assert (self.aggregator.high_count, self.aggregator.good_count) == (3, 2)
+
+    def test_summarize_csv(self):
+        """Test streaming a results file, skipping rows without a score"""
+        path = os.path.join(tempfile.mkdtemp(), "results.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp_utc", "seed", "suggestion", "opportunity_score", "category"])
+            writer.writerow(["t1", "boho decor", "boho wall art", "2.5", "Home Decor"])
+            writer.writerow(["t1", "boho decor", "boho shelf", "2.5", "Home Decor"])
+            writer.writerow(["t2", "cat mug", "cat mug funny", "", "Other"])
+            writer.writerow(["t3", "pet portrait", "dog portrait", "6.5", "Art & Prints"])
+        summary = summarize_csv(path)
+        assert summary.rows == 3
+        report = summary.render()
+        assert "HIGH OPPORTUNITIES (Score ≥ 5): 1" in report
+        assert "GOOD OPPORTUNITIES (Score 2–<5): 1" in report
+        assert "• Home Decor: 1 opportunities, avg score: 2.5" in report
+
+    def test_bands_follow_scoring_thresholds(self):
+        """Test the high/good bands default to the configured scoring thresholds"""
+        with patch('src.scoring._default_weights', ScoringWeights(thresholds={'high': 8.0, 'good': 6.0})):
+            aggregator = OpportunityAggregator()
+        assert (aggregator.high_score, aggregator.good_score) == (8.0, 6.0)
+        for i, score in enumerate([9.0, 6.5, 5.0]):
+            aggregator.add(f"seed {i}", score, "Other")
+        assert (aggregator.high_count, aggregator.good_count) == (1, 1)
+
+    def test_good_band_label_covers_fractional_thresholds(self):
+        """Test the good band is labelled up to, but excluding, the high threshold"""
+        aggregator = OpportunityAggregator(high_score=8.0, good_score=6.5)
+        aggregator.add("pet portrait", 7.5, "Art & Prints")
+        report = aggregator.render()
+        assert "GOOD OPPORTUNITIES (Score 6.5–<8): 1" in report
+        assert "• pet portrait (Score: 7.5, Category: Art & Prints)" in report
@@ -0,0 +1,146 @@
+"""
+Tests for the local JSON query service
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.query_service import QueryService, make_server
+
+SETTINGS = {'host': '127.0.0.1', 'port': 0, 'cache_size': 2, 'page_size': 2, 'max_page_size': 3}
+
+
+class TestQueryService:
+    """Test suite for queries, pagination, caching, reloads and the HTTP server"""
+
+    def setup_method(self):
+        """Write a small results file with two scrapes of one seed"""
+        self.path = os.path.join(tempfile.mkdtemp(), "results.csv")
+        self.write(pd.DataFrame({
+            'timestamp_utc': ['t1', 't1', 't1', 't1', 't2', 't2'],
+            'seed': ['maps', 'maps', 'botany', 'space', 'maps', 'maps'],
+            'suggestion': ['old map', 'city map', 'fern print', 'moon art', 'city map', 'atlas'],
+            'competition_level': ['High', 'High', 'Low Competition - Good Opportunity', 'Moderate', 'Low', 'Low'],
+            'opportunity_score': [1.0, 1.0, 6.5, 3.25, 7.5, 7.5],
+            'trend_direction': ['stable', 'stable', 'growing', 'declining', 'growing', 'growing'],
+            'category': ['Maps', 'Maps', 'Botanical', 'Space', 'Maps', 'Maps'],
+        }))
+        self.service = QueryService(self.path, SETTINGS, use_cache=False, check_interval=0)
+
+    def write(self, frame):
+        frame.to_csv(self.path, index=False)
+
+    def get(self, url):
+        status, body = self.service.handle(url)
+        return status, json.loads(body)
+
+    def test_opportunities_filters_and_pages(self):
+        """Test latest scores per seed, filters and pagination limits"""
+        status, page = self.get("/opportunities")
+        assert status == 200 and page['total'] == 3 and page['limit'] == 2
+        assert [(item['seed'], item['opportunity_score']) for item in page['items']] == [('maps', 7.5), ('botany', 6.5)]
+        assert [item['seed'] for item in self.get("/opportunities?offset=2")[1]['items']] == ['space']
+        assert self.get("/opportunities?limit=100")[1]['limit'] == 3
+        assert [item['seed'] for item in self.get("/opportunities?competition=low&trend=GROWING")[1]['items']] == \
+            ['maps', 'botany']
+        assert self.get("/opportunities?category=space&min_score=3")[1]['total'] == 1
+        assert self.get("/opportunities?limit=0")[0] == 400
+
+    def test_seed_categories_and_trends(self):
+        """Test seed detail, per-category mix and trend groups"""
+        status, seed = self.get("/seeds/maps")
+        assert status == 200 and seed['suggestion_list'] == ['city map', 'atlas'] and seed['suggestions'] == 3
+        assert self.get("/seeds/nothing")[0] == 404
+        categories = {item['category']: item for item in self.get("/categories")[1]}
+        assert categories['Botanical']['competition'] == {'low': 1}
+        trends = self.get("/trends")[1]
+        assert trends['growing']['seeds'] == 2 and trends['growing']['top'][0]['seed'] == 'maps'
+
+    def test_cache_and_reload(self):
+        """Test repeated queries hit the LRU and a changed file is reloaded"""
+        self.get("/opportunities")
+        self.get("/opportunities")
+        assert (self.service.hits, self.service.misses) == (1, 1)
+        self.get("/categories")
+        self.get("/trends")
+        assert len(self.service._cache) == 2
+
+        time.sleep(0.01)
+        self.write(pd.DataFrame({'timestamp_utc': ['t3'], 'seed': ['travel'], 'suggestion': ['rail poster'],
+                                 'competition_level': ['Low'], 'opportunity_score': [9.0],
+                                 'trend_direction': ['growing'], 'category': ['Travel']}))
+        page = self.get("/opportunities")[1]
+        assert page['total'] == 1 and page['items'][0]['seed'] == 'travel'
+        assert self.service.generation == 1
+
+    def test_failed_reload_keeps_the_store(self):
+        """Test a deleted or malformed file answers 503 until a good file is back"""
+        self.get("/opportunities")
+        os.remove(self.path)
+        status, error = self.get("/opportunities")
+        assert status == 503 and 'unavailable' in error['error']
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('seed,suggestion\n"unterminated\n')
+        assert self.get("/categories")[0] == 503
+        assert self.service.generation == 0 and self.service.store.rows == 6
+
+        self.write(pd.DataFrame({'timestamp_utc': ['t3'], 'seed': ['travel'], 'suggestion': ['rail poster'],
+                                 'competition_level': ['Low'], 'opportunity_score': [9.0],
+                                 'trend_direction': ['growing'], 'category': ['Travel']}))
+        assert self.get("/opportunities")[1]['total'] == 1
+        assert self.service.generation == 1
+
+    def test_failed_reload_answers_503_until_a_reload_succeeds(self):
+        """Test requests after a failed reload get a 503 even before the next file check"""
+        os.remove(self.path)
+        assert self.get("/opportunities")[0] == 503
+        self.service.check_interval = 3600  # later requests don't check the file themselves
+        assert self.get("/opportunities")[0] == 503
+        assert self.get("/health")[0] == 503
+
+        self.write(pd.DataFrame({'timestamp_utc': ['t3'], 'seed': ['travel'], 'suggestion': ['rail poster'],
+                                 'competition_level': ['Low'], 'opportunity_score': [9.0],
+                                 'trend_direction': ['growing'], 'category': ['Travel']}))
+        self.service.check_interval = 0
+        assert self.get("/opportunities")[0] == 200
+        self.service.check_interval = 3600
+        assert self.get("/categories")[0] == 200
+
+    def test_unexpected_errors_answer_json_500(self):
+        """Test an exception while answering returns a JSON error instead of dropping the connection"""
+        self.service.store.categories = lambda: 1 / 0
+        status, error = self.get("/categories")
+        assert status == 500 and 'ZeroDivisionError' in error['error']
+
+    def test_cache_key_uses_the_store_generation(self):
+        """Test an answer is cached under the generation of the store that computed it"""
+        stale = self.service.store
+        original = self.service.current_store
+        self.service.current_store = lambda: (stale, 0)
+        try:
+            self.service._current = (self.service.store, 1)  # another thread reloaded meanwhile
+            self.get("/opportunities")
+        finally:
+            self.service.current_store = original
+        assert all(key[0] == 0 for key in self.service._cache)
+
+    def test_concurrent_http_requests(self):
+        """Test the threading server answers parallel requests identically"""
+        server = make_server(self.service, '127.0.0.1', 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/opportunities?trend=growing"
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                bodies = list(pool.map(lambda _: urllib.request.urlopen(url).read(), range(32)))
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert len(set(bodies)) == 1
+        assert json.loads(bodies[0])['total'] == 2
@@ -0,0 +1,84 @@
+"""
+Tests for the compact scrape record types
+"""
+import csv
+import io
+import sys
+from array import array
+from unittest.mock import patch
+
+import pytest
+
+from src.records import RESULT_FIELDS, MarketData, ResultRow
+from src.scoring import score_seed
+from src.sketches import ResultsSketch
+
+
+class TestRecords:
+    """Test suite for ResultRow and MarketData"""
+
+    def setup_method(self):
+        """Create a row and its dict equivalent"""
+        self.row = ResultRow("2025-01-01T00:00:00", "vintage map", "vintage map, framed", "Low Competition",
+                             6.25, 12.5, "growing", 847, 24.5, "$12.99-$49.00", "Maps/Cartography",
+                             "🔥 HIGH OPPORTUNITY - Growing Trend")
+        self.as_dict = dict(zip(RESULT_FIELDS, self.row))
+
+    def test_row_writes_like_dict_writer(self):
+        """Test csv.writer output of rows is byte-identical to DictWriter output of dicts"""
+        tuples, dicts = io.StringIO(), io.StringIO()
+        csv.writer(tuples).writerows([RESULT_FIELDS, self.row])
+        writer = csv.DictWriter(dicts, fieldnames=list(RESULT_FIELDS))
+        writer.writeheader()
+        writer.writerow(self.as_dict)
+        assert tuples.getvalue() == dicts.getvalue()
+        assert ResultRow._fields == RESULT_FIELDS
+
+    def test_row_is_compact_and_round_trips(self):
+        """Test rows carry no per-instance dict and rebuild from stored dicts"""
+        assert not hasattr(self.row, '__dict__')
+        assert sys.getsizeof(self.row) < sys.getsizeof(self.as_dict)
+        assert ResultRow.from_mapping(self.row._asdict()) == self.row
+        rerun = ResultRow.from_mapping(self.as_dict, timestamp_utc="2025-02-01T00:00:00")
+        assert rerun.timestamp_utc == "2025-02-01T00:00:00" and rerun[1:] == self.row[1:]
+
+    def test_market_data(self):
+        """Test prices are packed and summarized"""
+        market = MarketData(847, [12.99, 49.0, 11.51])
+        assert isinstance(market.prices, array) and market.prices.typecode == 'd'
+        assert (market.min_price, market.max_price) == (11.51, 49.0)
+        assert market.avg_price == pytest.approx(24.5)
+        assert market.price_range == "$11.51-$49.00"
+        assert MarketData().price_range == "$0.00-$0.00"
+        with pytest.raises(AttributeError):
+            market.price_data = []
+
+    def test_score_seed_accepts_market_data(self):
+        """Test scoring a MarketData equals scoring the equivalent dict"""
+        market = MarketData(847, [12.5, 37.5, 25.0])
+        legacy = {'listing_count': 847, 'price_range': {'min': 12.5, 'max': 37.5, 'avg': 25.0}}
+        trends = {'trend_score': 12.0, 'trend_direction': 'growing'}
+        assert score_seed(3.0, market, trends) == score_seed(3.0, legacy, trends)
+
+    def test_sketch_accepts_rows(self):
+        """Test the sketch folds records exactly like dicts"""
+        rows = [self.row, self.row._replace(suggestion="atlas print"), self.row._replace(suggestion="")]
+        by_records = ResultsSketch().update_rows(rows)
+        by_dicts = ResultsSketch().update_rows([row._asdict() for row in rows])
+        assert by_records.rows == by_dicts.rows == 2
+        assert by_records.categories == by_dicts.categories
+        assert by_records.top_terms(5) == by_dicts.top_terms(5)
+
+    def test_analyze_seed_builds_rows(self):
+        """Test the scraper's analysis step returns one ResultRow per suggestion"""
+        import etsy_autocomplete
+
+        with patch.object(etsy_autocomplete, 'log_message'), \
+                patch.dict(etsy_autocomplete.CONFIG, {"enable_google_trends": False}):
+            market = etsy_autocomplete.parse_market_texts("vintage map", "1,234 results", ["$15.99", "$24.01"])
+            rows = etsy_autocomplete.analyze_seed("vintage map", ["old atlas", "city map"], market, "t0")
+        assert market.listing_count == 1234 and market.competition_level == 'moderate'
+        assert [type(row) for row in rows] == [ResultRow, ResultRow]
+        assert [row.suggestion for row in rows] == ["old atlas", "city map"]
+        assert rows[0].price_range == "$15.99-$24.01" and rows[0].avg_price == 20.0
+        assert rows[0][3:] == rows[1][3:]
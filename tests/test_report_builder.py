@@ -0,0 +1,93 @@
+"""
+Tests for parallel report rendering with a shared plotly.js bundle
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from src.report_builder import PLOTLY_BUNDLE, ReportBuilder, artifact_key, partition_digests
+
+
+def make_figure(title):
+    """Small figure built inside a render worker"""
+    return {'data': [{'type': 'bar', 'x': ['a', 'b'], 'y': [1, 2]}], 'layout': {'title': {'text': title}}}
+
+
+class TestReportBuilder:
+    """Test suite for page rendering, the shared bundle and the index page"""
+
+    def setup_method(self):
+        """Set up an output directory"""
+        self.output_dir = os.path.join(tempfile.mkdtemp(), "reports")
+
+    def test_pages_share_one_bundle(self):
+        """Test that pages reference the local bundle instead of embedding it"""
+        builder = ReportBuilder(self.output_dir, workers=2)
+        builder.add("dashboard.html", "Dashboard", make_figure("Dashboard"), section="Overview")
+        for name in ["maps", "space", "botany", "travel"]:
+            builder.add_task(f"category_{name}.html", name.title(), make_figure, name, section="Categories")
+        stats = builder.build()
+
+        assert stats['pages'] == 5 and stats['workers'] == 2
+        bundle_size = os.path.getsize(os.path.join(self.output_dir, PLOTLY_BUNDLE))
+        with open(os.path.join(self.output_dir, "category_maps.html"), encoding="utf-8") as f:
+            page = f.read()
+        assert f'src="{PLOTLY_BUNDLE}"' in page
+        assert len(page) < bundle_size / 10
+
+    def test_index_links_pages_by_section(self):
+        """Test the index page"""
+        builder = ReportBuilder(self.output_dir, workers=1)
+        builder.add("dashboard.html", "Dashboard", make_figure("Dashboard"), section="Overview")
+        builder.add_task("category_maps.html", "Maps & Charts", make_figure, "maps", section="Categories")
+        builder.build()
+        with open(os.path.join(self.output_dir, "index.html"), encoding="utf-8") as f:
+            index = f.read()
+        assert index.index("<h2>Overview</h2>") < index.index("<h2>Categories</h2>")
+        assert '<a href="category_maps.html">Maps &amp; Charts</a>' in index
+
+    def test_unchanged_pages_are_skipped(self):
+        """Test that only pages whose key changed are rebuilt, and force rebuilds all"""
+        def build(keys, force=False):
+            builder = ReportBuilder(self.output_dir, workers=1, force=force)
+            for name, key in keys.items():
+                if builder.is_current(f"{name}.html", key):
+                    builder.keep(f"{name}.html", name, key)
+                else:
+                    builder.add_task(f"{name}.html", name, make_figure, name, key=key)
+            return builder.build()
+
+        keys = {'maps': artifact_key('maps', 1), 'space': artifact_key('space', 1)}
+        assert build(keys)['rebuilt'] == 2
+        assert build(keys)['skipped'] == 2
+        keys['space'] = artifact_key('space', 2)
+        stats = build(keys)
+        assert (stats['rebuilt'], stats['skipped'], stats['pages']) == (1, 1, 2)
+        os.remove(os.path.join(self.output_dir, "maps.html"))
+        assert build(keys)['rebuilt'] == 1
+        assert build(keys, force=True)['rebuilt'] == 2
+
+    def test_manifest_keeps_other_builds_entries(self):
+        """Test a build with unkeyed pages leaves another build's manifest entries in place"""
+        builder = ReportBuilder(self.output_dir, workers=1)
+        builder.add_task("maps.html", "Maps", make_figure, "maps", key=artifact_key('maps'))
+        builder.add_task("space.html", "Space", make_figure, "space", key=artifact_key('space'))
+        builder.build()
+
+        other = ReportBuilder(self.output_dir, workers=1)
+        other.add("space.html", "Space", make_figure("Space"))
+        other.add("dashboard.html", "Dashboard", make_figure("Dashboard"))
+        other.build()
+        assert ReportBuilder(self.output_dir).read_manifest() == {'maps.html': artifact_key('maps')}
+
+    def test_partition_digests(self):
+        """Test digests ignore row order and change only for the edited partition"""
+        frame = pd.DataFrame({'category': ['Maps', 'Maps', 'Space', None],
+                              'suggestion': ['old map', 'city map', 'moon', 'misc']})
+        digests = partition_digests(frame, 'category', ['suggestion'])
+        assert set(digests) == {'Maps', 'Space', None}
+        assert partition_digests(frame.iloc[::-1], 'category', ['suggestion']) == digests
+        edited = frame.assign(suggestion=['old map', 'city map', 'mars', 'misc'])
+        changed = partition_digests(edited, 'category', ['suggestion'])
+        assert changed['Maps'] == digests['Maps'] and changed['Space'] != digests['Space']
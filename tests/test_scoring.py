@@ -0,0 +1,109 @@
+"""
+Tests for the vectorized scoring engine
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+import pandas as pd
+import yaml
+
+from src.config import Config
+from src.scoring import (
+    AVOID, GOOD, GOOD_GROWING, HIGH, MODERATE, PERFECT, ScoringWeights, compute_scores,
+    keyword_scores_by_seed, main, parse_price_ranges, score_frame, score_seed
+)
+
+
+class TestScoring:
+    """Test suite for config-driven batch scoring"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.weights = ScoringWeights()
+        self.frame = pd.DataFrame({
+            'timestamp_utc': ['2024-01-01T12:00:00'] * 3 + ['2024-01-02T12:00:00'] * 2,
+            'seed': ['vintage botanical prints'] * 3 + ['custom family tree'] * 2,
+            'suggestion': ['botanical wall art', 'rare herbarium', 'vintage plant poster',
+                           'custom gift', 'family name art'],
+            'listing_count': [847] * 3 + [50000] * 2,
+            'trend_score': [20.0] * 3 + [-10.0] * 2,
+            'trend_direction': ['growing'] * 3 + ['declining'] * 2,
+            'avg_price': [25.0] * 3 + [0.0] * 2,
+            'price_range': ['$12.50-$37.50'] * 3 + ['$0.00-$0.00'] * 2,
+        })
+
+    def test_component_weights(self):
+        """Test each configured component of the score"""
+        score, recommendation, level = compute_scores(
+            [0.0], [847], [20.0], ['growing'], [25.0], [12.5], [37.5], self.weights
+        )
+        # low competition 3.0 + trend 20 * 0.05 + growing 1.5 + price sqrt(25) / 5 + dispersion 1.0
+        assert score[0] == 3.0 + 1.0 + 1.5 + 1.0 + 1.0
+        assert recommendation[0] == PERFECT
+        assert level[0] == 'low'
+
+    def test_recommendation_ladder(self):
+        """Test recommendation thresholds across the ladder"""
+        _, recommendation, _ = compute_scores(
+            [6.0, 3.0, 0.5, -5.0, 6.0], [0, 0, 0, 0, 50000], [0, 0, 0, 0, 0],
+            ['stable', 'growing', 'stable', 'declining', 'stable'], [0] * 5, [0] * 5, [0] * 5, self.weights
+        )
+        assert list(recommendation) == [HIGH, GOOD_GROWING, MODERATE, AVOID, GOOD]
+
+    def test_weights_from_config(self):
+        """Test that weights come from the scoring section of a config file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'config.yaml')
+            with open(path, 'w') as f:
+                yaml.safe_dump({'scoring': {'trend_weight': 0.1, 'competition_weights': {'low': 5.0}}}, f)
+            weights = ScoringWeights.from_config(Config(path))
+
+        assert weights.trend_weight == 0.1
+        assert weights.competition_weights == {'low': 5.0}
+        assert weights.price_weight == 2.0
+
+    def test_competition_thresholds_from_config_file(self):
+        """Test that --config applies the file's competition thresholds, not the defaults"""
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ):
+            os.environ.pop('COMPETITION_LOW_THRESHOLD', None)
+            os.environ.pop('COMPETITION_MODERATE_THRESHOLD', None)
+            path = os.path.join(tmp, 'config.yaml')
+            with open(path, 'w') as f:
+                yaml.safe_dump({'competition': {'low_threshold': 500, 'moderate_threshold': 60000}}, f)
+            assert ScoringWeights.from_config(Config(path)).low_threshold == 500
+
+            results = os.path.join(tmp, 'results.csv')
+            self.frame.to_csv(results, index=False)
+            with patch('builtins.print'):
+                main([results, '-o', os.path.join(tmp, 'rescored.csv'), '--config', path])
+            rescored = pd.read_csv(os.path.join(tmp, 'rescored.csv'))
+
+        # 847 listings are moderate competition under a 500 low threshold, 50000 no longer high
+        expected, _, level = compute_scores(
+            keyword_scores_by_seed(self.frame), self.frame['listing_count'], self.frame['trend_score'],
+            self.frame['trend_direction'], self.frame['avg_price'], *parse_price_ranges(self.frame['price_range']),
+            ScoringWeights(low_threshold=500, moderate_threshold=60000)
+        )
+        assert list(level) == ['moderate'] * 5
+        assert rescored['opportunity_score'].tolist() == expected.tolist()
+
+    def test_frame_scores_match_single_seed(self):
+        """Test that batch re-scoring agrees with per-seed scoring"""
+        scored = score_frame(self.frame, self.weights)
+        keyword_scores = keyword_scores_by_seed(self.frame)
+
+        market_data = {'listing_count': 847, 'price_range': {'min': 12.5, 'max': 37.5, 'avg': 25.0}}
+        trends_data = {'trend_score': 20.0, 'trend_direction': 'growing'}
+        expected = score_seed(keyword_scores.iloc[0], market_data, trends_data, self.weights)
+
+        assert scored['opportunity_score'].iloc[0] == expected[0]
+        assert scored['recommendation'].iloc[0] == expected[1]
+        assert scored['opportunity_score'].iloc[3] == scored['opportunity_score'].iloc[4]
+        assert 'opportunity_score' not in self.frame.columns
+
+    def test_parse_price_ranges(self):
+        """Test splitting stored price range strings"""
+        low, high = parse_price_ranges(pd.Series(['$12.99-$49.00', '$0.00-$0.00', None]))
+        assert list(low[:2]) == [12.99, 0.0] and list(high[:2]) == [49.0, 0.0]
+        assert pd.isna(low[2]) and pd.isna(high[2])
@@ -0,0 +1,105 @@
+"""
+Tests for streaming seed sources
+"""
+import io
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from src.seed_sources import (
+    ProcessedSeedLog, SeedProgress, iter_csv_seeds, iter_stdin_seeds, open_seed_source, parse_shard, seed_key,
+    seed_stream
+)
+
+
+class TestSeedSources:
+    """Test suite for seed readers, dedup and sharding"""
+
+    def setup_method(self):
+        """Set up a temporary directory for seed files"""
+        self.tmpdir = tempfile.mkdtemp()
+
+    def write(self, name, content):
+        """Write a seed file and return its path"""
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_text_source_skips_blanks_and_comments(self):
+        """Test one-seed-per-line text files"""
+        path = self.write("seeds.txt", "# niche ideas\nvintage maps\n\n  botanical prints  \n")
+        assert list(open_seed_source(path)) == ["vintage maps", "botanical prints"]
+
+    def test_csv_source_uses_seed_column(self):
+        """Test that CSV sources read the `seed` column, or the first column"""
+        path = self.write("seeds.csv", "id,seed\n1,vintage maps\n2,\n3,art deco posters\n")
+        assert list(open_seed_source(path)) == ["vintage maps", "art deco posters"]
+        path = self.write("terms.csv", "term,volume\nhokusai print,10\n")
+        assert list(iter_csv_seeds(path)) == ["hokusai print"]
+
+    def test_stdin_source(self):
+        """Test reading seeds from a stream"""
+        assert list(iter_stdin_seeds(io.StringIO("a map\n\nb map\n"))) == ["a map", "b map"]
+
+    def test_sqlite_source(self):
+        """Test reading seeds from a SQLite table and column"""
+        path = os.path.join(self.tmpdir, "terms.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE keywords (term TEXT)")
+        connection.executemany("INSERT INTO keywords VALUES (?)", [("vintage maps",), (None,), ("zen art",)])
+        connection.commit()
+        connection.close()
+        assert list(open_seed_source(f"sqlite:{path}:keywords:term")) == ["vintage maps", "zen art"]
+
+    def test_builtin_source(self):
+        """Test that the builtin spec streams the given list"""
+        assert list(open_seed_source("builtin", ["a", "b"])) == ["a", "b"]
+
+    def test_stream_dedups_across_sources(self):
+        """Test that normalized duplicates are dropped, keeping the first spelling"""
+        stream = seed_stream([["Vintage Maps", "zen art"], ["vintage  maps", "new seed"]])
+        assert list(stream) == ["Vintage Maps", "zen art", "new seed"]
+
+    def test_shards_partition_the_stream(self):
+        """Test that shards are disjoint and together cover every seed"""
+        seeds = [f"seed {i}" for i in range(500)]
+        shards = [list(seed_stream([seeds], shard=(index, 4))) for index in range(4)]
+        assert sorted(sum(shards, [])) == sorted(seeds)
+        assert all(shards)
+
+    def test_stream_skips_processed_seeds(self):
+        """Test resume filtering matches seeds by normalized key, like dedup"""
+        stream = seed_stream([["a map", "B  Map", "c map"]], skip={seed_key("b map")})
+        assert list(stream) == ["a map", "c map"]
+
+    def test_processed_log(self):
+        """Test the processed-seed log appends keys and survives a torn last line"""
+        log = ProcessedSeedLog(os.path.join(self.tmpdir, "run.seeds"))
+        assert log.keys() == set()
+        log.append("Vintage Maps")
+        log.append("zen art")
+        with open(log.path, 'a', encoding='ascii') as f:
+            f.write("0123")
+        assert log.keys() == {seed_key("vintage maps"), seed_key("zen art")}
+        assert list(seed_stream([["vintage maps", "new seed"]], skip=log.keys())) == ["new seed"]
+        log.clear()
+        assert not os.path.exists(log.path)
+
+    def test_parse_shard(self):
+        """Test shard spec parsing"""
+        assert parse_shard("1/1") == (0, 1)
+        assert parse_shard("3/4") == (2, 4)
+        with pytest.raises(ValueError):
+            parse_shard("5/4")
+
+    def test_progress_reports_periodically(self):
+        """Test that progress is reported every N seeds"""
+        reports = []
+        progress = SeedProgress(reports.append, every_seeds=2, every_seconds=3600)
+        for _ in range(5):
+            progress.step()
+        assert len(reports) == 2
+        assert "5 seeds processed" in progress.summary()
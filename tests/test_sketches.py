@@ -0,0 +1,79 @@
+"""
+Tests for the mergeable results sketches
+"""
+import os
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from src.sketches import (CountMinSketch, HeavyHitters, HyperLogLog, ResultsSketch, hash_values,
+                          load_or_build_sketch)
+
+
+class TestSketches:
+    """Test suite for HyperLogLog, Count-Min, heavy hitters and the results sketch"""
+
+    def setup_method(self):
+        """Build a skewed stream of terms"""
+        rng = np.random.default_rng(7)
+        self.terms = [f"term {i}" for i in rng.zipf(1.3, 20_000) % 5_000]
+        self.rows = [{'seed': f"seed {i % 40}", 'suggestion': term, 'category': 'Maps' if i % 3 else 'Space',
+                      'competition_level': 'Low'} for i, term in enumerate(self.terms)]
+
+    def test_hyperloglog_accuracy_and_merge(self):
+        """Test estimates are within the error bound and merging equals the union"""
+        values = [f"value {i}" for i in range(50_000)]
+        left = HyperLogLog().update(hash_values(values[:30_000]))
+        right = HyperLogLog().update(hash_values(values[20_000:]))
+        union = HyperLogLog().update(hash_values(values))
+        assert abs(union.estimate() / 50_000 - 1) < 3 * union.relative_error
+        assert left.merge(right).estimate() == union.estimate()
+        assert HyperLogLog().update(hash_values(['a', 'b', 'a'])).estimate() == 2
+
+    def test_count_min_never_undercounts(self):
+        """Test every estimate is at least the true count and almost all are within the bound"""
+        truth = Counter(self.terms)
+        cms = CountMinSketch(width=256, depth=4).update(hash_values(self.terms))
+        estimates = cms.estimate(hash_values(list(truth)))
+        counts = np.array(list(truth.values()))
+        assert (estimates >= counts).all()
+        exceeded = (estimates - counts) > cms.error_bound * len(self.terms)
+        assert exceeded.mean() <= 2 * np.exp(-cms.depth)
+
+    def test_heavy_hitters_match_exact_top(self):
+        """Test the top terms survive batched updates and merging"""
+        truth = Counter(self.terms).most_common(5)
+        first, second = HeavyHitters(capacity=20), HeavyHitters(capacity=20)
+        for start in range(0, 10_000, 1_000):
+            first.update_counts(Counter(self.terms[start:start + 1_000]))
+        second.update_counts(Counter(self.terms[10_000:]))
+        top = first.merge(second).top(5)
+        assert [term for term, _ in top] == [term for term, _ in truth]
+        assert all(estimate >= count for (_, estimate), (_, count) in zip(top, truth))
+
+    def test_rows_and_frames_agree(self):
+        """Test row-by-row updates (as the scraper writes) equal a frame update"""
+        by_rows = ResultsSketch()
+        for start in range(0, len(self.rows), 7):
+            by_rows.update_rows(self.rows[start:start + 7])
+        by_frame = ResultsSketch().update_frame(pd.DataFrame(self.rows))
+        assert by_rows.rows == by_frame.rows == len(self.rows)
+        assert by_rows.unique_seeds() == by_frame.unique_seeds() == 40
+        assert by_rows.unique_suggestions() == by_frame.unique_suggestions()
+        assert by_rows.categories == by_frame.categories
+        assert by_rows.top_terms(3) == by_frame.top_terms(3)
+
+    def test_persisted_next_to_results(self):
+        """Test save/load round trip and rebuilding when the results file grew"""
+        path = os.path.join(tempfile.mkdtemp(), "results.csv")
+        pd.DataFrame(self.rows[:100]).to_csv(path, index=False)
+        sketch, current = load_or_build_sketch(path)
+        assert not current and os.path.exists(os.path.join(os.path.dirname(path), "results.sketch.json"))
+        loaded, current = load_or_build_sketch(path)
+        assert current and loaded.rows == 100 and loaded.top_terms(3) == sketch.top_terms(3)
+
+        pd.DataFrame(self.rows[100:150]).to_csv(path, mode='a', header=False, index=False)
+        grown, current = load_or_build_sketch(path)
+        assert not current and grown.rows == 150
@@ -0,0 +1,63 @@
+"""
+Tests for the suggestion filter engine
+"""
+import re
+
+from src.suggestion_filter import (
+    SKIP_TERMS, SuggestionFilter, compile_skip_pattern, is_facet_string, normalize_suggestion, trie_pattern
+)
+
+
+class TestSuggestionFilter:
+    """Test suite for suggestion filtering and deduplication"""
+
+    def test_facet_strings_are_detected(self):
+        """Test facet junk seen in saved scrape output"""
+        junk = [
+            "Item formatAllPhysical itemsDigital downloads",
+            "ColorGreenBlueYellowWhiteBrownShow more",
+            "SubjectFlowersPlants & treesLandscape & sceneryAbstract & geometricAnimalShow more",
+            "FramingUnframedFramed",
+            "Applied filters\nVintage",
+        ]
+        for text in junk:
+            assert is_facet_string(text), text
+
+    def test_real_suggestions_are_kept(self):
+        """Test that ordinary search terms are not mistaken for facets"""
+        for text in ["mountain photography prints", "Custom Pet Portrait", "iPhone wallpaper art",
+                     "Colorful botanical prints", "Style guide poster"]:
+            assert not is_facet_string(text), text
+
+    def test_separate_camel_case_words_are_kept(self):
+        """Test that two camel-case brand words are not read as glued facet text"""
+        for text in ["iPhone iPad case", "eBay iPod poster"]:
+            assert not is_facet_string(text), text
+        assert is_facet_string("iPhone caseBlueYellow")
+
+    def test_dedup_on_normalized_text(self):
+        """Test that case and whitespace variants collapse to the first spelling"""
+        texts = ["botanical wall art", "Botanical  Wall Art", " botanical wall art ", "vintage plant poster"]
+        assert SuggestionFilter().filter(texts) == ["botanical wall art", "vintage plant poster"]
+        assert normalize_suggestion("  Botanical\tWall  ART ") == "botanical wall art"
+
+    def test_skip_terms_and_length_bounds(self):
+        """Test navigation text and length limits match the original scrape loop"""
+        texts = ["Home", "Sign in", "Sort by: Relevance", "art", "x" * 100, "antique map prints"]
+        assert SuggestionFilter().filter(texts) == ["antique map prints"]
+
+    def test_reset_clears_seen_suggestions(self):
+        """Test that a filter can be reused across seeds"""
+        engine = SuggestionFilter()
+        assert engine.filter(["custom map print"]) == ["custom map print"]
+        assert engine.filter(["custom map print"]) == []
+        engine.reset()
+        assert engine.filter(["custom map print"]) == ["custom map print"]
+
+    def test_trie_pattern_matches_like_flat_alternation(self):
+        """Test that the prefix-factored pattern finds the same terms"""
+        pattern = compile_skip_pattern(SKIP_TERMS)
+        flat = re.compile('|'.join(re.escape(term) for term in SKIP_TERMS))
+        for text in ["price high to low", "workshop poster", "newest arrivals", "botanical print", "apply now"]:
+            assert bool(pattern.search(text)) == bool(flat.search(text)), text
+        assert re.fullmatch(trie_pattern(["price", "price low"]), "price low")
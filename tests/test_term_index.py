@@ -0,0 +1,96 @@
+"""
+Tests for the incremental suggestion token index
+"""
+import csv
+import os
+import tempfile
+from unittest.mock import patch
+
+from src.term_index import TermIndex, main, parse_query, tokenize
+
+HEADER = ['timestamp_utc', 'seed', 'suggestion', 'competition_level', 'opportunity_score', 'category']
+
+
+class TestTermIndex:
+    """Test suite for query parsing, boolean/prefix search and incremental updates"""
+
+    def setup_method(self):
+        """Write a small results file and open an index for it"""
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "results.csv")
+        self.index = TermIndex(os.path.join(directory, "results.index.sqlite"))
+        self.write([
+            ['maps', 'Vintage map print', 'Low', '6.5', 'Maps'],
+            ['maps', 'antique atlas', 'Low', '6.5', 'Maps'],
+            ['botany', 'botanical print', 'High', '1.0', 'Botanical'],
+            ['botany', 'vintage botanical poster', 'High', '1.0', 'Botanical'],
+            ['flowers', 'botanical print', 'Moderate', '3.0', 'Botanical'],
+        ], mode='w')
+
+    def teardown_method(self):
+        self.index.close()
+
+    def write(self, rows, mode='a'):
+        with open(self.path, mode, newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if mode == 'w':
+                writer.writerow(HEADER)
+            writer.writerows([['t', *row] for row in rows])
+
+    def suggestions(self, query):
+        return [(result['suggestion'], result['seed']) for result in self.index.search(query)]
+
+    def test_parse_query(self):
+        """Test tokenizing, OR groups, prefixes and exclusions"""
+        assert tokenize("Ukiyo-e Prints!") == ['ukiyo', 'e', 'prints']
+        assert parse_query("botanical print* -vintage OR atlas") == [
+            (['botanical', 'print*'], ['vintage']), (['atlas'], [])
+        ]
+        assert parse_query("-vintage") == []
+
+    def test_boolean_and_prefix_search(self):
+        """Test AND, prefix, NOT and OR queries ranked by opportunity score"""
+        self.index.update(self.path)
+        assert self.suggestions("botanical print") == [('botanical print', 'flowers'), ('botanical print', 'botany')]
+        assert self.suggestions("vint*") == [('Vintage map print', 'maps'), ('vintage botanical poster', 'botany')]
+        assert self.suggestions("botanical -vintage OR atlas") == [
+            ('antique atlas', 'maps'), ('botanical print', 'flowers'), ('botanical print', 'botany')
+        ]
+        seeds = self.index.search_seeds("botanical")
+        assert [(seed['seed'], seed['matches']) for seed in seeds] == [('flowers', 1), ('botany', 2)]
+
+    def test_incremental_update(self):
+        """Test only appended rows are read and later rows replace earlier scores"""
+        assert self.index.update(self.path)['rows'] == 5
+        assert self.index.is_current(self.path)
+        self.write([['botany', 'botanical print', 'Low', '9.0', 'Botanical'], ['space', 'moon print', 'Low', '2.0', 'Space']])
+        stats = self.index.update(self.path)
+        assert stats['rows'] == 2 and not stats['rebuilt']
+        assert self.suggestions("print")[0] == ('botanical print', 'botany')
+        assert ('moon print', 'space') in self.suggestions("moon")
+
+    def test_partial_row_and_replaced_file(self):
+        """Test a row still being written waits, and a rewritten file is re-indexed"""
+        self.index.update(self.path)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('t,space,half written')
+        assert self.index.update(self.path)['rows'] == 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(' row,Low,2.0,Space\r\n')
+        assert self.index.update(self.path)['rows'] == 1
+        assert self.suggestions("half") == [('half written row', 'space')]
+
+        self.write([['space', 'galaxy poster', 'Low', '4.0', 'Space']], mode='w')
+        stats = self.index.update(self.path)
+        assert stats['rebuilt'] and stats['rows'] == 1 and self.suggestions("print") == []
+
+    def test_cli_accepts_queries_starting_with_minus(self):
+        """Test -q and -- pass a leading-exclusion query through argparse"""
+        index_path = os.path.join(os.path.dirname(self.path), "cli.index.sqlite")
+        for argv in (["query", self.path, "--index", index_path, "-q", "-vintage botanical"],
+                     ["query", "--index", index_path, self.path, "--", "-vintage botanical"]):
+            with patch('builtins.print') as printed:
+                main(argv)
+            lines = [call.args[0] for call in printed.call_args_list]
+            assert sum('botanical print' in line for line in lines) == 2
+            assert not any('vintage botanical poster' in line for line in lines)
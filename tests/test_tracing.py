@@ -0,0 +1,80 @@
+"""
+Tests for span tracing and Chrome trace export
+"""
+import json
+import os
+import tempfile
+
+import pytest
+
+from src.tracing import NULL_SPAN, Tracer, slowest_spans
+
+
+class TestTracing:
+    """Test suite for the span tracer"""
+
+    def setup_method(self):
+        """Set up an enabled tracer"""
+        self.tracer = Tracer(enabled=True)
+
+    def spans(self):
+        """Completed spans by name"""
+        return {event['name']: event for event in self.tracer.events if event['ph'] == 'X'}
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test that a disabled tracer hands out the shared no-op span"""
+        tracer = Tracer()
+        with tracer.span("seed", seed="vintage maps") as span:
+            span.set(rows=3)
+        tracer.instant("retry")
+        assert tracer.span("seed") is NULL_SPAN
+        assert tracer.events == []
+
+    def test_nested_spans_are_contained(self):
+        """Test that child spans fall inside their parent"""
+        with self.tracer.span("seed", seed="vintage maps") as seed_span:
+            with self.tracer.span("fetch"):
+                with self.tracer.span("homepage"):
+                    pass
+            seed_span.set(outcome="ok")
+        spans = self.spans()
+        parent, child = spans['seed'], spans['homepage']
+        assert parent['ts'] <= child['ts']
+        assert child['ts'] + child['dur'] <= parent['ts'] + parent['dur']
+        assert parent['args'] == {'seed': 'vintage maps', 'outcome': 'ok'}
+
+    def test_errors_are_recorded_on_the_span(self):
+        """Test that a failing stage is marked in the trace"""
+        with pytest.raises(TimeoutError):
+            with self.tracer.span("networkidle"):
+                raise TimeoutError("page did not settle")
+        assert self.spans()['networkidle']['args']['error'] == "TimeoutError: page did not settle"
+
+    def test_chrome_trace_document(self):
+        """Test the written trace-event JSON"""
+        with self.tracer.span("seed"):
+            self.tracer.instant("fetch_failed", attempt=1)
+        path = os.path.join(tempfile.mkdtemp(), "run.trace.json")
+        self.tracer.write(path)
+        with open(path) as f:
+            trace = json.load(f)
+        phases = [event['ph'] for event in trace['traceEvents']]
+        assert phases[:2] == ['M', 'M']
+        assert 'X' in phases and 'i' in phases
+        assert slowest_spans(trace)[0]['name'] == 'seed'
+
+    def test_parent_sorts_before_child_with_same_start(self):
+        """Test ordering of spans that start at the same timestamp"""
+        self.tracer.record("child", 1000, 10, {})
+        self.tracer.record("parent", 1000, 50, {})
+        names = [event['name'] for event in self.tracer.to_chrome_trace()['traceEvents'] if event['ph'] == 'X']
+        assert names == ['parent', 'child']
+
+    def test_event_cap(self):
+        """Test that recording stops at max_events"""
+        tracer = Tracer(enabled=True, max_events=2)
+        for _ in range(5):
+            with tracer.span("seed"):
+                pass
+        assert len(tracer.events) == 2
+        assert tracer.dropped == 3
@@ -0,0 +1,86 @@
+"""
+Tests for the batch trend engine
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.trend_engine import align_series, store_trend_features, trend_features, trend_metrics
+from src.trends_store import TrendsStore
+
+
+def scalar_trend_score(values, window=30):
+    """The per-seed formula the engine replaced"""
+    values = np.asarray(values, dtype=float)
+    older, recent = values[:window].mean(), values[-window:].mean()
+    return 0 if older == 0 else (recent - older) / older * 100
+
+
+class TestTrendEngine:
+    """Test suite for vectorized trend features"""
+
+    def setup_method(self):
+        """Create a year of weekly series with known shapes"""
+        weeks = np.arange(52)
+        rng = np.random.default_rng(3)
+        self.rising = 20 + weeks * 1.5
+        self.seasonal = 50 + 30 * np.sin(2 * np.pi * weeks / 13)
+        self.breakout = np.r_[np.full(48, 30.0) + rng.normal(0, 1, 48), [70, 75, 80, 85]]
+        self.flat = np.full(52, 40.0)
+        self.noisy = 50 + rng.normal(0, 10, 52)
+
+    def test_matches_scalar_trend_score(self):
+        """Test trend_score and direction match the old per-seed computation"""
+        rng = np.random.default_rng(0)
+        matrix = rng.integers(0, 100, (500, 52)).astype(float)
+        matrix[:5, :30] = 0
+        features = trend_features(matrix)
+        expected = np.array([scalar_trend_score(row) for row in matrix])
+        np.testing.assert_allclose(features['trend_score'], expected)
+        directions = np.where(expected > 5, 'growing', np.where(expected < -5, 'declining', 'stable'))
+        assert (features['trend_direction'] == directions).all()
+
+    def test_shape_features(self):
+        """Test slope, seasonality, volatility and breakout pick out the right series"""
+        features = trend_features([self.rising, self.seasonal, self.breakout, self.flat, self.noisy],
+                                  index=['rising', 'seasonal', 'breakout', 'flat', 'noisy'])
+        assert abs(features.loc['rising', 'slope'] - 1.5) < 1e-9
+        assert features.loc['flat', 'slope'] == 0 and features.loc['flat', 'volatility'] == 0
+        assert features.loc['seasonal', 'seasonality'] > 0.8
+        assert features.loc['seasonal', 'seasonal_lag'] == 13
+        assert features.loc['noisy', 'seasonality'] < 0.5
+        assert features.loc['noisy', 'volatility'] > features.loc['seasonal', 'volatility'] / 2
+        assert features['breakout'].tolist() == [False, False, True, False, False]
+
+    def test_ragged_series_are_aligned(self):
+        """Test shorter series are right-aligned and give the same features as on their own"""
+        matrix = align_series([self.rising, self.seasonal[:26]])
+        assert np.isnan(matrix[1, :26]).all() and matrix[1, -1] == self.seasonal[25]
+        together = trend_features(matrix)
+        alone = trend_features(align_series([self.seasonal[:26]]))
+        pd.testing.assert_series_equal(together.iloc[1], alone.iloc[0], check_names=False)
+        assert trend_features(align_series([[]]))['points'].tolist() == [0]
+
+    def test_trend_metrics_single_series(self):
+        """Test the one-series wrapper returns plain Python values"""
+        metrics = trend_metrics(self.rising)
+        assert metrics['trend_direction'] == 'growing'
+        assert isinstance(metrics['trend_score'], float) and isinstance(metrics['breakout'], bool)
+        assert trend_metrics([0] * 40)['trend_score'] == 0
+
+    def test_store_trend_features(self):
+        """Test features for every stored term, from the latest fetch or the merged history"""
+        store = TrendsStore(os.path.join(tempfile.mkdtemp(), "results.trends"))
+        dates = pd.date_range("2024-01-07", periods=52, freq="W")
+        store.append("rising", pd.Series(self.rising, index=dates))
+        store.append("flat", pd.Series(self.flat, index=dates))
+        store.append("flat", pd.Series(self.flat[:4] + 10, index=dates[-4:] + pd.Timedelta(weeks=4)))
+
+        latest = store_trend_features(store)
+        assert latest.index.tolist() == ['rising', 'flat']
+        assert latest.loc['flat', 'points'] == 4
+        history = store_trend_features(store, history=True)
+        assert history.loc['flat', 'points'] == 56
+        assert abs(history.loc['flat', 'trend_score'] - (26 * 40 + 4 * 50) / 30 / 40 * 100 + 100) < 1e-9
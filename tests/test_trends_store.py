@@ -0,0 +1,74 @@
+"""
+Tests for the append-only Google Trends series store
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.trends_store import DAYS_FILE, VALUES_FILE, TrendsStore, trends_path_for
+
+
+class TestTrendsStore:
+    """Test suite for storing and reading interest series"""
+
+    def setup_method(self):
+        """Create a store in a temporary directory and a year of weekly interest"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.directory = trends_path_for(os.path.join(self.temp_dir, "results.csv"))
+        self.store = TrendsStore(self.directory)
+        dates = pd.date_range("2024-01-07", periods=52, freq="W")
+        self.interest = pd.Series(np.linspace(20, 80, 52).round(), index=dates, name="botanical print")
+
+    def test_path_sits_next_to_results(self):
+        """Test the store directory is named after the results file"""
+        assert self.directory == os.path.join(self.temp_dir, "results.trends")
+
+    def test_append_and_read_back(self):
+        """Test series, dates and related queries round-trip"""
+        rising = pd.DataFrame({'query': ['pressed flower art'], 'value': np.int64([250])})
+        self.store.append("botanical print", self.interest, rising=rising, top=None, geo='US')
+        self.store.append("moon map", self.interest[:10] * 0 + 5)
+
+        series = self.store.series("botanical print")
+        assert series.index.equals(self.interest.index)
+        assert series.dtype == np.float32 and (series.to_numpy() == self.interest.to_numpy()).all()
+        assert self.store.related("botanical print") == {'rising': [{'query': 'pressed flower art', 'value': 250}],
+                                                         'top': []}
+        assert len(self.store.series("moon map")) == 10
+        assert sorted(self.store.terms()) == ["botanical print", "moon map"]
+        assert os.path.getsize(os.path.join(self.directory, VALUES_FILE)) == 62 * 4
+
+    def test_history_merges_fetches(self):
+        """Test later fetches win on overlapping dates and extend the history"""
+        self.store.append("botanical print", self.interest, fetched=1)
+        later = pd.Series(99.0, index=self.interest.index[-4:].append(pd.DatetimeIndex(["2025-01-05"])))
+        self.store.append("botanical print", later, fetched=2)
+
+        history = self.store.history("botanical print")
+        assert len(history) == 53
+        assert (history.iloc[-5:] == 99).all()
+        assert history.iloc[0] == self.interest.iloc[0]
+        assert len(self.store.series("botanical print", fetch=0)) == 52
+
+    def test_reopen_and_refresh(self):
+        """Test another store instance sees existing and newly appended series"""
+        self.store.append("botanical print", self.interest)
+        reader = TrendsStore(self.directory)
+        assert "botanical print" in reader
+        self.store.append("moon map", self.interest)
+        assert reader.refresh() == 1
+        assert reader.series("moon map").iloc[-1] == 80
+
+    def test_unindexed_bytes_are_truncated(self):
+        """Test a crash between the array and index writes leaves no corrupt series"""
+        self.store.append("botanical print", self.interest)
+        with open(os.path.join(self.directory, VALUES_FILE), 'ab') as f:
+            f.write(b'\0' * 12)
+        with open(os.path.join(self.directory, DAYS_FILE), 'ab') as f:
+            f.write(b'\0' * 8)
+        store = TrendsStore(self.directory)
+        store.append("moon map", self.interest)
+        assert store.series("moon map").equals(store.series("botanical print").rename("moon map"))
+        assert os.path.getsize(os.path.join(self.directory, VALUES_FILE)) == 104 * 4
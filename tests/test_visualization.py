@@ -0,0 +1,48 @@
+"""
+Tests for scatter plots that switch to density + WebGL on large frames
+"""
+import numpy as np
+import pandas as pd
+
+from src.visualization import scalable_scatter, stratified_sample
+
+
+class TestVisualization:
+    """Test suite for the small/large scatter modes and sampling"""
+
+    def setup_method(self):
+        """Set up a frame with a rare category and small thresholds"""
+        rng = np.random.default_rng(1)
+        self.df = pd.DataFrame({
+            'competition_score': rng.integers(1, 4, 1000).astype(float),
+            'suggestion_length': rng.integers(5, 60, 1000),
+            'category': ['Common'] * 995 + ['Rare'] * 5,
+            'seed': [f"seed {i}" for i in range(1000)],
+        })
+        self.settings = {'max_points': 200, 'sample_points': 50, 'bins': 10}
+
+    def plot(self, df):
+        """Opportunity-style scatter"""
+        return scalable_scatter(df, 'competition_score', 'suggestion_length', color='category',
+                                hover_data=['seed'], title='Opportunities', settings=self.settings)
+
+    def test_small_frames_plot_every_row(self):
+        """Test that frames under the threshold keep the plain scatter"""
+        fig = self.plot(self.df.head(100))
+        assert {trace.type for trace in fig.data} == {'scatter'}
+        assert sum(len(trace.x) for trace in fig.data) == 100
+
+    def test_large_frames_use_density_and_webgl(self):
+        """Test the density layer counts all rows and the WebGL layer is a sample"""
+        fig = self.plot(self.df)
+        assert fig.data[0].type == 'heatmap'
+        assert np.nansum(np.asarray(fig.data[0].z, dtype=float)) == 1000
+        points = [trace for trace in fig.data[1:] if trace.type == 'scattergl']
+        assert sum(len(trace.x) for trace in points) <= 50
+        assert 'customdata' in points[0] and points[0].customdata is not None
+
+    def test_sample_keeps_rare_groups(self):
+        """Test that stratified sampling keeps every color group"""
+        sample = stratified_sample(self.df, 50, by='category')
+        assert set(sample['category']) == {'Common', 'Rare'}
+        assert len(sample) <= 50